@@ -84,6 +84,21 @@ class SpyderCompletionPlugin(QObject, SpyderPlugin):
         """
         pass
 
+    def cancel_request(self, language, req_id):
+        """
+        Cancel a request that was superseded by a newer one.
+
+        Its response is not expected anymore.
+
+        Parameters
+        ----------
+        language: str
+            Programming language of the request
+        req_id: int
+            Request identifier given to `send_request`
+        """
+        pass
+
     def send_notification(self, language, notification_type, notification):
         """
         Send notification to completion server based on Spyder changes.
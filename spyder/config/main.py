@@ -231,6 +231,8 @@ DEFAULTS = [
               'autosave_interval': 60,
               'docstring_type': 'Numpydoc',
               'strip_trailing_spaces_on_modify': False,
+              'large_file/size': 5,
+              'large_file/lines': 50000,
               }),
             ('historylog',
              {
@@ -293,7 +295,11 @@ DEFAULTS = [
               'search_text_samples': [TASKS_PATTERN],
               'more_options': False,
               'case_sensitive': False,
-              'max_results': 1000,
+              'max_results': 0,
+              'processes': 0,
+              'cache_file_types': True,
+              'use_ignore_files': True,
+              'index_files': True,
               }),
             ('breakpoints',
              {
@@ -614,4 +620,4 @@ NAME_MAP = {
 #    or if you want to *rename* options, then you need to do a MAJOR update in
 #    version, e.g. from 3.0.0 to 4.0.0
 # 3. You don't need to touch this value if you're just adding a new option
-CONF_VERSION = '53.3.0'
+CONF_VERSION = '53.4.0'
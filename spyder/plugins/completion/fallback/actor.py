@@ -27,6 +27,7 @@ from diff_match_patch import diff_match_patch
 from spyder.plugins.completion.languageserver import CompletionItemKind
 from spyder.plugins.completion.languageserver import LSPRequestTypes
 from spyder.plugins.completion.fallback.utils import get_keywords, get_words
+from spyder.plugins.editor.utils.textchanges import apply_content_changes
 
 
 FALLBACK_COMPLETION = "Fallback"
@@ -123,11 +124,14 @@ class FallbackActor(QObject):
                     'offset': msg['offset'],
                     'language': msg['language'],
                 }
-            diff = msg['diff']
             text = self.file_tokens[file]
             text['offset'] = msg['offset']
-            text, _ = self.diff_patch.patch_apply(
-                diff, text['text'])
+            if 'changes' in msg:
+                text = apply_content_changes(text['text'], msg['changes'])
+            else:
+                diff = msg['diff']
+                text, _ = self.diff_patch.patch_apply(
+                    diff, text['text'])
             self.file_tokens[file]['text'] = text
         elif msg_type == LSPRequestTypes.DOCUMENT_DID_CLOSE:
             self.file_tokens.pop(file, {})
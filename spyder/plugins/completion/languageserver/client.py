@@ -12,6 +12,7 @@ communicate with a v3.0 Language Server Protocol server.
 """
 
 # Standard library imports
+import json
 import logging
 import os
 import os.path as osp
@@ -33,6 +34,8 @@ from spyder.plugins.completion.languageserver import (
 from spyder.plugins.completion.languageserver.decorators import (
     send_request, send_notification, class_register, handles)
 from spyder.plugins.completion.languageserver.transport import MessageKind
+from spyder.plugins.completion.languageserver.transport.inprocess import (
+    InProcessTransport)
 from spyder.plugins.completion.languageserver.providers import (
     LSPMethodProviderMixIn)
 from spyder.py3compat import PY2
@@ -82,6 +85,7 @@ class LSPClient(QObject, LSPMethodProviderMixIn):
         self.zmq_in_port = None
         self.zmq_out_port = None
         self.transport_client = None
+        self.transport = None
         self.lsp_server = None
         self.notifier = None
         self.language = language
@@ -112,6 +116,14 @@ class LSPClient(QObject, LSPMethodProviderMixIn):
         self.external_server = server_settings.get('external', False)
         self.stdio = server_settings.get('stdio', False)
 
+        # Talk to the server from Spyder's event loop instead of relaying
+        # messages through a separate transport process
+        self.in_process = server_settings.get('in_process', True)
+
+        # Exchange JSON bytes with the transport layer instead of pickled
+        # objects, so messages are only decoded once
+        self.raw_messages = server_settings.get('raw_messages', True)
+
         # Setting stdio on implies that external_server is off
         if self.stdio and self.external_server:
             error = ('If server is set to use stdio communication, '
@@ -145,6 +157,8 @@ class LSPClient(QObject, LSPMethodProviderMixIn):
         self.transport_args += transport_args.split(' ')
         self.transport_args += ['--folder', folder]
         self.transport_args += ['--transport-debug', str(get_debug_level())]
+        if self.raw_messages:
+            self.transport_args += ['--raw-messages']
         if not self.stdio:
             self.transport_args += ['--external-server']
         else:
@@ -153,15 +167,16 @@ class LSPClient(QObject, LSPMethodProviderMixIn):
         self.transport_unresponsive = False
 
     def start(self):
-        self.zmq_out_socket = self.context.socket(zmq.PAIR)
-        self.zmq_out_port = self.zmq_out_socket.bind_to_random_port(
-            'tcp://{}'.format(LOCALHOST))
-        self.zmq_in_socket = self.context.socket(zmq.PAIR)
-        self.zmq_in_socket.set_hwm(0)
-        self.zmq_in_port = self.zmq_in_socket.bind_to_random_port(
-            'tcp://{}'.format(LOCALHOST))
-        self.transport_args += ['--zmq-in-port', self.zmq_out_port,
-                                '--zmq-out-port', self.zmq_in_port]
+        if not self.in_process:
+            self.zmq_out_socket = self.context.socket(zmq.PAIR)
+            self.zmq_out_port = self.zmq_out_socket.bind_to_random_port(
+                'tcp://{}'.format(LOCALHOST))
+            self.zmq_in_socket = self.context.socket(zmq.PAIR)
+            self.zmq_in_socket.set_hwm(0)
+            self.zmq_in_port = self.zmq_in_socket.bind_to_random_port(
+                'tcp://{}'.format(LOCALHOST))
+            self.transport_args += ['--zmq-in-port', self.zmq_out_port,
+                                    '--zmq-out-port', self.zmq_in_port]
 
         server_log = subprocess.PIPE
         pid = os.getpid()
@@ -219,6 +234,11 @@ class LSPClient(QObject, LSPMethodProviderMixIn):
                 stderr=server_stderr,
                 creationflags=creation_flags)
 
+        if self.in_process:
+            self.start_in_process_transport()
+            logger.debug('LSP {} client started!'.format(self.language))
+            return
+
         client_log = subprocess.PIPE
         if get_debug_level() > 0:
             # Client log file
@@ -268,8 +288,38 @@ class LSPClient(QObject, LSPMethodProviderMixIn):
         # This is necessary for tests to pass locally!
         logger.debug('LSP {} client started!'.format(self.language))
 
+    def start_in_process_transport(self):
+        """Connect to the server without starting a transport process."""
+        self.transport = InProcessTransport(self)
+        self.transport.sig_message_received.connect(self.handle_message)
+        self.transport.sig_connected.connect(self.initialize)
+        self.transport.sig_disconnected.connect(self.on_transport_down)
+        if self.stdio:
+            stderr_file = None
+            if get_debug_level() > 0:
+                stderr_fname = 'client_{0}_{1}.log'.format(self.language,
+                                                           os.getpid())
+                stderr_file = get_conf_path(osp.join('lsp_logs',
+                                                     stderr_fname))
+                if not osp.exists(osp.dirname(stderr_file)):
+                    os.makedirs(osp.dirname(stderr_file))
+            self.transport.start_process(self.server_args, stderr_file)
+        else:
+            self.transport.connect_to_server(self.server_host,
+                                             self.server_port)
+
+    @Slot()
+    def on_transport_down(self):
+        """Warn that the connection with the server was lost."""
+        logger.debug("LSP server for {} is down!!".format(self.language))
+        if not self.server_unresponsive:
+            self.server_unresponsive = True
+            self.sig_lsp_down.emit(self.language)
+
     def stop(self):
         logger.info('Stopping {} client...'.format(self.language))
+        if self.transport is not None:
+            self.transport.stop()
         if self.notifier is not None:
             self.notifier.activated.disconnect(self.on_msg_received)
             self.notifier.setEnabled(False)
@@ -300,6 +350,10 @@ class LSPClient(QObject, LSPMethodProviderMixIn):
                 self.sig_lsp_down.emit(self.language)
             return
 
+        if self.transport is not None and not self.transport.is_alive():
+            self.on_transport_down()
+            return
+
         if ClientConstants.CANCEL in params:
             return
         _id = self.request_seq
@@ -322,7 +376,14 @@ class LSPClient(QObject, LSPMethodProviderMixIn):
             }
 
         logger.debug('{} request: {}'.format(self.language, method))
-        self.zmq_out_socket.send_pyobj(msg)
+        if self.transport is not None:
+            msg['jsonrpc'] = '2.0'
+            self.transport.send(msg)
+        elif self.raw_messages:
+            msg['jsonrpc'] = '2.0'
+            self.zmq_out_socket.send(json.dumps(msg).encode('utf-8'))
+        else:
+            self.zmq_out_socket.send_pyobj(msg)
         self.request_seq += 1
         return int(_id)
 
@@ -332,58 +393,79 @@ class LSPClient(QObject, LSPMethodProviderMixIn):
         while True:
             try:
                 # events = self.zmq_in_socket.poll(1500)
-                resp = self.zmq_in_socket.recv_pyobj(flags=zmq.NOBLOCK)
-
-                try:
-                    method = resp['method']
-                    logger.debug(
-                        '{} response: {}'.format(self.language, method))
-                except KeyError:
-                    pass
-
-                if 'error' in resp:
-                    logger.debug('{} Response error: {}'
-                                 .format(self.language, repr(resp['error'])))
-                    if self.language == 'python':
-                        message = resp['error'].get('message', '')
-                        traceback = (resp['error'].get('data', {}).
-                                     get('traceback'))
-                        if traceback is not None:
-                            traceback = ''.join(traceback)
-                            traceback = traceback + '\n' + message
-                            self.sig_server_error.emit(traceback)
-                        req_id = resp['id']
-                        if req_id in self.req_reply:
-                            self.req_reply[req_id](None, {'params': []})
-                elif 'method' in resp:
-                    if resp['method'][0] != '$':
-                        if 'id' in resp:
-                            self.request_seq = int(resp['id'])
-                        if resp['method'] in self.handler_registry:
-                            handler_name = (
-                                self.handler_registry[resp['method']])
-                            handler = getattr(self, handler_name)
-                            handler(resp['params'])
-                elif 'result' in resp:
-                    if resp['result'] is not None:
-                        req_id = resp['id']
-                        if req_id in self.req_status:
-                            req_type = self.req_status[req_id]
-                            if req_type in self.handler_registry:
-                                handler_name = self.handler_registry[req_type]
-                                handler = getattr(self, handler_name)
-                                handler(resp['result'], req_id)
-                                self.req_status.pop(req_id)
-                                if req_id in self.req_reply:
-                                    self.req_reply.pop(req_id)
-            except RuntimeError:
-                # This is triggered when a codeeditor instance has been
-                # removed before the response can be processed.
-                pass
+                resp = self.recv_message()
+                if resp is not None:
+                    self.handle_message(resp)
             except zmq.ZMQError:
                 self.notifier.setEnabled(True)
                 return
 
+    @Slot(object)
+    def handle_message(self, resp):
+        """Dispatch a message received from the server to its handler."""
+        try:
+            try:
+                method = resp['method']
+                logger.debug(
+                    '{} response: {}'.format(self.language, method))
+            except KeyError:
+                pass
+
+            if 'error' in resp:
+                logger.debug('{} Response error: {}'
+                             .format(self.language, repr(resp['error'])))
+                if self.language == 'python':
+                    message = resp['error'].get('message', '')
+                    traceback = (resp['error'].get('data', {}).
+                                 get('traceback'))
+                    if traceback is not None:
+                        traceback = ''.join(traceback)
+                        traceback = traceback + '\n' + message
+                        self.sig_server_error.emit(traceback)
+                    req_id = resp['id']
+                    if req_id in self.req_reply:
+                        self.req_reply[req_id](None, {'params': []})
+            elif 'method' in resp:
+                if resp['method'][0] != '$':
+                    if 'id' in resp:
+                        self.request_seq = int(resp['id'])
+                    if resp['method'] in self.handler_registry:
+                        handler_name = (
+                            self.handler_registry[resp['method']])
+                        handler = getattr(self, handler_name)
+                        handler(resp['params'])
+            elif 'result' in resp:
+                if resp['result'] is not None:
+                    req_id = resp['id']
+                    if req_id in self.req_status:
+                        req_type = self.req_status[req_id]
+                        if req_type in self.handler_registry:
+                            handler_name = self.handler_registry[req_type]
+                            handler = getattr(self, handler_name)
+                            handler(resp['result'], req_id)
+                            self.req_status.pop(req_id)
+                            if req_id in self.req_reply:
+                                self.req_reply.pop(req_id)
+        except RuntimeError:
+            # This is triggered when a codeeditor instance has been
+            # removed before the response can be processed.
+            pass
+
+    def recv_message(self):
+        """
+        Receive a message from the transport layer without blocking.
+
+        Returns None if the message can't be decoded.
+        """
+        if not self.raw_messages:
+            return self.zmq_in_socket.recv_pyobj(flags=zmq.NOBLOCK)
+        body = self.zmq_in_socket.recv(flags=zmq.NOBLOCK)
+        try:
+            return json.loads(body.decode('utf-8'))
+        except ValueError as e:
+            logger.error('{} invalid message: {}'.format(self.language, e))
+            return None
+
     def perform_request(self, method, params):
         if method in self.sender_registry:
             handler_name = self.sender_registry[method]
@@ -398,7 +480,13 @@ class LSPClient(QObject, LSPMethodProviderMixIn):
     @handles(SERVER_READY)
     @send_request(method=LSPRequestTypes.INITIALIZE)
     def initialize(self, *args, **kwargs):
-        pid = self.transport_client.pid if not self.external_server else None
+        if self.transport is not None:
+            # The server is started by Spyder unless it's an external one
+            local_server = self.stdio or not self.external_server
+            pid = os.getpid() if local_server else None
+        else:
+            pid = (self.transport_client.pid if not self.external_server
+                   else None)
         params = {
             'processId': pid,
             'rootUri': pathlib.Path(osp.abspath(self.folder)).as_uri(),
@@ -407,6 +495,21 @@ class LSPClient(QObject, LSPMethodProviderMixIn):
         }
         return params
 
+    @send_notification(method=LSPRequestTypes.CANCEL_REQUEST)
+    def cancel_request(self, params):
+        """
+        Cancel the request with id `params['id']`.
+
+        Its response, if any, won't be processed.
+        """
+        req_id = params['id']
+        if req_id not in self.req_status:
+            # The request was already answered
+            return {ClientConstants.CANCEL: True}
+        self.req_status.pop(req_id)
+        self.req_reply.pop(req_id, None)
+        return {'id': req_id}
+
     @send_request(method=LSPRequestTypes.SHUTDOWN)
     def shutdown(self):
         params = {}
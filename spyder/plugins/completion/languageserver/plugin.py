@@ -26,7 +26,8 @@ from spyder.config.lsp import PYTHON_CONFIG
 from spyder.config.manager import CONF
 from spyder.api.completion import SpyderCompletionPlugin
 from spyder.utils.misc import check_connection_port, getcwd_or_home
-from spyder.plugins.completion.languageserver import LSP_LANGUAGES
+from spyder.plugins.completion.languageserver import (LSP_LANGUAGES,
+                                                      LSPRequestTypes)
 from spyder.plugins.completion.languageserver.client import LSPClient
 from spyder.plugins.completion.languageserver.confpage import (
     LanguageServerConfigPage)
@@ -51,6 +52,8 @@ class LanguageServerPlugin(SpyderCompletionPlugin):
 
         self.clients = {}
         self.requests = set({})
+        # Ids of the requests sent to the LSP clients
+        self.client_requests = {}
         self.register_queue = {}
 
         self.update_configuration()
@@ -298,6 +301,7 @@ class LanguageServerPlugin(SpyderCompletionPlugin):
     def receive_response(self, response_type, response, language, req_id):
         if req_id in self.requests:
             self.requests.discard(req_id)
+            self.client_requests.pop(req_id, None)
             self.sig_response_ready.emit(
                 self.COMPLETION_CLIENT_NAME, req_id, response)
 
@@ -309,11 +313,24 @@ class LanguageServerPlugin(SpyderCompletionPlugin):
                 client = self.clients[language]['instance']
                 params['response_callback'] = functools.partial(
                     self.receive_response, language=language, req_id=req_id)
-                client.perform_request(request, params)
+                client_req_id = client.perform_request(request, params)
+                if client_req_id is not None:
+                    self.client_requests[req_id] = client_req_id
                 return
         self.sig_response_ready.emit(self.COMPLETION_CLIENT_NAME,
                                      req_id, {})
 
+    def cancel_request(self, language, req_id):
+        self.requests.discard(req_id)
+        client_req_id = self.client_requests.pop(req_id, None)
+        if client_req_id is None or language not in self.clients:
+            return
+        language_client = self.clients[language]
+        if language_client['status'] == self.RUNNING:
+            client = language_client['instance']
+            client.perform_request(LSPRequestTypes.CANCEL_REQUEST,
+                                   {'id': client_req_id})
+
     def send_notification(self, language, request, params):
         if language in self.clients:
             language_client = self.clients[language]
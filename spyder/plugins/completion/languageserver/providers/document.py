@@ -46,14 +46,16 @@ class DocumentProvider:
 
     @send_notification(method=LSPRequestTypes.DOCUMENT_DID_CHANGE)
     def document_changed(self, params):
+        if 'changes' in params:
+            changes = params['changes']
+        else:
+            changes = [{'text': params['text']}]
         params = {
             'textDocument': {
                 'uri': path_as_uri(params['file']),
                 'version': params['version']
             },
-            'contentChanges': [{
-                'text': params['text']
-            }]
+            'contentChanges': changes
         }
         return params
 
@@ -217,3 +217,29 @@ def test_local_signature(lsp_client_and_completion, qtbot):
     # Assert the response has what we expect
     definition = response['params']
     assert 'Test docstring' in definition
+
+
+@pytest.mark.slow
+@pytest.mark.third
+def test_cancel_request(lsp_client_and_completion, qtbot):
+    client, completion = lsp_client_and_completion
+
+    # Parameters to perform a textDocument/completion request
+    completion_params = {
+        'file': 'test.py',
+        'line': 0,
+        'column': 8,
+        'requires_response': True,
+        'response_callback': completion.handle_response
+    }
+
+    # Cancel the request right after sending it
+    req_id = client.perform_request(LSPRequestTypes.DOCUMENT_COMPLETION,
+                                    completion_params)
+    assert req_id in client.req_status
+    client.perform_request(LSPRequestTypes.CANCEL_REQUEST, {'id': req_id})
+    assert req_id not in client.req_status
+
+    # Assert its response is not processed
+    with qtbot.assertNotEmitted(completion.sig_response, wait=3000):
+        pass
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for the framing of LSP messages."""
+
+# Standard library imports
+import json
+try:
+    from unittest.mock import Mock
+except ImportError:
+    from mock import Mock  # Python 2
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.completion.languageserver.transport.common.framing import (
+    MessageBuffer, frame_message)
+from spyder.plugins.completion.languageserver.transport.common.producer import (
+    LanguageServerClient)
+
+
+def make_message(content, encoding='utf-8', content_type=None):
+    body = json.dumps(content).encode(encoding)
+    headers = b'Content-Length: %d\r\n' % len(body)
+    if content_type is not None:
+        headers += b'Content-Type: ' + content_type + b'\r\n'
+    return headers + b'\r\n' + body
+
+
+def get_messages(message_buffer):
+    messages = []
+    message = message_buffer.next_message()
+    while message is not None:
+        body, encoding = message
+        messages.append(json.loads(bytes(body).decode(encoding)))
+        message = message_buffer.next_message()
+    return messages
+
+
+def test_frame_message():
+    """Test the headers of sent messages."""
+    body = json.dumps({'id': 1, 'result': u'ñ'}).encode('utf-8')
+    assert frame_message(body) == b'Content-Length: %d\r\n\r\n' % len(body)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1024])
+def test_message_buffer(chunk_size):
+    """Test splitting a stream in messages, whatever the chunk size."""
+    contents = [{'id': i, 'result': u'ñ' * i * 100} for i in range(5)]
+    stream = b''.join(make_message(content) for content in contents)
+
+    message_buffer = MessageBuffer()
+    messages = []
+    for i in range(0, len(stream), chunk_size):
+        message_buffer.feed(stream[i:i + chunk_size])
+        messages += get_messages(message_buffer)
+    assert messages == contents
+    assert message_buffer.pending_bytes() == 0
+
+
+def test_message_buffer_bodies_stay_valid():
+    """Test that returned bodies aren't modified by later data."""
+    message_buffer = MessageBuffer()
+    message_buffer.feed(make_message({'id': 1}) + make_message({'id': 2})[:5])
+    body, __ = message_buffer.next_message()
+    assert message_buffer.next_message() is None
+    message_buffer.feed(make_message({'id': 2})[5:])
+    assert get_messages(message_buffer) == [{'id': 2}]
+    assert json.loads(bytes(body).decode('utf-8')) == {'id': 1}
+
+
+def test_message_buffer_headers():
+    """Test messages with a charset and invalid headers."""
+    message_buffer = MessageBuffer()
+    message_buffer.feed(make_message(
+        {'result': u'é'}, encoding='utf-16',
+        content_type=b'application/vscode-jsonrpc; charset=utf-16'))
+    message_buffer.feed(make_message({'id': 1}, content_type=b'text; '
+                                     b'charset=utf8'))
+    assert get_messages(message_buffer) == [{'result': u'é'}, {'id': 1}]
+
+    message_buffer.feed(b'Content-Type: text\r\n\r\n')
+    message_buffer.feed(make_message({'id': 2}))
+    with pytest.raises(ValueError):
+        message_buffer.next_message()
+    assert get_messages(message_buffer) == [{'id': 2}]
+
+
+def test_client_listen_raw_messages():
+    """Test that raw messages from the client are framed and sent."""
+    body = json.dumps({'id': 1, 'method': 'initialize'}).encode('utf-8')
+    client = LanguageServerClient(raw_messages=True)
+    client.zmq_in_socket = Mock()
+    client.zmq_in_socket.poll.return_value = 1
+    client.zmq_in_socket.recv.return_value = body
+    client.transport_send = Mock()
+    client.listen()
+    client.transport_send.assert_called_once_with(frame_message(body), body)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for the LSP manager.
+"""
+
+# Standard library imports
+try:
+    from unittest.mock import Mock
+except ImportError:
+    from mock import Mock  # Python 2
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.completion.languageserver import LSPRequestTypes
+from spyder.plugins.completion.languageserver.plugin import (
+    LanguageServerPlugin)
+from spyder.plugins.completion.languageserver.tests.conftest import (
+    MainWindowMock)
+
+
+def test_cancel_request(qtbot):
+    """Test that cancelled requests are cancelled in the LSP client."""
+    manager = LanguageServerPlugin(parent=MainWindowMock())
+    client = Mock()
+    client.perform_request.return_value = 7
+    manager.clients['python'] = {'status': manager.RUNNING,
+                                 'config': {}, 'instance': client}
+    manager.send_request('python', LSPRequestTypes.DOCUMENT_HOVER,
+                         {'file': 'test.py'}, 0)
+    assert manager.client_requests == {0: 7}
+
+    manager.cancel_request('python', 0)
+    client.perform_request.assert_called_with(
+        LSPRequestTypes.CANCEL_REQUEST, {'id': 7})
+    assert manager.client_requests == {}
+    assert 0 not in manager.requests
+
+    # Requests that weren't sent to the client are not cancelled there
+    manager.cancel_request('python', 1)
+    assert client.perform_request.call_count == 2
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -21,12 +21,16 @@ import socket
 import logging
 from threading import Thread, Lock
 
+from spyder.plugins.completion.languageserver.transport.common.framing import (
+    MessageBuffer)
+
 if not os.name == 'nt':
     from pexpect.fdpexpect import fdspawn
 
 
 TIMEOUT = 5000
 PID = os.getpid()
+CHUNK_SIZE = 65536
 
 
 logger = logging.getLogger(__name__)
@@ -42,14 +46,21 @@ class IncomingMessageThread(Thread):
         self.expect_body = False
         self.mutex = Lock()
 
-    def initialize(self, fd, zmq_sock, req_status, expectable=False):
+    def initialize(self, fd, zmq_sock, req_status, expectable=False,
+                   raw_messages=False):
         self.fd = fd
         self.expect = None
         self.expectable = expectable
+        self.raw_messages = raw_messages
         logger.info('Reading thread initialized')
         self.read_incoming = self.read_posix
         self.expect = self.fd
-        if not expectable:
+        if raw_messages:
+            # Messages are split from chunks of the stream and their JSON
+            # bytes are forwarded as they are
+            self.message_buffer = MessageBuffer()
+            self.read_incoming = self.read_raw
+        elif not expectable:
             if os.name == 'nt':
                 self.read_incoming = self.expect_windows
             else:
@@ -99,12 +110,52 @@ class IncomingMessageThread(Thread):
             pending_bytes -= len(recv)
         return self.encode_body(buffer, headers)
 
+    def read_raw(self):
+        """
+        Read the next message and return its body as UTF-8 encoded JSON.
+
+        The body is a memoryview of the buffer of received data, which is
+        only valid until the next call.
+        """
+        while True:
+            try:
+                message = self.message_buffer.next_message()
+            except ValueError as e:
+                logger.error(e)
+                continue
+            if message is not None:
+                body, encoding = message
+                if encoding != 'utf-8':
+                    body = bytes(body).decode(encoding).encode('utf-8')
+                return body
+            pending_bytes = self.message_buffer.pending_bytes()
+            data = self.read_chunk(max(pending_bytes, CHUNK_SIZE))
+            if not data:
+                raise EOFError('The language server closed the connection')
+            self.message_buffer.feed(data)
+
+    def send_raw(self, body):
+        """Forward a message body to the client without decoding it."""
+        # pyzmq copies the body to the message, so it's safe to reuse the
+        # buffer afterwards
+        self.zmq_sock.send(body, copy=True)
+        logger.debug('Message sent')
+
     def run(self):
         while True:
             with self.mutex:
                 if self.stopped:
                     logger.debug('Stopping Thread...')
                     break
+            if self.raw_messages:
+                try:
+                    self.send_raw(self.read_incoming())
+                except EOFError as e:
+                    logger.error(e)
+                    break
+                except socket.error as e:
+                    logger.error(e)
+                continue
             try:
                 body = self.read_incoming()
                 err = False
@@ -134,3 +185,11 @@ class IncomingMessageThread(Thread):
     def read_num_bytes(self, n):
         """Subclasses should override this method"""
         return NotImplementedError("Not implemented")
+
+    def read_chunk(self, n):
+        """
+        Read up to `n` bytes, returning the data that is available without
+        waiting for all of them, and an empty string at the end of the
+        stream.
+        """
+        return self.read_num_bytes(n)
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2009- Spyder Project Contributors
+#
+# Distributed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+
+"""
+Spyder MS Language Server Protocol v3.0 message framing.
+
+This module parses the Content-Length framed messages sent by an LSP server
+from a stream of bytes, without decoding their JSON content.
+"""
+
+
+HEADERS_END = b'\r\n\r\n'
+CONTENT_LENGTH = b'Content-Length: %d\r\n\r\n'
+DEFAULT_ENCODING = 'utf-8'
+
+
+def parse_headers(headers):
+    """Parse a block of headers to a dict."""
+    header_dict = {}
+    for line in headers.split(b'\r\n'):
+        if line:
+            key, __, value = line.partition(b':')
+            header_dict[key.strip()] = value.strip()
+    return header_dict
+
+
+def get_encoding(headers):
+    """Return the encoding of the body of a message from its headers."""
+    content_type = headers.get(b'Content-Type')
+    if content_type is not None and b'charset=' in content_type:
+        encoding = content_type.split(b'charset=')[-1].split(b';')[0]
+        encoding = encoding.strip().decode('ascii')
+        # Old versions of the protocol used 'utf8'
+        if encoding.lower().replace('-', '') != 'utf8':
+            return encoding
+    return DEFAULT_ENCODING
+
+
+def frame_message(body):
+    """Return the headers to send before the UTF-8 encoded JSON `body`."""
+    return CONTENT_LENGTH % len(body)
+
+
+class MessageBuffer(object):
+    """
+    Buffer to split a stream of bytes in Content-Length framed messages.
+
+    Data is appended to a `bytearray` and the bodies of messages are
+    returned as `memoryview` slices of it, so they are never copied. A new
+    buffer is started with the unparsed data when more data is fed after
+    a message was returned, which keeps the previous bodies valid.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        # Offset of the first unparsed message
+        self.start = 0
+        # Body offset, length and encoding of the message being received
+        self.body_start = None
+        self.content_length = None
+        self.encoding = None
+
+    def feed(self, data):
+        """Append `data` read from the stream."""
+        if self.start:
+            self.buffer = self.buffer[self.start:]
+            if self.body_start is not None:
+                self.body_start -= self.start
+            self.start = 0
+        self.buffer += data
+
+    def next_message(self):
+        """
+        Return the (body, encoding) of the next complete message, or None
+        if more data is needed.
+
+        Raises ValueError for messages without a valid Content-Length
+        header, which are skipped.
+        """
+        buffer = self.buffer
+        if self.body_start is None:
+            headers_end = buffer.find(HEADERS_END, self.start)
+            if headers_end < 0:
+                return None
+            headers = parse_headers(bytes(buffer[self.start:headers_end]))
+            body_start = headers_end + len(HEADERS_END)
+            try:
+                self.content_length = int(headers[b'Content-Length'])
+            except (KeyError, ValueError):
+                self.start = body_start
+                raise ValueError('Invalid message headers: {0}'.format(
+                    headers))
+            self.body_start = body_start
+            self.encoding = get_encoding(headers)
+
+        body_end = self.body_start + self.content_length
+        if len(buffer) < body_end:
+            return None
+
+        body = memoryview(buffer)[self.body_start:body_end]
+        self.start = body_end
+        self.body_start = None
+        return body, self.encoding
+
+    def pending_bytes(self):
+        """Return the number of bytes missing to complete the next message."""
+        if self.body_start is None:
+            return 0
+        return max(self.body_start + self.content_length - len(self.buffer),
+                   0)
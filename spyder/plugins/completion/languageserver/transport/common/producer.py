@@ -24,6 +24,10 @@ import logging
 # Third party imports
 import zmq
 
+# Local imports
+from spyder.plugins.completion.languageserver.transport.common.framing import (
+    frame_message)
+
 TIMEOUT = 5000
 LOCALHOST = '127.0.0.1'
 
@@ -34,9 +38,13 @@ class LanguageServerClient(object):
     """Base implementation of a v3.0 compilant language server client."""
     CONTENT_LENGTH = 'Content-Length: {0}\r\n\r\n'
 
-    def __init__(self, zmq_in_port=7000, zmq_out_port=7001):
+    def __init__(self, zmq_in_port=7000, zmq_out_port=7001,
+                 raw_messages=False):
         self.zmq_in_port = zmq_in_port
         self.zmq_out_port = zmq_out_port
+        # Whether messages are exchanged with the Spyder client as UTF-8
+        # encoded JSON instead of pickled objects
+        self.raw_messages = raw_messages
         self.context = None
         self.zmq_in_socket = None
         self.zmq_out_socket = None
@@ -61,13 +69,23 @@ class LanguageServerClient(object):
         self.zmq_out_socket.connect("tcp://{0}:{1}".format(
             LOCALHOST, self.zmq_out_port))
         logger.info('Sending server_ready...')
-        self.zmq_out_socket.send_pyobj({'id': -1, 'method': 'server_ready',
-                                        'params': {}})
+        server_ready = {'id': -1, 'method': 'server_ready', 'params': {}}
+        if self.raw_messages:
+            self.zmq_out_socket.send(json.dumps(server_ready).encode('utf-8'))
+        else:
+            self.zmq_out_socket.send_pyobj(server_ready)
 
     def listen(self):
         events = self.zmq_in_socket.poll(TIMEOUT)
         # requests = []
         while events > 0:
+            if self.raw_messages:
+                # The client already sends complete JSONRPC messages
+                body = self.zmq_in_socket.recv()
+                logger.debug("Client Event: {0}".format(body))
+                self.transport_send(frame_message(body), body)
+                events -= 1
+                continue
             client_request = self.zmq_in_socket.recv_pyobj()
             logger.debug("Client Event: {0}".format(client_request))
             server_request = self.__compose_request(client_request)
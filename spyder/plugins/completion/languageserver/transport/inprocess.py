@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2009- Spyder Project Contributors
+#
+# Distributed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+
+"""
+Spyder MS Language Server Protocol v3.0 in-process transport.
+
+This module exchanges messages with an LSP server through stdio pipes or a
+TCP socket directly from the Qt event loop, without the transport process
+and its ZMQ relay.
+"""
+
+import json
+import logging
+import time
+
+from qtpy.QtCore import QObject, QProcess, QTimer, Signal, Slot
+from qtpy.QtNetwork import QAbstractSocket, QTcpSocket
+
+from spyder.plugins.completion.languageserver.transport.common.framing import (
+    MessageBuffer, frame_message)
+
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessTransport(QObject):
+    """Transport to talk to a language server from Spyder's event loop."""
+
+    # Time to wait for a TCP server to accept connections (in seconds)
+    MAX_CONNECTION_TIME = 20
+    # Time between connection attempts (in ms)
+    RETRY_INTERVAL = 100
+
+    #: Signal emitted with each message (a dict) received from the server.
+    sig_message_received = Signal(object)
+
+    #: Signal emitted when the server can receive messages.
+    sig_connected = Signal()
+
+    #: Signal emitted when the server stops or can't be reached.
+    sig_disconnected = Signal()
+
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        self.message_buffer = MessageBuffer()
+        self.process = None
+        self.socket = None
+        self.host = None
+        self.port = None
+        self.connected = False
+        self.stopped = False
+        self.down = False
+        self.connection_start = None
+        # Messages sent before the connection was established
+        self.pending_messages = []
+
+    # ---- Connection
+    def start_process(self, args, stderr_file=None):
+        """Start a server that communicates through stdio pipes."""
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.SeparateChannels)
+        if stderr_file is None:
+            stderr_file = QProcess.nullDevice()
+        self.process.setStandardErrorFile(stderr_file)
+        self.process.readyReadStandardOutput.connect(self._on_process_output)
+        self.process.started.connect(self._on_connected)
+        self.process.finished.connect(self._on_disconnected)
+        logger.info('Starting server on stdio: {0}'.format(' '.join(args)))
+        self.process.start(args[0], args[1:])
+
+    def connect_to_server(self, host, port):
+        """Connect to a server listening on a TCP port."""
+        self.host = host
+        self.port = int(port)
+        self.socket = QTcpSocket(self)
+        self.socket.readyRead.connect(self._on_socket_data)
+        self.socket.connected.connect(self._on_connected)
+        self.socket.stateChanged.connect(self._on_socket_state_changed)
+        self.connection_start = time.time()
+        logger.info('Connecting to language server at {0}:{1}'.format(
+            host, port))
+        self.socket.connectToHost(self.host, self.port)
+
+    def is_alive(self):
+        """Return True unless the connection to the server was lost."""
+        if self.stopped or self.down:
+            return False
+        if self.process is not None:
+            return self.process.state() != QProcess.NotRunning
+        return self.socket is not None
+
+    def stop(self):
+        """Close the connection and stop the server process, if any."""
+        if self.stopped:
+            return
+        self.stopped = True
+        self.pending_messages = []
+        if self.process is not None:
+            self.process.finished.disconnect(self._on_disconnected)
+            self.process.kill()
+            self.process.waitForFinished(1000)
+        if self.socket is not None:
+            self.socket.stateChanged.disconnect(self._on_socket_state_changed)
+            self.socket.abort()
+
+    # ---- Messages
+    def send(self, message):
+        """Send a message (a dict) to the server."""
+        body = json.dumps(message).encode('utf-8')
+        data = frame_message(body) + body
+        if not self.connected:
+            self.pending_messages.append(data)
+        else:
+            self._write(data)
+
+    def _write(self, data):
+        if self.process is not None:
+            self.process.write(data)
+        elif self.socket is not None:
+            self.socket.write(data)
+
+    def _feed(self, data):
+        """Split received data in messages and emit them."""
+        self.message_buffer.feed(data)
+        while not (self.stopped or self.down):
+            try:
+                message = self.message_buffer.next_message()
+            except ValueError as e:
+                logger.error(e)
+                continue
+            if message is None:
+                break
+            body, encoding = message
+            try:
+                message = json.loads(bytes(body).decode(encoding))
+            except ValueError as e:
+                logger.error(e)
+                continue
+            self.sig_message_received.emit(message)
+
+    # ---- Qt slots
+    @Slot()
+    def _on_connected(self):
+        self.connected = True
+        logger.debug('Connected to the language server')
+        pending_messages, self.pending_messages = self.pending_messages, []
+        for data in pending_messages:
+            self._write(data)
+        self.sig_connected.emit()
+
+    @Slot()
+    def _on_disconnected(self):
+        if not self.stopped and not self.down:
+            logger.error('The language server is down')
+            self.down = True
+            self.sig_disconnected.emit()
+
+    @Slot()
+    def _on_process_output(self):
+        self._feed(self.process.readAllStandardOutput().data())
+
+    @Slot()
+    def _on_socket_data(self):
+        self._feed(self.socket.readAll().data())
+
+    @Slot(QAbstractSocket.SocketState)
+    def _on_socket_state_changed(self, state):
+        if (state != QAbstractSocket.UnconnectedState or self.stopped or
+                self.down):
+            return
+        if self.connected:
+            self._on_disconnected()
+        elif time.time() - self.connection_start > self.MAX_CONNECTION_TIME:
+            logger.error('Timeout connecting to the language server: '
+                         '{0}'.format(self.socket.errorString()))
+            self._on_disconnected()
+        else:
+            # The server may not be listening yet
+            QTimer.singleShot(self.RETRY_INTERVAL, self._retry_connection)
+
+    @Slot()
+    def _retry_connection(self):
+        if not (self.stopped or self.down or self.connected):
+            self.socket.connectToHost(self.host, self.port)
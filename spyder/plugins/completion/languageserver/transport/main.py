@@ -62,6 +62,10 @@ parser.add_argument('--external-server',
 parser.add_argument('--stdio-server',
                     action="store_true",
                     help='Server communication should use stdio pipes')
+parser.add_argument('--raw-messages',
+                    action="store_true",
+                    help='Exchange UTF-8 encoded JSON messages with the '
+                         'client instead of pickled objects')
 parser.add_argument('--transport-debug',
                     default=0,
                     type=int,
@@ -135,7 +139,8 @@ if __name__ == '__main__':
                                        host=args.server_host,
                                        port=args.server_port)
     client = LanguageServerClient(zmq_in_port=args.zmq_in_port,
-                                  zmq_out_port=args.zmq_out_port)
+                                  zmq_out_port=args.zmq_out_port,
+                                  raw_messages=args.raw_messages)
     client.start()
     is_alive = True
 
@@ -15,6 +15,8 @@ client via ZMQ.
 """
 
 import logging
+import os
+
 from spyder.plugins.completion.languageserver.transport.common.consumer import (
     IncomingMessageThread)
 
@@ -26,3 +28,7 @@ class StdioIncomingMessageThread(IncomingMessageThread):
 
     def read_num_bytes(self, n):
         return self.fd.read(n).encode('utf-8')
+
+    def read_chunk(self, n):
+        # Read from the stdout pipe of the server without waiting for n bytes
+        return os.read(self.fd.fileno(), n)
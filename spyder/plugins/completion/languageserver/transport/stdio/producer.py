@@ -17,6 +17,8 @@ LSP server via stdio pipes.
 
 # Standard library imports
 import os
+import shlex
+import subprocess
 import time
 import logging
 
@@ -36,19 +38,32 @@ class StdioLanguageServerClient(LanguageServerClient):
     MAX_TIMEOUT_TIME = 20000
 
     def __init__(self, server_args='', log_file='',
-                 zmq_in_port=7000, zmq_out_port=7001):
+                 zmq_in_port=7000, zmq_out_port=7001, raw_messages=False):
         super(StdioLanguageServerClient, self).__init__(
-            zmq_in_port, zmq_out_port)
+            zmq_in_port, zmq_out_port, raw_messages)
         self.req_status = {}
         self.process = None
         logger.debug(server_args)
         logger.debug('Redirect stderr to {0}'.format(log_file))
-        self.process = popen_spawn.PopenSpawn(server_args)
+        if raw_messages:
+            # Pipes are read and written directly, without pexpect
+            self.process = subprocess.Popen(
+                shlex.split(server_args, posix=os.name != 'nt'),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE)
+        else:
+            self.process = popen_spawn.PopenSpawn(server_args)
         logger.info('Connecting to language server on stdio')
         super(StdioLanguageServerClient, self).finalize_initialization()
         self.reading_thread = StdioIncomingMessageThread()
-        self.reading_thread.initialize(self.process, self.zmq_out_socket,
-                                       self.req_status, expectable=True)
+        if raw_messages:
+            self.reading_thread.initialize(self.process.stdout,
+                                           self.zmq_out_socket,
+                                           self.req_status,
+                                           raw_messages=True)
+        else:
+            self.reading_thread.initialize(self.process, self.zmq_out_socket,
+                                           self.req_status, expectable=True)
 
     def start(self):
         self.reading_thread.start()
@@ -61,6 +76,11 @@ class StdioLanguageServerClient(LanguageServerClient):
         logger.debug('Exit routine should be complete')
 
     def transport_send(self, content_length, body):
+        if self.raw_messages:
+            self.process.stdin.write(content_length)
+            self.process.stdin.write(body)
+            self.process.stdin.flush()
+            return
         if os.name == 'nt':
             content_length = content_length.decode('utf-8')
             body = body.decode('utf-8')
@@ -74,7 +94,10 @@ class StdioLanguageServerClient(LanguageServerClient):
         initial_time = time.time()
         try:
             while not connected:
-                connected = not self.process.proc.poll()
+                if self.raw_messages:
+                    connected = not self.process.poll()
+                else:
+                    connected = not self.process.proc.poll()
                 if time.time() - initial_time > self.MAX_TIMEOUT_TIME:
                     connection_error = 'Timeout communication period exceeded'
                     break
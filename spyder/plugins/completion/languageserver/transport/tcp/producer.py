@@ -36,8 +36,9 @@ class TCPLanguageServerClient(LanguageServerClient):
     MAX_TIMEOUT_TIME = 20000
 
     def __init__(self, host='127.0.0.1', port=2087, zmq_in_port=7000,
-                 zmq_out_port=7001):
-        LanguageServerClient.__init__(self, zmq_in_port, zmq_out_port)
+                 zmq_out_port=7001, raw_messages=False):
+        LanguageServerClient.__init__(self, zmq_in_port, zmq_out_port,
+                                      raw_messages)
         self.req_status = {}
         self.host = host
         self.port = port
@@ -49,7 +50,8 @@ class TCPLanguageServerClient(LanguageServerClient):
         self.socket.setblocking(True)
         self.reading_thread = TCPIncomingMessageThread()
         self.reading_thread.initialize(self.socket, self.zmq_out_socket,
-                                       self.req_status)
+                                       self.req_status,
+                                       raw_messages=raw_messages)
 
     def start(self):
         self.reading_thread.start()
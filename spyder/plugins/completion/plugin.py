@@ -14,6 +14,7 @@ import logging
 import os
 import os.path as osp
 import functools
+import weakref
 
 # Third-party imports
 from qtpy.QtCore import QObject, Slot, QMutex, QMutexLocker, QTimer
@@ -74,10 +75,20 @@ class CompletionManager(SpyderCompletionPlugin):
             ),
         })
 
+    # Requests superseded by newer ones of the same type and editor
+    SUPERSEDED_REQUESTS = {
+        LSPRequestTypes.DOCUMENT_COMPLETION,
+        LSPRequestTypes.DOCUMENT_SIGNATURE,
+        LSPRequestTypes.DOCUMENT_HOVER,
+    }
+
     def __init__(self, parent, plugins=['lsp', 'kite', 'fallback']):
         SpyderCompletionPlugin.__init__(self, parent)
         self.clients = {}
         self.requests = {}
+        # Last request of each superseded type, per editor. Editors are
+        # weakly referenced, so they are forgotten when they're closed.
+        self.last_requests = weakref.WeakKeyDictionary()
         self.language_status = {}
         self.started = False
         self.req_id = 0
@@ -140,6 +151,7 @@ class CompletionManager(SpyderCompletionPlugin):
 
         def send():
             del self.requests[req_id]
+            self._forget_last_request(req_id, request_responses)
             self.gather_and_send(request_responses)
 
         wait_for = set(source for source
@@ -223,10 +235,42 @@ class CompletionManager(SpyderCompletionPlugin):
         status = self.clients.get(name, {}).get('status', self.STOPPED)
         return status == self.RUNNING
 
+    def _forget_last_request(self, req_id, request):
+        last_requests = self.last_requests.get(request['response_instance'])
+        req_type = request['req_type']
+        if last_requests is not None and last_requests.get(req_type) == req_id:
+            del last_requests[req_type]
+
+    def cancel_request(self, req_id):
+        """
+        Cancel a request, so that its responses are discarded.
+
+        Clients are notified so they can stop computing them.
+        """
+        with QMutexLocker(self.collection_mutex):
+            request = self.requests.pop(req_id, None)
+            if request is None:
+                return
+            self._forget_last_request(req_id, request)
+
+        logger.debug("Completion plugin: Cancel request {0}".format(req_id))
+        for client_name in self.clients:
+            client_info = self.clients[client_name]
+            client_info['plugin'].cancel_request(request['language'], req_id)
+
     def send_request(self, language, req_type, req):
         req_id = self.req_id
         self.req_id += 1
 
+        # A new request supersedes the one of the same type sent by the same
+        # editor, if it's still waiting for responses
+        if req_type in self.SUPERSEDED_REQUESTS:
+            last_requests = self.last_requests.setdefault(
+                req['response_instance'], {})
+            if req_type in last_requests:
+                self.cancel_request(last_requests[req_type])
+            last_requests[req_type] = req_id
+
         self.requests[req_id] = {
             'language': language,
             'req_type': req_type,
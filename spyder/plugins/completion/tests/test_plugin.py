@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for the completion manager.
+"""
+
+# Standard library imports
+import gc
+try:
+    from unittest.mock import Mock
+except ImportError:
+    from mock import Mock  # Python 2
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.api.completion import SpyderCompletionPlugin
+from spyder.plugins.completion.languageserver import LSPRequestTypes
+from spyder.plugins.completion.plugin import CompletionManager
+
+
+class CompletionClientMock(SpyderCompletionPlugin):
+    """Completion client that records the requests it gets."""
+
+    def __init__(self, name):
+        SpyderCompletionPlugin.__init__(self, None)
+        self.COMPLETION_CLIENT_NAME = name
+        self.send_request = Mock()
+        self.cancel_request = Mock()
+
+
+@pytest.fixture
+def completion_manager(qtbot):
+    manager = CompletionManager(None, plugins=[])
+    manager.wait_for_ms = 0
+    clients = [CompletionClientMock(name) for name in ('lsp', 'kite')]
+    for client in clients:
+        manager.register_completion_plugin(client)
+    return manager, clients
+
+
+def test_superseded_requests(completion_manager):
+    """Test that a request cancels the previous one of the same editor."""
+    manager, clients = completion_manager
+    editor = Mock()
+    req = {'file': 'test.py', 'response_instance': editor}
+    completion = LSPRequestTypes.DOCUMENT_COMPLETION
+    manager.send_request('python', completion, req)
+    manager.send_request('python', completion, req)
+    for client in clients:
+        client.cancel_request.assert_called_once_with('python', 0)
+        assert client.send_request.call_count == 2
+
+    # The late response of the first request is dropped
+    response = {'params': [{'label': 'spam', 'sortText': 'a'}]}
+    manager.receive_response('lsp', 0, response)
+    assert not editor.handle_response.called
+
+    manager.receive_response('lsp', 1, response)
+    editor.handle_response.assert_called_once_with(
+        completion, {'params': [{'label': 'spam', 'sortText': (1, 'a')}]})
+    assert not manager.requests
+
+    # Requests of other types or editors are not cancelled
+    manager.send_request('python', LSPRequestTypes.DOCUMENT_HOVER, req)
+    manager.send_request('python', completion, req)
+    manager.send_request('python', completion,
+                         {'file': 'test.py', 'response_instance': Mock()})
+    for client in clients:
+        assert client.cancel_request.call_count == 1
+
+
+def test_last_requests_dont_keep_editors(completion_manager):
+    """Test that the last requests of closed editors are forgotten."""
+    manager, clients = completion_manager
+    editor = Mock()
+    manager.send_request('python', LSPRequestTypes.DOCUMENT_HOVER,
+                         {'file': 'test.py', 'response_instance': editor})
+    manager.receive_response('lsp', 0, {'params': 'spam'})
+    assert len(manager.last_requests) == 1
+
+    del editor
+    gc.collect()
+    assert len(manager.last_requests) == 0
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -14,7 +14,6 @@ import inspect
 # Third party imports
 from qtpy.QtGui import QTextCursor, QColor
 from qtpy.QtCore import Qt, QMutex, QMutexLocker
-from diff_match_patch import diff_match_patch
 
 try:
     from rtree import index
@@ -29,7 +28,6 @@ from spyder.utils.snippets.ast import build_snippet_ast, nodes, tokenize
 
 
 MERGE_ALLOWED = {'int', 'name', 'whitespace'}
-VALID_UPDATES = {diff_match_patch.DIFF_DELETE, diff_match_patch.DIFF_INSERT}
 
 
 def no_undo(f):
@@ -139,12 +137,7 @@ class SnippetsExtension(EditorExtension):
         if len(self.undo_stack) == 0:
             self.reset()
         if self.is_snippet_active:
-            num_pops = 0
-            patch = self.editor.patch
-            for diffs in patch:
-                for (op, data) in diffs.diffs:
-                    if op in VALID_UPDATES:
-                        num_pops += len(data)
+            num_pops = self.editor.num_changed_chars
             if len(self.undo_stack) > 0:
                 for _ in range(num_pops):
                     if len(self.undo_stack) == 0:
@@ -163,12 +156,7 @@ class SnippetsExtension(EditorExtension):
     @no_undo
     def _redo(self):
         if self.is_snippet_active:
-            num_pops = 0
-            patch = self.editor.patch
-            for diffs in patch:
-                for (op, data) in diffs.diffs:
-                    if op in VALID_UPDATES:
-                        num_pops += len(data)
+            num_pops = self.editor.num_changed_chars
             if len(self.redo_stack) > 0:
                 for _ in range(num_pops):
                     if len(self.redo_stack) == 0:
@@ -73,7 +73,8 @@ class IndentationGuide(Panel):
     def set_enabled(self, state):
         """Toggle edge line visibility."""
         self._enabled = state
-        self.setVisible(state)
+        # Indent guides are hidden in large file mode, which has no folding
+        self.setVisible(state and not self.editor.large_file)
 
         # We need to request folding when toggling state so the lines
         # are computed when handling the folding response.
@@ -7,6 +7,8 @@
 This module contains the Scroll Flag panel
 """
 
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from math import ceil
 
 from qtpy.QtCore import QSize, Qt, QRect
@@ -40,7 +42,13 @@ class ScrollFlagArea(Panel):
         editor.sig_alt_left_mouse_pressed.connect(self.mousePressEvent)
         editor.sig_alt_mouse_moved.connect(self.mouseMoveEvent)
         editor.sig_leave_out.connect(self.update)
-        editor.sig_flags_changed.connect(self.update)
+        editor.sig_flags_changed.connect(self.update_flags)
+
+        # Line numbers of the warnings, errors, todos and breakpoints,
+        # computed again only after they change (see get_flags), and number
+        # of lines of the document when they were computed
+        self._flags = None
+        self._line_count = 0
 
     @property
     def slider(self):
@@ -66,6 +74,90 @@ class ScrollFlagArea(Panel):
         """Override Qt method"""
         return QSize(self.WIDTH, 0)
 
+    def update_flags(self):
+        """Forget the cached flags of the blocks and repaint the area."""
+        self._flags = None
+        self.update()
+
+    def shift_flags(self, position, chars_removed, chars_added):
+        """
+        Move the cached flags after a change of the document at `position`.
+
+        The lines joined by the removed text keep the flags of a single
+        block: the last one if the text started at the beginning of a line,
+        and the first one otherwise. The lines of the added text come after
+        that block.
+        """
+        if self._flags is None:
+            return
+        document = self.editor.document()
+        block = document.findBlock(position)
+        line = block.blockNumber()
+        end = min(position + chars_added, document.characterCount() - 1)
+        added = document.findBlock(end).blockNumber() - line
+        delta = document.blockCount() - self._line_count
+        removed = added - delta
+        if added == 0 and removed == 0:
+            return
+        if removed < 0 or (delta == 0 and chars_removed == chars_added):
+            # The number of removed lines can't be known, e.g. because only
+            # formats changed
+            self.update_flags()
+            return
+
+        self._line_count += delta
+        if removed and block.position() == position:
+            kept_line = line + removed
+        else:
+            kept_line = line
+        for line_numbers in self._flags.values():
+            start = bisect_left(line_numbers, line)
+            stop = bisect_right(line_numbers, line + removed)
+            kept = [line] if kept_line in line_numbers[start:stop] else []
+            line_numbers[start:] = kept + [line_number + delta
+                                           for line_number
+                                           in line_numbers[stop:]]
+        self.update()
+
+    def get_flags(self):
+        """
+        Return the sorted line numbers of the warnings, errors, todos and
+        breakpoints of the editor, in the order they are painted.
+
+        Going through all the blocks only happens after the flags change,
+        and never in large files, where it takes too long. Flags are moved
+        when lines are added or removed (see shift_flags).
+        """
+        if self._flags is None:
+            self._line_count = self.editor.document().blockCount()
+            flags = OrderedDict((kind, []) for kind in
+                                ('warning', 'error', 'todo', 'breakpoint'))
+            if not self.editor.large_file:
+                block = self.editor.document().firstBlock()
+                line_number = 0
+                while block.isValid():
+                    data = block.userData()
+                    if data:
+                        if data.code_analysis:
+                            error = any(
+                                severity == DiagnosticSeverity.ERROR
+                                for (source, code, severity,
+                                     message) in data.code_analysis)
+                            kind = 'error' if error else 'warning'
+                            flags[kind].append(line_number)
+                        if data.todo:
+                            flags['todo'].append(line_number)
+                        if data.breakpoint:
+                            flags['breakpoint'].append(line_number)
+                    block = block.next()
+                    line_number += 1
+            self._flags = flags
+        return self._flags
+
+    def get_flag_color(self, kind):
+        """Return the color of the flags of `kind`."""
+        return getattr(self.editor, '{0}_color'.format(kind))
+
     def paintEvent(self, event):
         """
         Override Qt method.
@@ -77,30 +169,12 @@ class ScrollFlagArea(Panel):
         painter = QPainter(self)
         painter.fillRect(event.rect(), self.editor.sideareas_color)
 
-        # Paint warnings and todos
-        block = self.editor.document().firstBlock()
-        for line_number in range(self.editor.document().blockCount()+1):
-            data = block.userData()
-            if data:
-                if data.code_analysis:
-                    # Paint the warnings
-                    color = self.editor.warning_color
-                    for source, code, severity, message in data.code_analysis:
-                        error = severity == DiagnosticSeverity.ERROR
-                        if error:
-                            color = self.editor.error_color
-                            break
-                    self.set_painter(painter, color)
-                    painter.drawRect(make_flag(line_number))
-                if data.todo:
-                    # Paint the todos
-                    self.set_painter(painter, self.editor.todo_color)
-                    painter.drawRect(make_flag(line_number))
-                if data.breakpoint:
-                    # Paint the breakpoints
-                    self.set_painter(painter, self.editor.breakpoint_color)
+        # Paint the warnings, errors, todos and breakpoints
+        for kind, line_numbers in self.get_flags().items():
+            if line_numbers:
+                self.set_painter(painter, self.get_flag_color(kind))
+                for line_number in line_numbers:
                     painter.drawRect(make_flag(line_number))
-            block = block.next()
 
         # Paint the occurrences
         if self.editor.occurrences:
@@ -6,10 +6,11 @@
 
 # Standard library imports
 import os
+import random
 
 # Third party imports
 from qtpy.QtCore import QPoint, Qt
-from qtpy.QtGui import QFont
+from qtpy.QtGui import QFont, QTextCursor
 
 import pytest
 
@@ -147,6 +148,77 @@ def test_flag_painting(editor_bot, qtbot):
         editor.setTextCursor(cursor)
 
 
+def test_flags_index(editor_bot):
+    """Test that the flags painted in the scrollflag area are cached and
+    updated when they or the number of lines change."""
+    editor = editor_bot
+    sfa = editor.scrollflagarea
+    editor.set_text(short_code)
+    assert not any(sfa.get_flags().values())
+
+    editor.debugger.toogle_breakpoint(line_number=2)
+    editor.process_todo([[True, 3]])
+    analysis = [{'source': 'pycodestyle', 'range': {
+                    'start': {'line': 3, 'character': 0},
+                    'end': {'line': 3, 'character': 1}},
+                 'code': 'E227', 'message': 'E227 warning', 'severity': 2},
+                {'source': 'pyflakes', 'range': {
+                    'start': {'line': 4, 'character': 0},
+                    'end': {'line': 4, 'character': 1}},
+                 'message': 'syntax error', 'severity': 1}]
+    editor.process_code_analysis(analysis)
+    flags = sfa.get_flags()
+    assert flags == {'warning': [3], 'error': [4], 'todo': [2],
+                     'breakpoint': [1]}
+    assert sfa.get_flags() is flags
+
+    # Adding a line moves the flags after it, without going through the
+    # blocks again
+    cursor = editor.textCursor()
+    cursor.setPosition(0)
+    cursor.insertText('\n')
+    assert sfa.get_flags() is flags
+    assert flags == {'warning': [4], 'error': [5], 'todo': [3],
+                     'breakpoint': [2]}
+
+    # Removing lines from the start of a line keeps the flags of the last
+    # one, like its block, and moves the flags after them
+    block = editor.document().findBlockByNumber(2)
+    cursor.setPosition(block.position())
+    cursor.setPosition(block.next().next().position() + 1,
+                       QTextCursor.KeepAnchor)
+    cursor.removeSelectedText()
+    assert sfa.get_flags() is flags
+    assert flags == {'warning': [2], 'error': [3], 'todo': [],
+                     'breakpoint': []}
+    sfa.update_flags()
+    assert sfa.get_flags() == flags
+
+    editor.debugger.clear_breakpoints()
+    assert sfa.get_flags()['breakpoint'] == []
+
+
+def test_flags_index_random_changes(editor_bot):
+    """Test that moving the cached flags gives the flags of the blocks."""
+    editor = editor_bot
+    sfa = editor.scrollflagarea
+    editor.set_text(long_code)
+    editor.process_todo([[True, line] for line in range(1, 40, 3)])
+    random.seed(0)
+    for __ in range(50):
+        sfa.get_flags()
+        cursor = editor.textCursor()
+        length = editor.document().characterCount() - 1
+        position = random.randint(0, length)
+        cursor.setPosition(position)
+        cursor.setPosition(min(position + random.randint(0, 20), length),
+                           QTextCursor.KeepAnchor)
+        cursor.insertText(random.choice(['', '\n', 'a\nb', '\n\n']))
+        flags = dict(sfa.get_flags())
+        sfa.update_flags()
+        assert sfa.get_flags() == flags
+
+
 @pytest.mark.skipif(not os.name == 'nt', reason="It fails on Travis")
 def test_range_indicator_visible_on_hover_only(editor_bot, qtbot):
     """Test that the slider range indicator is visible only when hovering
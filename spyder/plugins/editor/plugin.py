@@ -1253,6 +1253,8 @@ class Editor(SpyderPluginWidget):
             ('set_highlight_current_cell_enabled',  'highlight_current_cell'),
             ('set_occurrence_highlighting_enabled',  'occurrence_highlighting'),
             ('set_occurrence_highlighting_timeout',  'occurrence_highlighting/timeout'),
+            ('set_large_file_size',                 'large_file/size'),
+            ('set_large_file_lines',                'large_file/lines'),
             ('set_checkeolchars_enabled',           'check_eol_chars'),
             ('set_tabbar_visible',                  'show_tab_bar'),
             ('set_classfunc_dropdown_visible',      'show_class_func_dropdown'),
@@ -17,6 +17,8 @@ Original file:
 """
 
 # Third party imports
+from intervaltree import Interval, IntervalTree
+from qtpy.QtCore import QPoint
 from qtpy.QtGui import QTextCharFormat
 
 # Local imports
@@ -27,10 +29,31 @@ class TextDecorationsManager(Manager):
     """
     Manages the collection of TextDecoration that have been set on the editor
     widget.
+
+    Decorations are indexed by their range in the document, and only the
+    ones around the visible lines are set as extra selections of the editor.
+    The positions in the index are not updated on every change of the
+    document: instead, queries are widened by the number of characters
+    changed since the index was built, which bounds how far any decoration
+    can have moved.
     """
+
+    # Number of lines around the visible ones whose decorations are set
+    VISIBLE_MARGIN = 100
+    # Number of changed characters after which the index is built again
+    MAX_INDEX_SHIFT = 10000
+
     def __init__(self, editor):
         super(TextDecorationsManager, self).__init__(editor)
-        self._decorations = []
+        # Decorations and their interval in the index
+        self._decorations = {}
+        self._index = IntervalTree()
+        # Maximum distance between the indexed and real decoration positions
+        self._index_shift = 0
+        self._document = None
+        # Range of positions whose decorations were set on the editor
+        self._visible_range = None
+        editor.updateRequest.connect(self._on_update_request)
 
     def add(self, decorations):
         """
@@ -44,68 +67,82 @@ class TextDecorationsManager(Manager):
         Returns:
             int: Amount of decorations added.
         """
+        if not isinstance(decorations, list):
+            decorations = [decorations]
         added = 0
-        if isinstance(decorations, list):
-            not_repeated = set(decorations) - set(self._decorations)
-            self._decorations.extend(list(not_repeated))
-            added = len(not_repeated)
-        elif decorations not in self._decorations:
-            self._decorations.append(decorations)
-            added = 1
+        for decoration in decorations:
+            if decoration not in self._decorations:
+                self._add_to_index(decoration)
+                added += 1
 
         if added > 0:
-            self._order_decorations()
             self.update()
         return added
 
-    def remove(self, decoration):
+    def remove(self, decorations):
         """
-        Removes a text decoration from the editor.
+        Removes text decorations from the editor.
 
-        :param decoration: Text decoration to remove
-        :type decoration: spyder.api.TextDecoration
+        :param decorations: Text decoration to remove (could be a list)
+        :type decorations: spyder.api.TextDecoration
         """
+        if not isinstance(decorations, list):
+            decorations = [decorations]
+        removed = 0
+        for decoration in decorations:
+            interval = self._decorations.pop(decoration, None)
+            if interval is not None:
+                self._index.remove(interval)
+                removed += 1
+        if removed == 0:
+            return False
         try:
-            self._decorations.remove(decoration)
             self.update()
             return True
-        except ValueError:
-            return False
         except RuntimeError:
             # This is needed to fix spyder-ide/spyder#9173.
             pass
 
     def clear(self):
         """Removes all text decoration from the editor."""
-        self._decorations[:] = []
+        self._decorations.clear()
+        self._index.clear()
+        self._index_shift = 0
         try:
             self.update()
         except RuntimeError:
             pass
 
     def update(self):
-        """Update editor extra selections with added decorations.
+        """Update editor extra selections with the visible decorations.
 
         NOTE: Update TextDecorations to use editor font, using a different
         font family and point size could cause unwanted behaviors.
         """
-        font = self.editor.font()
-        for decoration in self._decorations:
+        editor = self.editor
+        self._check_document()
+        start, end = self._visible_range = self._get_visible_range(
+            self.VISIBLE_MARGIN)
+        shift = self._index_shift
+        decorations = [interval.data for interval in
+                       self._index.overlap(start - shift, end + shift + 1)]
+        font = editor.font()
+        for decoration in decorations:
             try:
                 decoration.format.setFont(
                         font, QTextCharFormat.FontPropertiesSpecifiedOnly)
             except (TypeError, AttributeError):  # Qt < 5.3
                 decoration.format.setFontFamily(font.family())
                 decoration.format.setFontPointSize(font.pointSize())
-        self.editor.setExtraSelections(self._decorations)
+        editor.setExtraSelections(self._order_decorations(decorations))
 
     def __iter__(self):
-        return iter(self._decorations)
+        return iter(self._order_decorations(list(self._decorations)))
 
     def __len__(self):
         return len(self._decorations)
 
-    def _order_decorations(self):
+    def _order_decorations(self, decorations):
         """Order decorations according draw_order and size of selection.
 
         Highest draw_order will appear on top of the lowest values.
@@ -118,5 +155,70 @@ class TextDecorationsManager(Manager):
             start = sel.cursor.selectionStart()
             return sel.draw_order, -(end - start)
 
-        self._decorations = sorted(self._decorations,
-                                   key=order_function)
+        return sorted(decorations, key=order_function)
+
+    def _add_to_index(self, decoration):
+        """Add `decoration` to the index, with its current range."""
+        start = decoration.cursor.selectionStart()
+        end = decoration.cursor.selectionEnd()
+        # Intervals can't be empty
+        interval = Interval(start, end + 1, decoration)
+        self._index.add(interval)
+        self._decorations[decoration] = interval
+
+    def _rebuild_index(self):
+        """Index all decorations again with their current ranges."""
+        decorations = list(self._decorations)
+        self._decorations.clear()
+        self._index.clear()
+        self._index_shift = 0
+        for decoration in decorations:
+            self._add_to_index(decoration)
+
+    def _check_document(self):
+        """Follow the changes of the editor document."""
+        document = self.editor.document()
+        if document is not self._document:
+            if self._document is not None:
+                try:
+                    self._document.contentsChange.disconnect(
+                        self._on_contents_change)
+                except (RuntimeError, TypeError):
+                    pass
+            self._document = document
+            document.contentsChange.connect(self._on_contents_change)
+            self._rebuild_index()
+        elif self._index_shift > self.MAX_INDEX_SHIFT:
+            self._rebuild_index()
+
+    def _get_visible_range(self, margin):
+        """Return the range of positions of the visible lines and `margin`
+        lines around them."""
+        editor = self.editor
+        document = editor.document()
+        first_block = editor.firstVisibleBlock()
+        last_block = editor.cursorForPosition(
+            QPoint(0, editor.viewport().height())).block()
+        first_block = document.findBlockByNumber(
+            max(first_block.blockNumber() - margin, 0))
+        last_block = document.findBlockByNumber(
+            last_block.blockNumber() + margin)
+        if not last_block.isValid():
+            last_block = document.lastBlock()
+        return (first_block.position(),
+                last_block.position() + last_block.length())
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        """Keep track of how far decorations may have moved."""
+        self._index_shift += max(chars_removed, chars_added)
+
+    def _on_update_request(self, rect, dy):
+        """Set the decorations of the lines scrolled into view."""
+        if self._visible_range is None or not self._decorations:
+            return
+        try:
+            start, end = self._get_visible_range(0)
+        except RuntimeError:
+            return
+        if start < self._visible_range[0] or end > self._visible_range[1]:
+            self.update()
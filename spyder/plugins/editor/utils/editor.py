@@ -59,6 +59,7 @@ class BlockUserData(QTextBlockUserData):
         self.breakpoint_condition = None
         self.bookmarks = []
         self.code_analysis = []
+        self.code_analysis_underlines = []
         self.todo = ''
         self.selection = cursor
         self.color = color
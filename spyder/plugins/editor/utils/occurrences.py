@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Search of the occurrences of a word in a document.
+
+The whole document is searched with a single regular expression and the
+occurrences are kept as (line, start, end) tuples, so the editor only has
+to create selections for the lines that are on screen.
+"""
+
+# Standard library imports
+from bisect import bisect_left
+import re
+
+# Local imports
+from spyder.utils.incrementallexer import NON_BMP_REGEX
+from spyder.utils.qstringhelpers import qstring_length
+
+
+def find_occurrences(text, word):
+    """
+    Return the occurrences of the whole word `word` in `text`.
+
+    Occurrences are sorted (line, start, end) tuples, with columns counted
+    in UTF-16 code units, like positions in Qt documents.
+    """
+    regexp = re.compile(r"\b{0}\b".format(re.escape(word)), re.UNICODE)
+    utf16 = NON_BMP_REGEX is not None and NON_BMP_REGEX.search(text)
+    occurrences = []
+    line = 0
+    line_start = 0
+    for match in regexp.finditer(text):
+        start, end = match.span()
+        newlines = text.count('\n', line_start, start)
+        if newlines:
+            line += newlines
+            line_start = text.rfind('\n', line_start, start) + 1
+        start -= line_start
+        end -= line_start
+        if utf16:
+            line_text = text[line_start:line_start + end]
+            start = qstring_length(line_text[:start])
+            end = qstring_length(line_text)
+        occurrences.append((line, start, end))
+    return occurrences
+
+
+def get_occurrence_lines(occurrences):
+    """Return the sorted list of lines with at least one occurrence."""
+    lines = []
+    for line, __, __ in occurrences:
+        if not lines or lines[-1] != line:
+            lines.append(line)
+    return lines
+
+
+def get_occurrences_in_lines(occurrences, first_line, last_line):
+    """Return the occurrences between `first_line` and `last_line`."""
+    start = bisect_left(occurrences, (first_line,))
+    end = bisect_left(occurrences, (last_line + 1,))
+    return occurrences[start:end]
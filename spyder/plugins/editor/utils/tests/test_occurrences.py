@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for the search of occurrences."""
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.editor.utils.occurrences import (
+    find_occurrences, get_occurrence_lines, get_occurrences_in_lines)
+from spyder.py3compat import PY2
+
+
+TEXT = u"""\
+spam = 1
+eggs = spam + spam_2
+# spam
+
+spam.spam()
+"""
+
+
+def test_find_occurrences():
+    """Test that only whole words are found, with their lines."""
+    occurrences = find_occurrences(TEXT, u'spam')
+    assert occurrences == [(0, 0, 4), (1, 7, 11), (2, 2, 6), (4, 0, 4),
+                           (4, 5, 9)]
+    assert get_occurrence_lines(occurrences) == [0, 1, 2, 4]
+    assert get_occurrences_in_lines(occurrences, 2, 3) == [(2, 2, 6)]
+    assert get_occurrences_in_lines(occurrences, 3, 10) == [(4, 0, 4),
+                                                            (4, 5, 9)]
+    assert find_occurrences(TEXT, u'ham') == []
+
+
+@pytest.mark.skipif(PY2, reason="Columns are only converted in Python 3")
+def test_find_occurrences_utf16():
+    """Test that columns are counted in UTF-16 code units."""
+    text = u"x = '\U0001F600' + x\nx"
+    assert find_occurrences(text, u'x') == [(0, 0, 1), (0, 11, 12),
+                                            (1, 0, 1)]
+
+
+if __name__ == "__main__":
+    pytest.main()
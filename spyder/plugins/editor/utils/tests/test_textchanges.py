@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""Tests for the tracking of document changes."""
+
+# Standard library imports
+import random
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.editor.utils.textchanges import (TextChangesTracker,
+                                                     apply_content_changes)
+
+
+def replace(tracker, text, position, removed, inserted):
+    """Replace text the way a Qt document would report it."""
+    line = text.count('\n', 0, position)
+    character = position - (text.rfind('\n', 0, position) + 1)
+    tracker.add_change(line, character, removed, inserted)
+    return text[:position] + inserted + text[position + removed:]
+
+
+def take_changes(tracker, text):
+    return tracker.take_changes(text.count('\n') + 1, len(text))
+
+
+def test_tracker_changes():
+    """Test the ranges of the changes sent to the server."""
+    tracker = TextChangesTracker()
+    text = 'def spam():\n    return 1\n'
+    tracker.reset(len(line) for line in text.split('\n'))
+
+    text = replace(tracker, text, 23, 1, '2\n    # eggs')
+    text = replace(tracker, text, 4, 4, 'ham')
+    changes = take_changes(tracker, text)
+    assert changes == [
+        {'range': {'start': {'line': 1, 'character': 11},
+                   'end': {'line': 1, 'character': 12}},
+         'rangeLength': 1,
+         'text': '2\n    # eggs'},
+        {'range': {'start': {'line': 0, 'character': 4},
+                   'end': {'line': 0, 'character': 8}},
+         'rangeLength': 4,
+         'text': 'ham'}]
+    assert text == 'def ham():\n    return 2\n    # eggs\n'
+    assert take_changes(tracker, text) == []
+
+
+def test_tracker_random_changes():
+    """Test that changes applied to the previous text give the new one."""
+    random.seed(0)
+    tracker = TextChangesTracker()
+    text = u'spam\neggs\n\nham = 1\n'
+    tracker.reset(len(line) for line in text.split('\n'))
+
+    for __ in range(200):
+        previous_text = text
+        for __ in range(random.randint(1, 3)):
+            position = random.randint(0, len(text))
+            removed = random.randint(0, min(5, len(text) - position))
+            inserted = u''.join(random.choice(u'ab\n ')
+                                for __ in range(random.randint(0, 4)))
+            text = replace(tracker, text, position, removed, inserted)
+        changes = take_changes(tracker, text)
+        assert apply_content_changes(previous_text, changes) == text
+
+
+def test_tracker_invalid():
+    """Test that inconsistent changes require sending the whole text."""
+    tracker = TextChangesTracker()
+    assert take_changes(tracker, 'spam') is None
+
+    tracker.reset([4])
+    tracker.add_change(0, 2, 10, 'x')
+    assert not tracker.is_valid
+    assert take_changes(tracker, 'spx') is None
+
+    tracker.reset([4])
+    assert take_changes(tracker, 'spam\n') is None
+
+
+def test_apply_full_change():
+    """Test applying a change without range."""
+    assert apply_content_changes('spam', [{'text': 'eggs'}]) == 'eggs'
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tracking of document changes for incremental LSP synchronization.
+
+Qt reports changes as a position, a number of removed characters and a
+number of added characters, while the Language Server Protocol needs the
+range of the removed text as (line, character) positions in the document
+before the change. To compute that range, the length of every line of the
+document is kept, which is much cheaper than keeping a copy of its text.
+"""
+
+
+class TextChangesTracker(object):
+    """
+    Convert document changes to LSP `TextDocumentContentChangeEvent`s.
+
+    The tracker starts in an invalid state, in which changes are not
+    recorded and the whole document has to be sent to the server. It
+    becomes valid after calling `reset` with the current document lines.
+    """
+
+    def __init__(self):
+        self.line_lengths = None
+        self.changes = []
+
+    @property
+    def is_valid(self):
+        return self.line_lengths is not None
+
+    def reset(self, line_lengths):
+        """Start tracking changes from a document with `line_lengths`."""
+        self.line_lengths = list(line_lengths) or [0]
+        self.changes = []
+
+    def invalidate(self):
+        """Stop tracking changes until the next `reset`."""
+        self.line_lengths = None
+        self.changes = []
+
+    def add_change(self, line, character, removed, text):
+        """
+        Record that `removed` characters were replaced by `text` at
+        (`line`, `character`).
+
+        Lines are separated by a single character, as in Qt documents.
+        """
+        if self.line_lengths is None:
+            return
+        line_lengths = self.line_lengths
+
+        # Compute where the removed text ended
+        end_line = line
+        end_character = character + removed
+        while (end_line < len(line_lengths) and
+                end_character > line_lengths[end_line]):
+            end_character -= line_lengths[end_line] + 1
+            end_line += 1
+        if line >= len(line_lengths) or end_line >= len(line_lengths):
+            # The change doesn't match the tracked document
+            self.invalidate()
+            return
+
+        self.changes.append({
+            'range': {
+                'start': {'line': line, 'character': character},
+                'end': {'line': end_line, 'character': end_character},
+            },
+            'rangeLength': removed,
+            'text': text,
+        })
+
+        # Update line lengths
+        suffix = line_lengths[end_line] - end_character
+        new_lengths = [len(part) for part in text.split('\n')]
+        new_lengths[0] += character
+        new_lengths[-1] += suffix
+        line_lengths[line:end_line + 1] = new_lengths
+
+    def take_changes(self, line_count, character_count):
+        """
+        Return the changes recorded since the last call and forget them.
+
+        `line_count` and `character_count` describe the current document
+        and are used to check that changes were tracked correctly. Returns
+        None if they weren't, in which case the whole document has to be
+        sent.
+        """
+        if self.line_lengths is None:
+            return None
+        if (len(self.line_lengths) != line_count or
+                sum(self.line_lengths) + line_count - 1 != character_count):
+            self.invalidate()
+            return None
+        changes = self.changes
+        self.changes = []
+        return changes
+
+
+def _get_offset(text, position):
+    """Return the offset in `text` of a LSP (line, character) position."""
+    offset = 0
+    for __ in range(position['line']):
+        offset = text.find('\n', offset) + 1
+        if offset == 0:
+            return len(text)
+    line_end = text.find('\n', offset)
+    if line_end < 0:
+        line_end = len(text)
+    return min(offset + position['character'], line_end)
+
+
+def apply_content_changes(text, changes):
+    """
+    Apply LSP content changes to `text`.
+
+    Changes without a range replace the whole text.
+    """
+    for change in changes:
+        if 'range' not in change:
+            text = change['text']
+            continue
+        start = _get_offset(text, change['range']['start'])
+        end = max(_get_offset(text, change['range']['end']), start)
+        text = text[:start] + change['text'] + text[end:]
+    return text
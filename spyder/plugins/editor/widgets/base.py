@@ -180,8 +180,7 @@ class TextEditBaseWidget(QPlainTextEdit, BaseEditMixin):
         Args:
             key (str) name of the extra selections group.
         """
-        for decoration in self.extra_selections_dict.get(key, []):
-            self.decorations.remove(decoration)
+        self.decorations.remove(list(self.extra_selections_dict.get(key, [])))
         self.extra_selections_dict[key] = []
 
     def changed(self):
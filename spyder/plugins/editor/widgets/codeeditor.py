@@ -32,11 +32,11 @@ import time
 # Third party imports
 from diff_match_patch import diff_match_patch
 from qtpy.compat import to_qvariant
-from qtpy.QtCore import QPoint, QRegExp, Qt, QTimer, QUrl, Signal, Slot, QEvent
+from qtpy.QtCore import QPoint, Qt, QTimer, QUrl, Signal, Slot, QEvent
 from qtpy.QtGui import (QColor, QCursor, QFont, QIntValidator,
                         QKeySequence, QPaintEvent, QPainter, QMouseEvent,
                         QTextCharFormat, QTextCursor, QDesktopServices,
-                        QKeyEvent, QTextDocument, QTextFormat, QTextOption,
+                        QKeyEvent, QTextFormat, QTextOption,
                         QTextFrameFormat)
 from qtpy.QtPrintSupport import QPrinter
 from qtpy.QtWidgets import (QApplication, QDialog, QDialogButtonBox,
@@ -51,7 +51,8 @@ from spyder_kernels.utils.dochelpers import getobj
 from spyder.api.panel import Panel
 from spyder.config.base import _, get_debug_level, running_under_pytest
 from spyder.config.manager import CONF
-from spyder.plugins.editor.api.decoration import TextDecoration
+from spyder.plugins.editor.api.decoration import (DRAW_ORDERS,
+                                                  TextDecoration)
 from spyder.plugins.editor.extensions import (CloseBracketsExtension,
                                               CloseQuotesExtension,
                                               DocstringWriterExtension,
@@ -72,6 +73,9 @@ from spyder.plugins.editor.utils.editor import (TextHelper, BlockUserData)
 from spyder.plugins.editor.utils.debugger import DebuggerManager
 # from spyder.plugins.editor.utils.folding import IndentFoldDetector, FoldScope
 from spyder.plugins.editor.utils.kill_ring import QtKillRing
+from spyder.plugins.editor.utils.occurrences import (
+    find_occurrences, get_occurrence_lines, get_occurrences_in_lines)
+from spyder.plugins.editor.utils.textchanges import TextChangesTracker
 from spyder.plugins.editor.utils.languages import ALL_LANGUAGES, CELL_LANGUAGES
 from spyder.plugins.completion.decorators import (
     request, handles, class_register)
@@ -225,6 +229,16 @@ class CodeEditor(TextEditBaseWidget):
 
     TAB_ALWAYS_INDENTS = ('py', 'pyw', 'python', 'c', 'cpp', 'cl', 'h')
 
+    # Number of lines above which documents are highlighted lazily
+    LAZY_HIGHLIGHTING_LINES = 10000
+
+    # Number of lines around the visible ones where occurrences are marked
+    OCCURRENCES_MARGIN = 100
+
+    # Maximum time spent applying code analysis results before letting
+    # the event loop run (in ms)
+    CODE_ANALYSIS_CHUNK_TIME = 20
+
     # Custom signal to be emitted upon completion of the editor's paintEvent
     painted = Signal(QPaintEvent)
 
@@ -462,8 +476,6 @@ class CodeEditor(TextEditBaseWidget):
 
         # Indicate occurrences of the selected word
         self.cursorPositionChanged.connect(self.__cursor_position_changed)
-        self.__find_first_pos = None
-        self.__find_flags = None
 
         self.language = None
         self.supported_language = False
@@ -487,13 +499,36 @@ class CodeEditor(TextEditBaseWidget):
         self.timer_syntax_highlight.timeout.connect(
             self.run_pygments_highlighter)
 
+        # Highlight the blocks that become visible in long documents, which
+        # are highlighted lazily
+        self.timer_lazy_highlighting = QTimer(self)
+        self.timer_lazy_highlighting.setSingleShot(True)
+        self.timer_lazy_highlighting.setInterval(0)
+        self.timer_lazy_highlighting.timeout.connect(
+            self.highlight_visible_blocks)
+
+        # Code analysis results still to be applied, user data of the
+        # blocks with results and timer to apply the next chunk of results
+        self._code_analysis_queue = None
+        self._code_analysis_data = []
+        self.code_analysis_timer = QTimer(self)
+        self.code_analysis_timer.setSingleShot(True)
+        self.code_analysis_timer.setInterval(0)
+        self.code_analysis_timer.timeout.connect(
+            self._process_code_analysis_chunk)
+
         # Mark occurrences timer
         self.occurrence_highlighting = None
         self.occurrence_timer = QTimer(self)
         self.occurrence_timer.setSingleShot(True)
         self.occurrence_timer.setInterval(1500)
         self.occurrence_timer.timeout.connect(self.__mark_occurrences)
+        # Lines with occurrences, for the scroll flag area, and
+        # (line, start, end) positions of the occurrences
         self.occurrences = []
+        self._occurrences = []
+        # Range of lines whose occurrences are currently marked
+        self._marked_occurrence_lines = None
         self.occurrence_color = QColor(Qt.yellow).lighter(160)
 
         # Mark found results
@@ -598,6 +633,20 @@ class CodeEditor(TextEditBaseWidget):
         self.word_tokens = []
         self.patch = []
         self.text_diff = ([], '')
+        # Number of characters inserted or removed since the previous
+        # didChange notification
+        self.num_changed_chars = 0
+
+        # Large file mode
+        self.large_file = False
+        self.large_file_size = 5
+        self.large_file_lines = 50000
+
+        # Document changes for incremental synchronization
+        self.text_changes = TextChangesTracker()
+        self.document().contentsChange.connect(self._on_contents_change)
+        self.document().contentsChange.connect(
+            self.scrollflagarea.shift_flags)
         self.leading_whitespaces = {}
 
         # re-use parent of completion_widget (usually the main window)
@@ -753,6 +802,18 @@ class CodeEditor(TextEditBaseWidget):
     def get_document_id(self):
         return self.document_id
 
+    def setDocument(self, document):
+        """Reimplement Qt method to track the changes of `document`."""
+        self.document().contentsChange.disconnect(self._on_contents_change)
+        self.document().contentsChange.disconnect(
+            self.scrollflagarea.shift_flags)
+        TextEditBaseWidget.setDocument(self, document)
+        self.document().contentsChange.connect(self._on_contents_change)
+        self.document().contentsChange.connect(
+            self.scrollflagarea.shift_flags)
+        self.text_changes.invalidate()
+        self.scrollflagarea.update_flags()
+
     def set_as_clone(self, editor):
         """Set as clone editor"""
         self.setDocument(editor.document())
@@ -760,6 +821,8 @@ class CodeEditor(TextEditBaseWidget):
         self.highlighter = editor.highlighter
         self.eol_chars = editor.eol_chars
         self._apply_highlighter_color_scheme()
+        self.large_file = editor.large_file
+        self._update_large_file_panels()
 
     # ---- Widget setup and options
     def toggle_wrap_mode(self, enable):
@@ -817,7 +880,9 @@ class CodeEditor(TextEditBaseWidget):
                      indent_guides=False,
                      scroll_past_end=False,
                      debug_panel=True,
-                     folding=True):
+                     folding=True,
+                     large_file_size=5,
+                     large_file_lines=50000):
 
         self.set_close_parentheses_enabled(close_parentheses)
         self.set_close_quotes_enabled(close_quotes)
@@ -834,6 +899,9 @@ class CodeEditor(TextEditBaseWidget):
         # Scrollbar flag area
         self.scrollflagarea.set_enabled(scrollflagarea)
 
+        # Large file mode
+        self.set_large_file_limits(large_file_size, large_file_lines)
+
         # Debugging
         self.debugger.set_filename(filename)
 
@@ -975,6 +1043,7 @@ class CodeEditor(TextEditBaseWidget):
         logger.debug('Stopping completion services for %s' % self.filename)
         self.completions_available = False
         self.document_opened = False
+        self.text_changes.invalidate()
 
     def parse_lsp_config(self, config):
         """Parse and load LSP server editor capabilities."""
@@ -1010,11 +1079,14 @@ class CodeEditor(TextEditBaseWidget):
         """Send textDocument/didOpen request to the server."""
         self.document_opened = True
         cursor = self.textCursor()
+        text = self.toPlainText()
+        if self.sync_mode == TextDocumentSyncKind.INCREMENTAL:
+            self.reset_text_changes(text)
         params = {
             'file': self.filename,
             'language': self.language,
             'version': self.text_version,
-            'text': self.toPlainText(),
+            'text': text,
             'codeeditor': self,
             'offset': cursor.position(),
             'selection_start': cursor.selectionStart(),
@@ -1047,23 +1119,98 @@ class CodeEditor(TextEditBaseWidget):
     @request(
         method=LSPRequestTypes.DOCUMENT_DID_CHANGE, requires_response=False)
     def document_did_change(self, text=None):
-        """Send textDocument/didChange request to the server."""
+        """
+        Send textDocument/didChange request to the server.
+
+        If the server supports incremental synchronization, only the ranges
+        changed since the last request are sent. Otherwise, the whole text
+        and its diff with the previous version are sent.
+        """
         self.text_version += 1
-        text = self.toPlainText()
-        self.patch = self.differ.patch_make(self.previous_text, text)
-        self.previous_text = text
         cursor = self.textCursor()
         params = {
             'file': self.filename,
             'version': self.text_version,
-            'text': text,
-            'diff': self.patch,
             'offset': cursor.position(),
             'selection_start': cursor.selectionStart(),
             'selection_end': cursor.selectionEnd(),
         }
+
+        if (self.sync_mode != TextDocumentSyncKind.INCREMENTAL and
+                self.large_file):
+            # Diffing large files takes too long, so the whole text is sent.
+            # Changes are still tracked to count the changed characters.
+            text = self.toPlainText()
+            document = self.document()
+            changes = self.text_changes.take_changes(
+                document.blockCount(), document.characterCount() - 1)
+            if changes is None:
+                self.reset_text_changes(text)
+                changes = []
+            self.patch = []
+            self.previous_text = text
+            self.num_changed_chars = sum(
+                change['rangeLength'] + len(change['text'])
+                for change in changes)
+            params['changes'] = [{'text': text}]
+        elif self.sync_mode == TextDocumentSyncKind.INCREMENTAL:
+            document = self.document()
+            changes = self.text_changes.take_changes(
+                document.blockCount(), document.characterCount() - 1)
+            if changes is None:
+                # Changes couldn't be tracked, so the whole text is sent
+                text = self.toPlainText()
+                self.reset_text_changes(text)
+                changes = [{'text': text}]
+            self.patch = []
+            self.num_changed_chars = sum(
+                change.get('rangeLength', 0) + len(change['text'])
+                for change in changes)
+            params['changes'] = changes
+        else:
+            text = self.toPlainText()
+            self.patch = self.differ.patch_make(self.previous_text, text)
+            self.previous_text = text
+            self.num_changed_chars = sum(
+                len(data) for patch in self.patch for (op, data) in patch.diffs
+                if op != self.differ.DIFF_EQUAL)
+            params['text'] = text
+            params['diff'] = self.patch
         return params
 
+    def reset_text_changes(self, text):
+        """Start tracking document changes from `text`."""
+        document = self.document()
+        lines = text.split('\n')
+        if (len(lines) == document.blockCount() and
+                len(text) == document.characterCount() - 1):
+            self.text_changes.reset(len(line) for line in lines)
+        else:
+            # Qt and Python don't count lines or characters the same way
+            # for this text (e.g. because of unicode line separators or
+            # characters outside the BMP), so changes can't be tracked.
+            self.text_changes.invalidate()
+
+    @Slot(int, int, int)
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        """Record a document change for incremental synchronization."""
+        if not self.text_changes.is_valid:
+            return
+        document = self.document()
+        end = min(position + chars_added, document.characterCount() - 1)
+        cursor = QTextCursor(document)
+        cursor.setPosition(position)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        text = to_text_string(cursor.selectedText())
+        text = text.replace(u'\u2029', u'\n').replace(u'\u00a0', u' ')
+        if u'\u2028' in text or len(text) != end - position:
+            self.text_changes.invalidate()
+            return
+        block = document.findBlock(position)
+        self.text_changes.add_change(block.blockNumber(),
+                                     position - block.position(),
+                                     chars_removed, text)
+
     @handles(LSPRequestTypes.DOCUMENT_PUBLISH_DIAGNOSTICS)
     def process_diagnostics(self, params):
         """Handle linting response."""
@@ -1369,7 +1516,8 @@ class CodeEditor(TextEditBaseWidget):
     @request(method=LSPRequestTypes.DOCUMENT_FOLDING_RANGE)
     def request_folding(self):
         """Request folding."""
-        if not self.folding_supported or not self.code_folding:
+        if (not self.folding_supported or not self.code_folding or
+                self.large_file):
             return
         params = {'file': self.filename}
         return params
@@ -1386,9 +1534,13 @@ class CodeEditor(TextEditBaseWidget):
             self.text_diff = (self.differ.diff_main(self.previous_text, text),
                               self.previous_text)
             folding_panel.update_folding(ranges)
+            if self.sync_mode == TextDocumentSyncKind.INCREMENTAL:
+                # The previous text is not updated on every change in
+                # this mode, so keep the text of the last folding update
+                self.previous_text = text
 
             # Update indent guides, which depend on folding
-            if self.indent_guides._enabled and len(self.patch) > 0:
+            if self.indent_guides._enabled and self.num_changed_chars > 0:
                 line, column = self.get_cursor_line_column()
                 self.update_whitespace_count(line, column)
         except RuntimeError:
@@ -1467,6 +1619,42 @@ class CodeEditor(TextEditBaseWidget):
         self.code_folding = state
         self.set_folding_panel(state)
 
+    def set_large_file_limits(self, size, lines):
+        """
+        Set the size (in MB) and number of lines above which files are
+        edited in large file mode.
+        """
+        self.large_file_size = size
+        self.large_file_lines = lines
+
+    def set_large_file_mode(self, state):
+        """
+        Enable/disable the large file mode.
+
+        Features that scan the whole document after changes are disabled
+        in this mode: occurrence marking, folding, indent guides and the
+        flags of the scroll flag area. Changes are sent to the completion
+        providers without a diff and a plain text highlighter is used.
+        """
+        if state == self.large_file:
+            return
+        self.large_file = state
+        if self.highlighter is not None:
+            self._set_highlighter(self.highlighter_class)
+        if state:
+            self.occurrence_timer.stop()
+            self.__clear_occurrences()
+        elif self.sync_mode != TextDocumentSyncKind.INCREMENTAL:
+            # Changes are only tracked in large file mode
+            self.text_changes.invalidate()
+        self._update_large_file_panels()
+
+    def _update_large_file_panels(self):
+        """Show or hide the panels disabled in large file mode."""
+        self.indent_guides.setVisible(self.indent_guides._enabled and
+                                      not self.large_file)
+        self.scrollflagarea.update_flags()
+
     def toggle_completions_hint(self, state):
         """Enable/disable completion hint."""
         self.completions_hint = state
@@ -1527,7 +1715,11 @@ class CodeEditor(TextEditBaseWidget):
         if state:
             self.document_did_change()
         else:
-            self.clear_extra_selections('code_analysis_underline')
+            underlines = []
+            for data in self._code_analysis_data:
+                underlines += data.code_analysis_underlines
+                data.code_analysis_underlines = []
+            self.decorations.remove(underlines)
 
     def set_highlight_current_line(self, enable):
         """Enable/disable current line highlighting"""
@@ -1576,17 +1768,22 @@ class CodeEditor(TextEditBaseWidget):
 
     def _set_highlighter(self, sh_class):
         self.highlighter_class = sh_class
+        if self.large_file:
+            # Large files use a plain text highlighter, whatever the language
+            sh_class = sh.TextSH
         if self.highlighter is not None:
             # Removing old highlighter
             # TODO: test if leaving parent/document as is eats memory
+            self.highlighter.stop_lazy_highlighting()
             self.highlighter.setParent(None)
             self.highlighter.setDocument(None)
-        self.highlighter = self.highlighter_class(self.document(),
-                                                  self.font(),
-                                                  self.color_scheme)
+        self.highlighter = sh_class(self.document(), self.font(),
+                                    self.color_scheme)
         self._apply_highlighter_color_scheme()
 
         self.highlighter.editor = self
+        if self.blockCount() > self.LAZY_HIGHLIGHTING_LINES:
+            self.highlighter.start_lazy_highlighting()
 
     def is_json(self):
         return (isinstance(self.highlighter, sh.PygmentsSH) and
@@ -1715,26 +1912,6 @@ class CodeEditor(TextEditBaseWidget):
         self.remove_selected_text()
         self.document_did_change()
 
-    #------Find occurrences
-    def __find_first(self, text):
-        """Find first occurrence: scan whole document"""
-        flags = QTextDocument.FindCaseSensitively|QTextDocument.FindWholeWords
-        cursor = self.textCursor()
-        # Scanning whole document
-        cursor.movePosition(QTextCursor.Start)
-        regexp = QRegExp(r"\b%s\b" % QRegExp.escape(text), Qt.CaseSensitive)
-        cursor = self.document().find(regexp, cursor, flags)
-        self.__find_first_pos = cursor.position()
-        return cursor
-
-    def __find_next(self, text, cursor):
-        """Find next occurrence"""
-        flags = QTextDocument.FindCaseSensitively|QTextDocument.FindWholeWords
-        regexp = QRegExp(r"\b%s\b" % QRegExp.escape(text), Qt.CaseSensitive)
-        cursor = self.document().find(regexp, cursor, flags)
-        if cursor.position() != self.__find_first_pos:
-            return cursor
-
     def __cursor_position_changed(self):
         """Cursor position has changed"""
         line, column = self.get_cursor_line_column()
@@ -1748,7 +1925,7 @@ class CodeEditor(TextEditBaseWidget):
             self.highlight_current_line()
         else:
             self.unhighlight_current_line()
-        if self.occurrence_highlighting:
+        if self.occurrence_highlighting and not self.large_file:
             self.occurrence_timer.stop()
             self.occurrence_timer.start()
 
@@ -1758,6 +1935,8 @@ class CodeEditor(TextEditBaseWidget):
     def __clear_occurrences(self):
         """Clear occurrence markers"""
         self.occurrences = []
+        self._occurrences = []
+        self._marked_occurrence_lines = None
         self.clear_extra_selections('occurrences')
         self.sig_flags_changed.emit()
 
@@ -1809,22 +1988,44 @@ class CodeEditor(TextEditBaseWidget):
            to_text_string(text) == 'self'):
             return
 
-        # Highlighting all occurrences of word *text*
-        cursor = self.__find_first(text)
-        self.occurrences = []
-        while cursor:
-            self.occurrences.append(cursor.blockNumber())
-            self.highlight_selection('occurrences', cursor,
-                                       background_color=self.occurrence_color)
-            cursor = self.__find_next(text, cursor)
-        self.update_extra_selections()
-        if len(self.occurrences) > 1 and self.occurrences[-1] == 0:
-            # XXX: this is never happening with PySide but it's necessary
-            # for PyQt4... this must be related to a different behavior for
-            # the QTextDocument.find function between those two libraries
-            self.occurrences.pop(-1)
+        # Find all occurrences of word *text*, but only mark the ones
+        # around the visible lines
+        self._occurrences = find_occurrences(
+            to_text_string(self.toPlainText()), to_text_string(text))
+        self.occurrences = get_occurrence_lines(self._occurrences)
+        self.mark_visible_occurrences()
         self.sig_flags_changed.emit()
 
+    def mark_visible_occurrences(self):
+        """Mark the occurrences around the visible lines."""
+        if not self._occurrences:
+            return
+        first_line = self.firstVisibleBlock().blockNumber()
+        last_line = first_line + max(len(self.visible_blocks), 1)
+        marked_lines = self._marked_occurrence_lines
+        if (marked_lines is not None and marked_lines[0] <= first_line and
+                last_line <= marked_lines[1]):
+            return
+
+        first_line = max(first_line - self.OCCURRENCES_MARGIN, 0)
+        last_line += self.OCCURRENCES_MARGIN
+        self._marked_occurrence_lines = (first_line, last_line)
+        document = self.document()
+        extra_selections = []
+        block = None
+        for line, start, end in get_occurrences_in_lines(
+                self._occurrences, first_line, last_line):
+            if block is None or block.blockNumber() != line:
+                block = document.findBlockByNumber(line)
+            selection = TextDecoration(self.textCursor())
+            selection.format.setBackground(self.occurrence_color)
+            selection.cursor.setPosition(block.position() + start)
+            selection.cursor.setPosition(block.position() + end,
+                                         QTextCursor.KeepAnchor)
+            extra_selections.append(selection)
+        self.set_extra_selections('occurrences', extra_selections)
+        self.update_extra_selections()
+
     #-----highlight found results (find/replace widget)
     def highlight_found_results(self, pattern, word=False, regexp=False,
                                 case=False):
@@ -1865,6 +2066,9 @@ class CodeEditor(TextEditBaseWidget):
         self.last_change_position = self.textCursor().position()
         if self.found_results:
             self.clear_found_results()
+        if self._occurrences:
+            # Their positions are no longer valid
+            self.__clear_occurrences()
 
     def get_linenumberarea_width(self):
         """
@@ -2079,6 +2283,16 @@ class CodeEditor(TextEditBaseWidget):
 
     def set_text(self, text):
         """Set the text of the editor"""
+        line_count = text.count('\n') + 1
+        self.set_large_file_mode(
+            len(text) > self.large_file_size * 1024 ** 2 or
+            line_count > self.large_file_lines)
+        if self.highlighter is not None:
+            # Long documents are highlighted starting with the visible lines
+            if line_count > self.LAZY_HIGHLIGHTING_LINES:
+                self.highlighter.start_lazy_highlighting()
+            else:
+                self.highlighter.stop_lazy_highlighting()
         self.setPlainText(text)
         self.set_eol_chars(text)
         self.document_did_change(text)
@@ -2213,11 +2427,17 @@ class CodeEditor(TextEditBaseWidget):
 
     def cleanup_code_analysis(self):
         """Remove all code analysis markers"""
+        self._code_analysis_queue = None
+        self.code_analysis_timer.stop()
         self.setUpdatesEnabled(False)
         self.clear_extra_selections('code_analysis_highlight')
-        self.clear_extra_selections('code_analysis_underline')
+        underlines = []
         for data in self.blockuserdata_list():
-            data.code_analysis = []
+            self._clear_block_code_analysis(data, underlines)
+        for data in self._code_analysis_data:
+            self._clear_block_code_analysis(data, underlines)
+        self._code_analysis_data = []
+        self.decorations.remove(underlines)
 
         self.setUpdatesEnabled(True)
         # When the new code analysis results are empty, it is necessary
@@ -2227,58 +2447,145 @@ class CodeEditor(TextEditBaseWidget):
         self.linenumberarea.update()
 
     def process_code_analysis(self, results):
-        """Process all linting results."""
-        self.cleanup_code_analysis()
-        self.setUpdatesEnabled(False)
-        cursor = self.textCursor()
-        document = self.document()
+        """
+        Process all linting results.
 
+        Only the lines whose results changed are updated. Results are
+        applied in chunks that take at most CODE_ANALYSIS_CHUNK_TIME, so
+        large numbers of them don't block the interface.
+        """
+        lines = {}
         for diagnostic in results:
-            source = diagnostic.get('source', '')
-            msg_range = diagnostic['range']
-            start = msg_range['start']
-            end = msg_range['end']
-            code = diagnostic.get('code', 'E')
-            message = diagnostic['message']
-            severity = diagnostic.get(
-                'severity', DiagnosticSeverity.ERROR)
-
-            block = document.findBlockByNumber(start['line'])
-            error = severity == DiagnosticSeverity.ERROR
-            color = self.error_color if error else self.warning_color
-            cursor.setPosition(block.position())
-            cursor.movePosition(QTextCursor.StartOfBlock)
-            cursor.movePosition(
-                QTextCursor.NextCharacter, n=start['character'])
-            block2 = document.findBlockByNumber(end['line'])
-            cursor.setPosition(block2.position(), QTextCursor.KeepAnchor)
-            cursor.movePosition(
-                QTextCursor.StartOfBlock, mode=QTextCursor.KeepAnchor)
-            cursor.movePosition(
-                QTextCursor.NextCharacter, n=end['character'],
-                mode=QTextCursor.KeepAnchor)
-            color = QColor(color)
-            color.setAlpha(255)
+            line = diagnostic['range']['start']['line']
+            lines.setdefault(line, []).append(diagnostic)
+
+        # Blocks with results that aren't in the new ones are cleared at
+        # the end, including the ones of unfinished previous results
+        previous_data = list(self._code_analysis_data)
+        if self._code_analysis_queue is not None:
+            previous_data += self._code_analysis_queue[2]
+        self._code_analysis_queue = (iter(sorted(lines.items())),
+                                     previous_data, [])
+        self.code_analysis_timer.stop()
+        self._process_code_analysis_chunk()
 
-            data = block.userData()
-            if not data:
-                data = BlockUserData(
-                    self, cursor=QTextCursor(cursor), color=color)
-            data.code_analysis.append((source, code, severity, message))
+    @Slot()
+    def _process_code_analysis_chunk(self):
+        """Apply the next chunk of code analysis results."""
+        if self._code_analysis_queue is None:
+            return
+        lines, previous_data, new_data = self._code_analysis_queue
+        start_time = time.time()
+        added = []
+        removed = []
+        finished = True
+        self.setUpdatesEnabled(False)
+        for line, diagnostics in lines:
+            data = self._set_block_code_analysis(line, diagnostics, added,
+                                                 removed)
+            if data is not None:
+                new_data.append(data)
+            if (time.time() - start_time) * 1000 > \
+                    self.CODE_ANALYSIS_CHUNK_TIME:
+                finished = False
+                break
+
+        if finished:
+            self._code_analysis_queue = None
+            new_data_set = set(new_data)
+            for data in previous_data:
+                if data not in new_data_set:
+                    self._clear_block_code_analysis(data, removed)
+            self._code_analysis_data = list(new_data_set)
+
+        self.decorations.remove(removed)
+        self.decorations.add(added)
+        self.setUpdatesEnabled(True)
+        if finished:
+            self.sig_process_code_analysis.emit()
+            self.sig_flags_changed.emit()
+            self.linenumberarea.update()
+        else:
+            self.code_analysis_timer.start()
+
+    def _get_lsp_position(self, position):
+        """Return the document position of an LSP (line, character)."""
+        block = self.document().findBlockByNumber(position['line'])
+        if not block.isValid():
+            return self.document().characterCount() - 1
+        return block.position() + min(position['character'],
+                                      block.length() - 1)
+
+    def _set_block_code_analysis(self, line, diagnostics, added, removed):
+        """
+        Set the code analysis results of `line`, unless they didn't change.
+
+        Underlines to add and remove from the editor are appended to
+        `added` and `removed`. Returns the user data of the block.
+        """
+        block = self.document().findBlockByNumber(line)
+        if not block.isValid():
+            return None
+        data = block.userData()
+        if not data:
+            data = BlockUserData(self)
             block.setUserData(data)
-            block.selection = QTextCursor(cursor)
-            block.color = color
+
+        code_analysis = []
+        spans = []
+        for diagnostic in diagnostics:
+            severity = diagnostic.get('severity', DiagnosticSeverity.ERROR)
+            code_analysis.append((diagnostic.get('source', ''),
+                                  diagnostic.get('code', 'E'),
+                                  severity,
+                                  diagnostic['message']))
+            msg_range = diagnostic['range']
+            spans.append((self._get_lsp_position(msg_range['start']),
+                          self._get_lsp_position(msg_range['end'])))
+
+        def get_span(cursor):
+            return cursor.selectionStart(), cursor.selectionEnd()
+
+        underlines = data.code_analysis_underlines
+        underline_spans = spans if self.underline_errors_enabled else []
+        if (data.code_analysis == code_analysis and
+                data.selection is not None and
+                get_span(data.selection) == spans[0] and
+                [get_span(u.cursor) for u in underlines] == underline_spans):
+            return data
+
+        removed += underlines
+        data.code_analysis = code_analysis
+        data.code_analysis_underlines = []
+        for i, (start, end) in enumerate(spans):
+            cursor = QTextCursor(self.document())
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
+            error = code_analysis[i][2] == DiagnosticSeverity.ERROR
+            color = QColor(self.error_color if error else self.warning_color)
+            color.setAlpha(255)
+            if i == 0:
+                data.selection = cursor
+                data.color = color
 
             # Underline errors and warnings in this editor.
             if self.underline_errors_enabled:
-                self.highlight_selection('code_analysis_underline',
-                                         block.selection,
-                                         underline_color=block.color)
-
-        self.sig_process_code_analysis.emit()
-        self.update_extra_selections()
-        self.setUpdatesEnabled(True)
-        self.linenumberarea.update()
+                underline = TextDecoration(cursor)
+                underline.draw_order = DRAW_ORDERS.get('on_top')
+                underline.format.setProperty(
+                    QTextFormat.TextUnderlineStyle,
+                    to_qvariant(QTextCharFormat.SingleUnderline))
+                underline.format.setProperty(QTextFormat.TextUnderlineColor,
+                                             to_qvariant(color))
+                data.code_analysis_underlines.append(underline)
+        added += data.code_analysis_underlines
+        return data
+
+    def _clear_block_code_analysis(self, data, removed):
+        """Clear the code analysis results of a block user data."""
+        data.code_analysis = []
+        removed += data.code_analysis_underlines
+        data.code_analysis_underlines = []
 
     def hide_tooltip(self):
         """
@@ -4324,6 +4631,19 @@ class CodeEditor(TextEditBaseWidget):
             bottom = top + int(self.blockBoundingRect(block).height())
             blockNumber = block.blockNumber()
 
+        if (self.highlighter is not None and
+                self.highlighter.is_lazy_highlighting()):
+            self.timer_lazy_highlighting.start()
+        if self._occurrences:
+            self.mark_visible_occurrences()
+
+    @Slot()
+    def highlight_visible_blocks(self):
+        """Highlight the visible blocks of a lazily highlighted document."""
+        if self.highlighter is not None:
+            self.highlighter.highlight_visible_blocks(
+                [block for __, __, block in self.visible_blocks])
+
     def _draw_editor_cell_divider(self):
         """Draw a line on top of a define cell"""
         if self.supported_cell_language:
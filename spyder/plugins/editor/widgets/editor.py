@@ -565,6 +565,8 @@ class EditorStack(QWidget):
         self.highlight_current_cell_enabled = False
         self.occurrence_highlighting_enabled = True
         self.occurrence_highlighting_timeout = 1500
+        self.large_file_size = 5
+        self.large_file_lines = 50000
         self.checkeolchars_enabled = True
         self.always_remove_trailing_spaces = False
         self.convert_eol_on_save = False
@@ -1325,6 +1327,22 @@ class EditorStack(QWidget):
             for finfo in self.data:
                 finfo.editor.set_occurrence_timeout(timeout)
 
+    def set_large_file_size(self, size):
+        # CONF.get(self.CONF_SECTION, 'large_file/size')
+        self.large_file_size = size
+        if self.data:
+            for finfo in self.data:
+                finfo.editor.set_large_file_limits(size,
+                                                   self.large_file_lines)
+
+    def set_large_file_lines(self, lines):
+        # CONF.get(self.CONF_SECTION, 'large_file/lines')
+        self.large_file_lines = lines
+        if self.data:
+            for finfo in self.data:
+                finfo.editor.set_large_file_limits(self.large_file_size,
+                                                   lines)
+
     def set_underline_errors_enabled(self, state):
         self.underline_errors_enabled = state
         if self.data:
@@ -2544,6 +2562,8 @@ class EditorStack(QWidget):
             highlight_current_cell=self.highlight_current_cell_enabled,
             occurrence_highlighting=self.occurrence_highlighting_enabled,
             occurrence_timeout=self.occurrence_highlighting_timeout,
+            large_file_size=self.large_file_size,
+            large_file_lines=self.large_file_lines,
             close_parentheses=self.close_parentheses_enabled,
             close_quotes=self.close_quotes_enabled,
             add_colons=self.add_colons_enabled,
@@ -216,5 +216,115 @@ def test_in_string(editorbot, input_text, expected_state):
         assert widget.in_string(cursor) == expected_state[1]
 
 
+def test_large_file_mode(editorbot):
+    """Test that large files are edited with a plain text highlighter."""
+    qtbot, widget = editorbot
+    widget.set_large_file_limits(5, 100)
+    widget.set_text('x = 1\n' * 200)
+    assert widget.large_file
+    assert isinstance(widget.highlighter, codeeditor.sh.TextSH)
+    assert widget.is_python()
+
+    widget.set_text('x = 1\n')
+    assert not widget.large_file
+    assert isinstance(widget.highlighter, codeeditor.sh.PythonSH)
+
+
+def test_large_file_changed_chars(editorbot):
+    """Test counting the characters changed in large file mode."""
+    qtbot, widget = editorbot
+    widget.set_large_file_limits(5, 100)
+    widget.set_text('x = 1\n' * 200)
+    widget.document_did_change()
+    assert widget.num_changed_chars == 0
+
+    cursor = widget.textCursor()
+    cursor.setPosition(6)
+    cursor.setPosition(7, QTextCursor.KeepAnchor)
+    cursor.insertText('spam')
+    widget.document_did_change()
+    assert widget.num_changed_chars == 5
+
+    widget.set_text('x = 1\n')
+    assert not widget.text_changes.is_valid
+
+
+def make_diagnostic(line, start, end, message, severity=2):
+    return {'source': 'pycodestyle', 'code': 'E999', 'message': message,
+            'severity': severity,
+            'range': {'start': {'line': line, 'character': start},
+                      'end': {'line': line, 'character': end}}}
+
+
+def test_process_code_analysis(editorbot):
+    """Test that only the lines whose code analysis changed are updated."""
+    qtbot, widget = editorbot
+    widget.set_underline_errors_enabled(True)
+    widget.set_text('x = 1\ny = 2\nz = 3\n')
+    results = [make_diagnostic(0, 0, 1, 'Spam'),
+               make_diagnostic(2, 4, 5, 'Eggs', severity=1)]
+    widget.process_code_analysis(results)
+    document = widget.document()
+    first_data = document.findBlockByNumber(0).userData()
+    last_data = document.findBlockByNumber(2).userData()
+    assert first_data.code_analysis == [('pycodestyle', 'E999', 2, 'Spam')]
+    underline = first_data.code_analysis_underlines[0]
+    assert underline.cursor.selectedText() == 'x'
+    assert last_data.code_analysis_underlines[0].cursor.selectedText() == '3'
+    assert underline in list(widget.decorations)
+
+    # Unchanged lines keep their underlines
+    results[1] = make_diagnostic(1, 0, 5, 'Ham')
+    widget.process_code_analysis(results)
+    assert first_data.code_analysis_underlines == [underline]
+    assert last_data.code_analysis == []
+    assert last_data.code_analysis_underlines == []
+    second_data = document.findBlockByNumber(1).userData()
+    assert second_data.selection.selectedText() == 'y = 2'
+
+    widget.process_code_analysis([])
+    assert first_data.code_analysis == []
+    assert underline not in list(widget.decorations)
+
+
+def test_process_code_analysis_chunks(editorbot, monkeypatch):
+    """Test that code analysis results are applied in several chunks."""
+    qtbot, widget = editorbot
+    monkeypatch.setattr(widget, 'CODE_ANALYSIS_CHUNK_TIME', 0)
+    widget.set_underline_errors_enabled(True)
+    widget.set_text('x = 1\n' * 10)
+    document = widget.document()
+
+    def get_code_analysis(line):
+        data = document.findBlockByNumber(line).userData()
+        return data.code_analysis if data else []
+
+    # Only the first line is applied right away, the others are applied
+    # when code_analysis_timer times out
+    results = [make_diagnostic(line, 0, 1, 'Spam') for line in range(10)]
+    widget.process_code_analysis(results)
+    assert get_code_analysis(0) == [('pycodestyle', 'E999', 2, 'Spam')]
+    assert get_code_analysis(9) == []
+    qtbot.waitUntil(lambda: widget._code_analysis_queue is None)
+    assert all(get_code_analysis(line) for line in range(10))
+    assert len(widget._code_analysis_data) == 10
+
+    # New results replace unfinished ones, and blocks that aren't in
+    # them are cleared, including the ones applied by the old results
+    results = [make_diagnostic(line, 0, 1, 'Ham') for line in range(10)]
+    widget.process_code_analysis(results)
+    assert get_code_analysis(1) == [('pycodestyle', 'E999', 2, 'Spam')]
+    data = document.findBlockByNumber(0).userData()
+    underline = data.code_analysis_underlines[0]
+    assert underline in list(widget.decorations)
+    widget.process_code_analysis([make_diagnostic(5, 0, 1, 'Eggs')])
+    qtbot.waitUntil(lambda: widget._code_analysis_queue is None)
+    assert get_code_analysis(0) == []
+    assert get_code_analysis(5) == [('pycodestyle', 'E999', 2, 'Eggs')]
+    assert all(get_code_analysis(line) == [] for line in range(10)
+               if line != 5)
+    assert underline not in list(widget.decorations)
+
+
 if __name__ == '__main__':
     pytest.main(['test_codeeditor.py'])
@@ -11,6 +11,7 @@ from qtpy.QtGui import QTextCursor, QTextFormat
 
 # Local imports
 from spyder.utils.qthelpers import qapplication
+from spyder.plugins.editor.api.decoration import TextDecoration
 from spyder.plugins.editor.widgets.codeeditor import CodeEditor
 
 
@@ -57,5 +58,47 @@ def test_extra_selections(qtbot):
     assert set(selected_texts[2:5]) == set(['some_variable'])
 
 
+def test_visible_extra_selections(qtbot):
+    """Test that only the decorations around the visible lines are set."""
+    editor = construct_editor()
+    editor.resize(400, 300)
+    editor.show()
+    editor.set_text('spam\n' * 2000)
+    decorations = editor.decorations
+    margin = decorations.VISIBLE_MARGIN
+
+    selections = []
+    for line in range(2000):
+        selections.append(TextDecoration(editor.textCursor(),
+                                         start_pos=5 * line,
+                                         end_pos=5 * line + 4))
+    editor.set_extra_selections('test', selections)
+    editor.update_extra_selections()
+    assert len(decorations) >= 2000
+
+    def get_lines():
+        return set(sel.cursor.blockNumber() for sel in editor.extraSelections()
+                   if sel.cursor.selectedText() == 'spam')
+
+    lines = get_lines()
+    assert 0 in lines
+    assert max(lines) < 2 * margin
+
+    # Scrolling sets the decorations of the new visible lines
+    editor.go_to_line(1501)
+    qtbot.waitUntil(lambda: 1500 in get_lines())
+    assert min(get_lines()) > 1500 - 2 * margin
+
+    # Decorations follow the changes of the document
+    cursor = editor.textCursor()
+    cursor.movePosition(QTextCursor.Start)
+    cursor.insertText('eggs\n' * 10)
+    editor.update_extra_selections()
+    assert 1510 in get_lines()
+
+    editor.clear_extra_selections('test')
+    assert not get_lines()
+
+
 if __name__ == "__main__":
     pytest.main()
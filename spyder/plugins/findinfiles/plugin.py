@@ -21,10 +21,13 @@ from qtpy.QtWidgets import QApplication, QInputDialog, QVBoxLayout
 
 # Local imports
 from spyder.api.plugins import SpyderPluginWidget
-from spyder.config.base import _
+from spyder.config.base import _, get_conf_path
+from spyder.utils.encoding import TEXT_FILE_CACHE
 from spyder.utils.misc import getcwd_or_home
 from spyder.utils import icon_manager as ima
 from spyder.utils.qthelpers import create_action, MENU_SEPARATOR
+from spyder.plugins.findinfiles.utils.index import (TrigramIndex,
+                                                    get_index_path)
 from spyder.plugins.findinfiles.widgets import FindInFilesWidget
 
 
@@ -33,6 +36,7 @@ class FindInFiles(SpyderPluginWidget):
 
     CONF_SECTION = 'find_in_files'
     CONF_FILE = False
+    TEXT_FILE_CACHE_PATH = get_conf_path('text_files.pickle')
     toggle_visibility = Signal(bool)
 
     def __init__(self, parent=None):
@@ -54,6 +58,8 @@ class FindInFiles(SpyderPluginWidget):
         path_history = self.get_option('path_history', [])
         search_in_index = self.get_option('search_in_index', default=0)
         max_results = self.get_option('max_results')
+        processes = self.get_option('processes', default=0)
+        use_ignore_files = self.get_option('use_ignore_files', default=True)
 
         self.findinfiles = FindInFilesWidget(
             self,
@@ -69,7 +75,9 @@ class FindInFiles(SpyderPluginWidget):
             search_in_index,
             options_button=self.options_button,
             text_color=ima.MAIN_FG_COLOR,
-            max_results=max_results)
+            max_results=max_results,
+            processes=processes,
+            use_ignore_files=use_ignore_files)
 
         layout = QVBoxLayout()
         layout.addWidget(self.findinfiles)
@@ -77,6 +85,11 @@ class FindInFiles(SpyderPluginWidget):
 
         self.toggle_visibility.connect(self.toggle)
 
+        # Restore the classification of files as text or binary from the
+        # previous session
+        if self.get_option('cache_file_types', default=True):
+            TEXT_FILE_CACHE.load(self.TEXT_FILE_CACHE_PATH)
+
     def toggle(self, state):
         """Toggle widget visibility"""
         if self.dockwidget:
@@ -90,6 +103,10 @@ class FindInFiles(SpyderPluginWidget):
     def set_project_path(self, path):
         """Refresh current project path"""
         self.findinfiles.find_options.set_project_path(path)
+        index = None
+        if self.get_option('index_files', default=True):
+            index = TrigramIndex(path, get_index_path(path))
+        self.findinfiles.set_project_index(index)
 
     def set_current_opened_file(self, path):
         """Get path of current opened file in editor"""
@@ -98,6 +115,7 @@ class FindInFiles(SpyderPluginWidget):
     def unset_project_path(self):
         """Refresh current project path"""
         self.findinfiles.find_options.disable_project_search()
+        self.findinfiles.set_project_index(None)
 
     def findinfiles_callback(self):
         """Find in files callback"""
@@ -118,9 +136,9 @@ class FindInFiles(SpyderPluginWidget):
         value, valid = QInputDialog.getInt(
             self,
             self.get_plugin_title(),
-            _('Set maximum number of results: '),
+            _('Set maximum number of results (0 for no limit): '),
             value=self.get_option('max_results'),
-            min=1,
+            min=0,
             step=1,
         )
         if valid:
@@ -173,6 +191,8 @@ class FindInFiles(SpyderPluginWidget):
         self.main.workingdirectory.refresh_findinfiles.connect(self.refreshdir)
         self.main.projects.sig_project_loaded.connect(self.set_project_path)
         self.main.projects.sig_project_closed.connect(self.unset_project_path)
+        self.main.projects.sig_file_changes.connect(
+            self.findinfiles.update_project_index)
         self.main.editor.open_file_update.connect(self.set_current_opened_file)
 
         findinfiles_action = create_action(
@@ -211,6 +231,8 @@ class FindInFiles(SpyderPluginWidget):
             self.set_option('case_sensitive', case_sensitive)
             self.set_option('path_history', path_history)
             self.set_option('search_in_index', search_in_index)
+        if self.get_option('cache_file_types', default=True):
+            TEXT_FILE_CACHE.save(self.TEXT_FILE_CACHE_PATH)
         return True
 
     def on_first_registration(self):
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for the Find in Files trigram index.
+"""
+
+# Standard library imports
+import os
+import os.path as osp
+import re
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.findinfiles.utils.index import (TrigramIndex,
+                                                    get_literals)
+from spyder.plugins.findinfiles.widgets import IndexThread
+from spyder.py3compat import to_text_string
+
+
+@pytest.fixture
+def project(tmpdir):
+    """Create a directory with some files to index."""
+    tmpdir.join('spam.py').write('spam = "eggs"\n')
+    tmpdir.join('ham.txt').write('Ham and Eggs\n')
+    tmpdir.mkdir('sub').join('bacon.txt').write('bacon\n')
+    return tmpdir
+
+
+def get_candidates(index, root, texts, text_re=False, case_sensitive=False):
+    may_contain = index.get_matcher(texts, text_re, case_sensitive)
+    candidates = set()
+    for path, dirs, files in os.walk(root):
+        for f in files:
+            filename = osp.join(path, f)
+            if may_contain(filename):
+                candidates.add(osp.relpath(filename, root))
+    return candidates
+
+
+def test_get_literals():
+    """Test getting the strings that matches of a regexp must contain."""
+    assert get_literals(b'spam', False) == [b'spam']
+    assert get_literals(re.compile(b'spam\\s+eggs'), True) == [b'spam',
+                                                                b'eggs']
+    assert get_literals(re.compile(b'spam|eggs'), True) == []
+
+
+def test_build_and_search(project):
+    """Test that the index narrows the files that can contain a text."""
+    root = to_text_string(project)
+    index = TrigramIndex(root)
+    assert index.build()
+    assert len(index) == 3
+
+    assert get_candidates(index, root, [(b'eggs', 'utf-8')]) == {'spam.py',
+                                                                'ham.txt'}
+    assert get_candidates(index, root, [(b'bacon', 'utf-8')]) == {
+        osp.join('sub', 'bacon.txt')}
+    assert get_candidates(index, root, [(re.compile(b'bac.n'), 'utf-8')],
+                          text_re=True) == {osp.join('sub', 'bacon.txt')}
+
+    # Texts too short to have trigrams can't use the index
+    assert index.get_matcher([(b'sp', 'utf-8')], False, False) is None
+
+
+def test_changed_files_are_candidates(project):
+    """Test that files changed since they were indexed are searched."""
+    root = to_text_string(project)
+    index = TrigramIndex(root)
+    index.build()
+
+    project.join('spam.py').write('bacon = "spam"\n')
+    candidates = get_candidates(index, root, [(b'bacon', 'utf-8')])
+    assert 'spam.py' in candidates
+
+    index.update_file(to_text_string(project.join('spam.py')))
+    project.join('new.txt').write('more bacon\n')
+    candidates = get_candidates(index, root, [(b'bacon', 'utf-8')])
+    assert candidates == {'spam.py', 'new.txt', osp.join('sub', 'bacon.txt')}
+
+
+def test_move_and_remove(project):
+    """
+    Test updating the index when files are moved or removed, with the paths
+    of the files reported by the project watcher.
+    """
+    root = to_text_string(project)
+    index = TrigramIndex(root)
+    index.build()
+
+    src = to_text_string(project.join('sub'))
+    dest = to_text_string(project.join('other'))
+    os.rename(src, dest)
+    index.update_file(osp.join(src, 'bacon.txt'))
+    index.update_file(osp.join(dest, 'bacon.txt'))
+    assert osp.join(dest, 'bacon.txt') in index
+    assert osp.join(src, 'bacon.txt') not in index
+
+    os.remove(osp.join(dest, 'bacon.txt'))
+    index.update_file(osp.join(dest, 'bacon.txt'))
+    index.remove_file(to_text_string(project.join('spam.py')))
+    assert len(index) == 1
+
+
+def test_ignored_files(project):
+    """Test that files ignored by .gitignore files are not indexed."""
+    project.join('.gitignore').write('sub/\n')
+    root = to_text_string(project)
+    index = TrigramIndex(root)
+    index.build()
+    assert osp.join(root, 'sub', 'bacon.txt') not in index
+
+    project.join('sub', 'eggs.txt').write('eggs\n')
+    index.update_file(to_text_string(project.join('sub', 'eggs.txt')))
+    assert osp.join(root, 'sub', 'eggs.txt') not in index
+
+
+def test_save_and_load(project, tmpdir_factory):
+    """Test that the index is persisted between sessions."""
+    root = to_text_string(project)
+    index_path = to_text_string(
+        tmpdir_factory.mktemp('index').join('index.pickle'))
+    index = TrigramIndex(root, index_path)
+    index.build()
+    index.save()
+
+    new_index = TrigramIndex(root, index_path)
+    assert new_index.load()
+    assert len(new_index) == 3
+    assert get_candidates(new_index, root, [(b'eggs', 'utf-8')]) == {
+        'spam.py', 'ham.txt'}
+
+    # Indexes of other directories are not loaded
+    assert not TrigramIndex(osp.join(root, 'sub'), index_path).load()
+
+
+def test_index_thread(project, qtbot):
+    """Test that changed files are indexed in the thread."""
+    root = to_text_string(project)
+    index = TrigramIndex(root)
+    thread = IndexThread(None, index)
+    thread.start()
+    qtbot.waitUntil(lambda: len(index) == 3)
+
+    project.join('eggs.txt').write('eggs\n')
+    project.join('ham.txt').remove()
+    thread.add_paths([to_text_string(project.join('eggs.txt')),
+                      to_text_string(project.join('ham.txt'))])
+    qtbot.waitUntil(lambda: osp.join(root, 'eggs.txt') in index)
+    qtbot.waitUntil(lambda: osp.join(root, 'ham.txt') not in index)
+
+    thread.stop()
+    assert thread.wait(5000)
+
+
+if __name__ == "__main__":
+    pytest.main()
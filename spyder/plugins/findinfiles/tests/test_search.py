@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for the Find in Files search engine.
+"""
+
+# Standard library imports
+import os
+import os.path as osp
+import re
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.findinfiles.utils import search
+from spyder.plugins.findinfiles.utils.search import (
+    chunked, create_pool, iter_file_matches, search_files)
+from spyder.py3compat import to_text_string
+
+LOCATION = osp.realpath(osp.join(os.getcwd(), osp.dirname(__file__)))
+DATA = osp.join(LOCATION, 'data')
+
+
+def get_data_files():
+    fnames = [osp.join(DATA, fname) for fname in sorted(os.listdir(DATA))]
+    return [fname for fname in fnames if osp.isfile(fname)]
+
+
+def process_matches(matches):
+    """Transform matches to a {filename: [(line, col), ...]} dict."""
+    results = {}
+    for filename, lineno, colno, match_end, line in matches:
+        results.setdefault(osp.basename(filename), []).append((lineno, colno))
+    return {fname: sorted(lines) for fname, lines in results.items()}
+
+
+def expected_results():
+    return {'spam.txt': [(1, 0), (1, 5), (3, 22)],
+            'spam.py': [(2, 7), (5, 1), (7, 12)],
+            'spam.cpp': [(2, 9), (6, 15), (8, 2), (11, 4), (11, 10),
+                         (13, 12)]}
+
+
+@pytest.mark.parametrize('whole_buffer', [False, True])
+@pytest.mark.parametrize('text_re', [False, True])
+def test_iter_file_matches(text_re, whole_buffer):
+    """Test searching a string file by file."""
+    text = b'spam'
+    if text_re:
+        text = re.compile(text)
+    matches = []
+    for fname in get_data_files():
+        matches += list(iter_file_matches(fname, [(text, 'utf-8')], text_re,
+                                          True, whole_buffer=whole_buffer))
+    assert process_matches(matches) == expected_results()
+
+
+@pytest.mark.parametrize('text_re', [False, True])
+@pytest.mark.parametrize('case_sensitive', [False, True])
+def test_whole_buffer_same_as_lines(tmpdir, monkeypatch, text_re,
+                                    case_sensitive):
+    """
+    Test that scanning whole buffers, memory mapped or not, gives the same
+    matches than scanning line by line.
+    """
+    fname = to_text_string(tmpdir.join('spam.txt'))
+    with open(fname, 'wb') as f:
+        f.write(b'Spam spam\r\nham\n\n  SPAM  \neggs spamspam\nspam')
+
+    for pattern in [b'spam', b'pams', b'spam\\s+', b'^spam', b'm$']:
+        if not text_re and b'\\' in pattern:
+            continue
+        text = re.compile(pattern) if text_re else pattern
+        texts = [(text, 'utf-8')]
+        expected = list(iter_file_matches(fname, texts, text_re,
+                                          case_sensitive, whole_buffer=False))
+        assert list(iter_file_matches(fname, texts, text_re,
+                                      case_sensitive)) == expected
+
+        monkeypatch.setattr(search, 'MMAP_THRESHOLD', 0)
+        monkeypatch.setattr(search, 'BLOCK_SIZE', 3)
+        assert list(iter_file_matches(fname, texts, text_re,
+                                      case_sensitive)) == expected
+        monkeypatch.undo()
+
+
+@pytest.mark.parametrize('pattern', [b'a*', b'^', b'$', b'\\s*', b'a?\\n?'])
+def test_whole_buffer_zero_width_matches(tmpdir, pattern):
+    """
+    Test that zero-width matches aren't duplicated when scanning whole
+    buffers, and that they are the same as when scanning line by line,
+    except the ones after the end of line characters.
+    """
+    fname = to_text_string(tmpdir.join('spam.txt'))
+    with open(fname, 'wb') as f:
+        f.write(b'aa\nb\n\n  aaa \r\nba\n')
+
+    texts = [(re.compile(pattern), 'utf-8')]
+    expected = [match for match in iter_file_matches(fname, texts, True, True,
+                                                     whole_buffer=False)
+                if match[2] < len(match[4])]
+    matches = list(iter_file_matches(fname, texts, True, True))
+    assert len(set(matches)) == len(matches)
+    assert matches == expected
+
+
+@pytest.mark.parametrize('whole_buffer', [False, True])
+def test_iter_file_matches_stopped(whole_buffer):
+    """Test that a stopped search doesn't return any match."""
+    fname = osp.join(DATA, 'spam.txt')
+    matches = list(iter_file_matches(fname, [(b'spam', 'utf-8')], False,
+                                     True, stopped=lambda: True,
+                                     whole_buffer=whole_buffer))
+    assert matches == []
+
+
+def test_chunked():
+    """Test grouping files in chunks."""
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunked([], 2)) == []
+
+
+def test_search_files_in_pool():
+    """Test searching files with a pool of worker processes."""
+    pool = create_pool(2, [(b'spam', 'utf-8')], False, True)
+    try:
+        matches = []
+        files = [(fname, None) for fname in get_data_files()]
+        for chunk in pool.imap_unordered(search_files, chunked(files, 1)):
+            for filename, file_matches, error, text_entry in chunk:
+                assert not error
+                assert text_entry[2]
+                matches += file_matches
+    finally:
+        pool.terminate()
+        pool.join()
+    assert process_matches(matches) == expected_results()
+
+
+if __name__ == "__main__":
+    pytest.main()
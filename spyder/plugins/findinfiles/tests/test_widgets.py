@@ -22,7 +22,7 @@ from spyder.plugins.findinfiles import widgets
 from spyder.plugins.findinfiles.widgets import (FindInFilesWidget, SearchInComboBox,
                                                 EXTERNAL_PATHS, SELECT_OTHER, CWD,
                                                 CLEAR_LIST, PROJECT, FILE_PATH,
-                                                QMessageBox, SearchThread)
+                                                QMessageBox)
 from spyder.py3compat import PY2
 
 LOCATION = osp.realpath(osp.join(os.getcwd(), osp.dirname(__file__)))
@@ -37,7 +37,7 @@ def process_search_results(results):
     test framework comparison representation.
     """
     matches = {}
-    for result in results.values():
+    for result in results:
         file, line, col = result
         filename = osp.basename(file)
         if filename not in matches:
@@ -122,7 +122,22 @@ def test_find_in_files_search(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_matches())
+    assert expected_results() == matches
+
+
+@pytest.mark.parametrize('findinfiles', [{'processes': 1}], indirect=True)
+def test_find_in_files_search_serial(findinfiles, qtbot):
+    """
+    Test that searching without worker processes gives the same results
+    than the parallel search.
+    """
+    findinfiles.set_search_text("spam")
+    findinfiles.find_options.set_directory(osp.join(LOCATION, "data"))
+    findinfiles.find()
+    blocker = qtbot.waitSignal(findinfiles.sig_finished)
+    blocker.wait()
+    matches = process_search_results(findinfiles.result_browser.get_matches())
     assert expected_results() == matches
 
 
@@ -135,7 +150,7 @@ def test_exclude_extension_regex(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_matches())
     files_filtered = True
     for file in matches:
         filename, ext = osp.splitext(file)
@@ -154,7 +169,7 @@ def test_exclude_extension_string(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_matches())
     files_filtered = True
     for file in matches:
         filename, ext = osp.splitext(file)
@@ -173,7 +188,7 @@ def test_exclude_extension_empty_regex(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_matches())
     assert expected_results() == matches
 
 
@@ -186,7 +201,7 @@ def test_exclude_extension_string_no_regexp(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_matches())
     assert expected_results() == matches
 
 
@@ -199,7 +214,7 @@ def test_exclude_extension_multiple_string(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_matches())
     files_filtered = True
     for file in matches:
         filename, ext = osp.splitext(file)
@@ -230,9 +245,8 @@ def test_truncate_result_with_different_input(findinfiles, qtbot, line_input):
         line_input_expected[slice_end:])
 
     # when
-    thread = SearchThread(None, '')
-    truncated_line = thread.truncate_result(line_input, slice_start,
-                                            slice_end)
+    truncated_line = widgets.truncate_result(line_input, slice_start,
+                                             slice_end)
     # then
     assert truncated_line == expected_result
 
@@ -246,7 +260,7 @@ def test_case_unsensitive_search(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_matches())
     print(matches)
     assert expected_case_unsensitive_results() == matches
 
@@ -260,7 +274,7 @@ def test_case_sensitive_search(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_matches())
     print(matches)
     assert matches == {'ham.txt': [(9, 0)]}
 
@@ -576,11 +590,43 @@ def test_max_results(findinfiles, qtbot):
     blocker = qtbot.waitSignal(findinfiles.sig_max_results_reached)
     blocker.wait()
 
-    print(len(findinfiles.result_browser.data), value)
-    assert len(findinfiles.result_browser.data) == value
+    print(len(findinfiles.result_browser.get_matches()), value)
+    assert len(findinfiles.result_browser.get_matches()) == value
 
     # Restore defaults
-    findinfiles.set_max_results(1000)
+    findinfiles.set_max_results(0)
+
+
+def test_results_model(qtbot):
+    """Test adding results to the model of the results browser."""
+    model = widgets.ResultsModel(None)
+    model.add_file('/spam.py')
+    model.add_file('/eggs.py')
+    model.add_matches([('/spam.py', 1, 0, 4, 'spam'),
+                       ('/spam.py', 3, 4, 8, 'ham spam spam'),
+                       ('/spam.py', 3, 9, 13, 'ham spam spam'),
+                       ('/eggs.py', 2, 1, 5, ' spam'),
+                       ('/unknown.py', 1, 0, 4, 'spam')])
+    assert model.rowCount() == 2
+    spam_index = model.index(0, 0)
+    assert model.rowCount(spam_index) == 3
+    match_index = model.index(1, 0, spam_index)
+    assert model.parent(match_index) == spam_index
+    assert model.get_match(match_index) == ('/spam.py', 3, 4)
+    assert model.get_match(spam_index) is None
+
+    # Lines are saved once and formatted when displayed
+    assert model.lines == ['spam', 'ham spam spam', ' spam']
+    assert 'ham <b>spam</b> spam' in model.data(match_index)
+    assert 'ham spam <b>spam</b>' in model.data(model.index(2, 0,
+                                                            spam_index))
+
+    model.sort(0)
+    assert model.data(model.index(0, 0), Qt.ToolTipRole) == '/eggs.py'
+    assert list(model.iter_matches()) == [('/eggs.py', 2, 1),
+                                          ('/spam.py', 1, 0),
+                                          ('/spam.py', 3, 4),
+                                          ('/spam.py', 3, 9)]
 
 
 if __name__ == "__main__":
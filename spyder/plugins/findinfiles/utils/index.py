@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Trigram index to narrow the files to search in a directory.
+
+For each file, the index stores a signature (a Bloom filter) of the
+lowercased trigrams present in its contents, together with its size and
+modification time. A file whose signature lacks any of the trigrams of the
+searched text can't contain it, so it doesn't need to be opened.
+"""
+
+# Standard library imports
+import hashlib
+import os
+import os.path as osp
+import stat
+import threading
+
+try:
+    # Python 3.11+
+    import re._parser as sre_parse
+except ImportError:
+    import sre_parse
+
+# Third party imports
+from atomicwrites import atomic_write
+
+# Local imports
+from spyder.config.base import get_conf_path
+from spyder.py3compat import pickle, to_binary_string
+from spyder.utils.encoding import is_text_file
+from spyder.utils.walk import DirectoryWalker
+
+
+# Version of the index format. Saved indexes with another version are
+# discarded.
+INDEX_VERSION = 1
+
+# Files bigger than this are not indexed and always searched (in bytes)
+MAX_FILE_SIZE = 10 * 1024 ** 2
+
+# Bits per trigram in the file signatures, which gives about 12% of false
+# positives per trigram
+BITS_PER_TRIGRAM = 8
+
+# Minimum and maximum size of the file signatures (as powers of 2 bits)
+MIN_SIGNATURE_BITS = 6
+MAX_SIGNATURE_BITS = 20
+
+
+def get_index_path(root_path):
+    """Return the path where the index of `root_path` is saved."""
+    name = hashlib.md5(to_binary_string(root_path, 'utf-8')).hexdigest()
+    return get_conf_path(osp.join('index', name + '.pickle'))
+
+
+def normalize_path(path):
+    """Return the key used to store `path` in the index."""
+    return osp.normcase(osp.abspath(path))
+
+
+def get_trigrams(data):
+    """Return the set of (integer encoded) trigrams of the bytes `data`."""
+    data = bytearray(data)
+    return set((a << 16) | (b << 8) | c
+               for a, b, c in set(zip(data, data[1:], data[2:])))
+
+
+def get_bit(trigram, size):
+    """Return the bit of `trigram` in a signature of 2**`size` bits."""
+    return ((trigram * 2654435761) & 0xFFFFFFFF) >> (32 - size)
+
+
+def get_signature(trigrams):
+    """
+    Return the signature of a set of trigrams.
+
+    Returns a (size, signature) tuple, where `signature` is a bytearray of
+    2**`size` bits.
+    """
+    size = (len(trigrams) * BITS_PER_TRIGRAM).bit_length()
+    size = min(max(size, MIN_SIGNATURE_BITS), MAX_SIGNATURE_BITS)
+    signature = bytearray(2 ** size // 8)
+    for trigram in trigrams:
+        bit = get_bit(trigram, size)
+        signature[bit >> 3] |= 1 << (bit & 7)
+    return size, signature
+
+
+def get_literals(text, text_re):
+    """
+    Return the strings that any match of `text` has to contain.
+
+    For regular expressions, these are the literal strings at the top level
+    of the pattern.
+    """
+    if not text_re:
+        return [text]
+
+    try:
+        parsed = sre_parse.parse(getattr(text, 'pattern', text))
+    except Exception:
+        return []
+
+    literals = []
+    literal = bytearray()
+    for op, value in parsed:
+        if op == sre_parse.LITERAL:
+            literal.append(value)
+        elif literal:
+            literals.append(bytes(literal))
+            literal = bytearray()
+    if literal:
+        literals.append(bytes(literal))
+    return literals
+
+
+class TrigramQuery(object):
+    """Trigrams that a file has to contain to match a text."""
+
+    def __init__(self, trigrams):
+        self.trigrams = trigrams
+        self._masks = {}
+
+    def matches(self, size, signature):
+        """Return True if `signature` could contain the trigrams."""
+        masks = self._masks.get(size)
+        if masks is None:
+            masks = []
+            for trigram in self.trigrams:
+                bit = get_bit(trigram, size)
+                masks.append((bit >> 3, 1 << (bit & 7)))
+            self._masks[size] = masks
+        for index, mask in masks:
+            if not signature[index] & mask:
+                return False
+        return True
+
+
+class TrigramIndex(object):
+    """
+    Trigram index of the files of a directory.
+
+    Files ignored by .gitignore and .ignore files are not indexed.
+
+    This class is thread safe, so the index can be updated by watchers while
+    it's used to search.
+    """
+
+    def __init__(self, root_path, index_path=None):
+        self.root_path = normalize_path(root_path)
+        self.index_path = index_path
+        self.walker = DirectoryWalker(self.root_path)
+        self._lock = threading.Lock()
+
+        # Entries are (size, mtime, signature size, signature) tuples. The
+        # signature is None for binary files.
+        self._files = {}
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, path):
+        return normalize_path(path) in self._files
+
+    # ---- Persistence
+    def load(self):
+        """Load the index saved in `index_path`, if any."""
+        if self.index_path is None or not osp.isfile(self.index_path):
+            return False
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception:
+            return False
+        if (data.get('version') != INDEX_VERSION or
+                data.get('root_path') != self.root_path):
+            return False
+        with self._lock:
+            self._files = data['files']
+        return True
+
+    def save(self):
+        """Save the index to `index_path`."""
+        if self.index_path is None:
+            return
+        with self._lock:
+            files = dict(self._files)
+        data = {'version': INDEX_VERSION,
+                'root_path': self.root_path,
+                'files': files}
+        try:
+            index_dir = osp.dirname(self.index_path)
+            if not osp.isdir(index_dir):
+                os.makedirs(index_dir)
+            with atomic_write(self.index_path, mode='wb',
+                              overwrite=True) as f:
+                pickle.dump(data, f, protocol=2)
+        except (IOError, OSError):
+            pass
+
+    # ---- Updates
+    def build(self, stopped=None):
+        """
+        Index all the files in `root_path` that changed since they were
+        last indexed, and forget the ones that were removed.
+
+        `stopped` is an optional callable that returns True when indexing
+        has to be interrupted. Returns False if it was.
+        """
+        found = set()
+        for filename in self.walker.walk():
+            if stopped is not None and stopped():
+                return False
+            found.add(normalize_path(filename))
+            self._update_file(filename)
+
+        with self._lock:
+            for filename in list(self._files):
+                if filename not in found:
+                    del self._files[filename]
+        return True
+
+    def update_file(self, path):
+        """Index `path` if it changed since it was last indexed."""
+        if self.walker.is_ignored(path):
+            self.remove_file(path)
+        else:
+            self._update_file(path)
+
+    def _update_file(self, path):
+        """Index `path`, which is known to not be ignored."""
+        key = normalize_path(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.remove_file(path)
+            return
+        if not stat.S_ISREG(st.st_mode) or st.st_size > MAX_FILE_SIZE:
+            self.remove_file(path)
+            return
+
+        entry = self._files.get(key)
+        if (entry is not None and entry[0] == st.st_size and
+                entry[1] == st.st_mtime):
+            return
+
+        size, signature = 0, None
+        if is_text_file(path):
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except (IOError, OSError):
+                self.remove_file(path)
+                return
+            size, signature = get_signature(get_trigrams(data.lower()))
+
+        with self._lock:
+            self._files[key] = (st.st_size, st.st_mtime, size, signature)
+
+    def remove_file(self, path):
+        """Remove `path` from the index."""
+        with self._lock:
+            self._files.pop(normalize_path(path), None)
+
+    # ---- Search
+    def get_matcher(self, texts, text_re, case_sensitive):
+        """
+        Return a function that tells if a file could contain any of `texts`.
+
+        Files not indexed or changed since they were indexed could always
+        contain them. Returns None if the texts are too short to use the
+        index.
+        """
+        queries = []
+        for text, enc in texts:
+            trigrams = set()
+            for literal in get_literals(text, text_re):
+                trigrams.update(get_trigrams(literal.lower()))
+            if not trigrams:
+                return None
+            queries.append(TrigramQuery(trigrams))
+
+        files = self._files
+
+        def may_contain(path):
+            entry = files.get(normalize_path(path))
+            if entry is None:
+                return True
+            size, mtime, signature_size, signature = entry
+            try:
+                st = os.stat(path)
+            except OSError:
+                return True
+            if st.st_size != size or st.st_mtime != mtime:
+                return True
+            if signature is None:
+                # Binary files are never searched
+                return False
+            return any(query.matches(signature_size, signature)
+                       for query in queries)
+
+        return may_contain
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Search engine for the Find in Files plugin.
+
+Note: This module must not import Qt because its functions are run in the
+worker processes of the parallel search.
+"""
+
+# Standard library imports
+import mmap
+import multiprocessing
+import os
+import os.path as osp
+import re
+import sys
+
+# Local imports
+from spyder.py3compat import PY2
+from spyder.utils.encoding import TEXT_FILE_CACHE
+
+
+# Number of files sent at once to a worker process
+CHUNK_SIZE = 16
+
+# Files bigger than this are memory mapped instead of read (in bytes)
+MMAP_THRESHOLD = 1024 ** 2
+
+# Size of the blocks in which memory mapped files are processed (in bytes)
+BLOCK_SIZE = 1024 ** 2
+
+# Options of the current search in a worker process
+_worker_options = None
+
+
+def get_number_of_processes(processes=None):
+    """
+    Return the number of processes to use for a search.
+
+    `processes` equal to None or 0 means to use one process per cpu.
+    """
+    if getattr(sys, 'frozen', False):
+        # Worker processes can't be spawned from frozen applications
+        return 1
+    if not processes:
+        try:
+            processes = multiprocessing.cpu_count()
+        except NotImplementedError:
+            processes = 1
+    return max(processes, 1)
+
+
+def iter_file_matches(fname, texts, text_re, case_sensitive, stopped=None,
+                      whole_buffer=True):
+    """
+    Iterate over the matches of `texts` found in the file `fname`.
+
+    Matches are yielded as tuples of the form
+    (filename, lineno, colno, match_end, line).
+
+    If `whole_buffer` is True, the file is scanned as a single buffer and
+    only the lines with matches are extracted from it. Otherwise it's
+    scanned line by line.
+
+    `stopped` is an optional callable that returns True when the search has
+    to be interrupted.
+    """
+    fname = osp.abspath(fname)
+    if whole_buffer:
+        matches = _iter_buffer_matches(fname, texts, text_re, case_sensitive,
+                                       stopped)
+    else:
+        matches = _iter_line_matches(fname, texts, text_re, case_sensitive,
+                                     stopped)
+    for match in matches:
+        yield match
+
+
+def _iter_line_matches(fname, texts, text_re, case_sensitive, stopped):
+    """Scan `fname` line by line."""
+    with open(fname, 'rb') as f:
+        for lineno, line in enumerate(f):
+            if stopped is not None and stopped():
+                return
+
+            line_search = line
+            if not case_sensitive:
+                line_search = line.lower()
+
+            for text, enc in texts:
+                if text_re:
+                    found = re.search(text, line_search)
+                    if found is not None:
+                        break
+                else:
+                    found = line_search.find(text)
+                    if found > -1:
+                        break
+            else:
+                # None of the texts is present in this line
+                continue
+
+            try:
+                line_dec = line.decode(enc)
+            except UnicodeDecodeError:
+                line_dec = line
+
+            if text_re:
+                for match in re.finditer(text, line_search):
+                    yield (fname, lineno + 1, match.start(), match.end(),
+                           line_dec)
+            else:
+                while found > -1:
+                    yield (fname, lineno + 1, found, found + len(text),
+                           line_dec)
+                    for text, enc in texts:
+                        found = line_search.find(text, found + 1)
+                        if found > -1:
+                            break
+
+
+def _iter_buffer_matches(fname, texts, text_re, case_sensitive, stopped):
+    """
+    Scan `fname` as a single buffer.
+
+    As with the line by line scan, the matches of a line are the ones of the
+    first text found in it.
+    """
+    with open(fname, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        buf = None
+        if size > MMAP_THRESHOLD:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, EnvironmentError):
+                pass
+        if buf is None:
+            buf = f.read()
+
+        try:
+            matched_lines = set()
+            for index, (text, enc) in enumerate(texts):
+                counter = _LineCounter(buf)
+                text_lines = set()
+                last_line = None
+                for start, end in _iter_offsets(buf, text, text_re,
+                                                case_sensitive):
+                    if stopped is not None and stopped():
+                        return
+
+                    if last_line is None or start >= last_line[1]:
+                        line_start = buf.rfind(b'\n', 0, start) + 1
+                        line_end = buf.find(b'\n', start)
+                        line_end = len(buf) if line_end < 0 else line_end + 1
+                        lineno = counter.lineno_at(line_start)
+                        if lineno in matched_lines:
+                            line_dec = None
+                        else:
+                            line = buf[line_start:line_end]
+                            try:
+                                line_dec = line.decode(enc)
+                            except UnicodeDecodeError:
+                                line_dec = line
+                            text_lines.add(lineno)
+                        last_line = (line_start, line_end, lineno, line_dec)
+
+                    line_start, line_end, lineno, line_dec = last_line
+                    if line_dec is None:
+                        # Line already matched by a previous text
+                        continue
+                    yield (fname, lineno + 1, start - line_start,
+                           end - line_start, line_dec)
+
+                if index < len(texts) - 1:
+                    matched_lines.update(text_lines)
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+
+class _LineCounter(object):
+    """Compute line numbers of increasing offsets of a buffer."""
+
+    def __init__(self, buf):
+        self.buf = buf
+        self.pos = 0
+        self.lineno = 0
+
+    def lineno_at(self, offset):
+        """Return the (zero based) line number of `offset`."""
+        if isinstance(self.buf, mmap.mmap):
+            # mmap objects don't have a count method
+            for block in range(self.pos, offset, BLOCK_SIZE):
+                block_end = min(block + BLOCK_SIZE, offset)
+                self.lineno += self.buf[block:block_end].count(b'\n')
+        else:
+            self.lineno += self.buf.count(b'\n', self.pos, offset)
+        self.pos = offset
+        return self.lineno
+
+
+def _iter_offsets(buf, text, text_re, case_sensitive):
+    """Iterate over the (start, end) offsets of `text` in `buf`."""
+    if not text_re:
+        for found in _iter_find(buf, text, case_sensitive):
+            yield found, found + len(text)
+        return
+
+    flags = getattr(text, 'flags', 0)
+    if not case_sensitive:
+        # Texts are already lowercased but buffers are not
+        flags |= re.IGNORECASE
+    text = getattr(text, 'pattern', text)
+    line_pattern = re.compile(text, flags)
+    pattern = re.compile(text, flags | re.MULTILINE)
+
+    # There's no line after the last end of line character
+    size = len(buf)
+    if buf[-1:] == b'\n':
+        size -= 1
+
+    pos = 0
+    while True:
+        for match in pattern.finditer(buf, pos):
+            start, end = match.span()
+            if start > size:
+                return
+            if buf.find(b'\n', start, max(start, end - 1)) < 0:
+                yield start, end
+                continue
+
+            # The match spans several lines, but matches can't go beyond the
+            # line where they start when searching line by line. So the rest
+            # of that line is searched on its own.
+            line_start = buf.rfind(b'\n', 0, start) + 1
+            line_end = buf.find(b'\n', start) + 1
+            line = buf[line_start:line_end]
+            for line_match in line_pattern.finditer(line, start - line_start):
+                if line_match.start() == len(line):
+                    # A zero-width match after the end of line character
+                    # is at the same offset as the start of the next line,
+                    # which is searched below
+                    break
+                yield (line_start + line_match.start(),
+                       line_start + line_match.end())
+            pos = line_end
+            break
+        else:
+            return
+
+
+def _iter_find(buf, text, case_sensitive):
+    """
+    Iterate over the offsets of the (possibly overlapping) occurrences of
+    `text` in `buf`.
+    """
+    if case_sensitive:
+        found = buf.find(text)
+        while found > -1:
+            yield found
+            found = buf.find(text, found + 1)
+    elif not isinstance(buf, mmap.mmap):
+        # Lowercasing doesn't change the length of byte strings, so offsets
+        # are the same in both buffers
+        for found in _iter_find(buf.lower(), text, True):
+            yield found
+    else:
+        # Lowercase memory mapped files by blocks to not load them entirely.
+        # Blocks overlap so that occurrences between two blocks are found.
+        overlap = len(text) - 1
+        for block_start in range(0, len(buf), BLOCK_SIZE):
+            block = buf[block_start:
+                        block_start + BLOCK_SIZE + overlap].lower()
+            for found in _iter_find(block, text, True):
+                if found >= BLOCK_SIZE:
+                    break
+                yield block_start + found
+
+
+def chunked(iterable, size=CHUNK_SIZE):
+    """Group the items of `iterable` in lists of `size` items."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _init_worker(texts, text_re, case_sensitive):
+    """Store the search options in a worker process."""
+    global _worker_options
+    _worker_options = (texts, text_re, case_sensitive)
+
+
+def search_files(files):
+    """
+    Search a chunk of files in a worker process.
+
+    `files` is a list of (filename, is_text) tuples, where `is_text` is None
+    when it's not known yet if the file is a text file.
+
+    Returns a list of (filename, matches, error, text_entry) tuples, one per
+    file, where `error` is True if the file couldn't be read and
+    `text_entry` is the text file classification computed by the worker,
+    if any (see `spyder.utils.encoding.TextFileCache`).
+    """
+    texts, text_re, case_sensitive = _worker_options
+    results = []
+    for fname, is_text in files:
+        matches = []
+        error = False
+        text_entry = None
+        if is_text is None:
+            text_entry = TEXT_FILE_CACHE.get_entry(fname)
+            is_text = text_entry is not None and text_entry[2]
+        if is_text:
+            try:
+                matches = list(iter_file_matches(fname, texts, text_re,
+                                                 case_sensitive))
+            except (IOError, OSError):
+                error = True
+        results.append((fname, matches, error, text_entry))
+    return results
+
+
+def create_pool(processes, texts, text_re, case_sensitive):
+    """
+    Create a pool of worker processes for searching `texts`.
+
+    Processes are spawned instead of forked because it's not safe to fork a
+    process running Qt threads.
+    """
+    if PY2:
+        context = multiprocessing
+    else:
+        context = multiprocessing.get_context('spawn')
+    return context.Pool(processes, initializer=_init_worker,
+                        initargs=(texts, text_re, case_sensitive))
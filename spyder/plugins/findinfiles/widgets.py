@@ -13,7 +13,10 @@
 
 # Standard library imports
 from __future__ import with_statement, print_function
+import array
 import fnmatch
+import logging
+import multiprocessing
 import os
 import os.path as osp
 import re
@@ -24,29 +27,37 @@ import traceback
 # Third party imports
 from qtpy.compat import getexistingdirectory
 from qtpy.QtGui import QAbstractTextDocumentLayout, QTextDocument
-from qtpy.QtCore import (QEvent, QMutex, QMutexLocker, QSize, Qt, QThread,
+from qtpy.QtCore import (QAbstractItemModel, QEvent, QModelIndex, QMutex,
+                         QMutexLocker, QSize, Qt, QThread, QWaitCondition,
                          Signal, Slot)
 from qtpy.QtWidgets import (QApplication, QComboBox, QHBoxLayout, QLabel,
-                            QMessageBox, QSizePolicy, QStyle,
+                            QMenu, QMessageBox, QSizePolicy, QStyle,
                             QStyledItemDelegate, QStyleOptionViewItem,
-                            QTreeWidgetItem, QVBoxLayout, QWidget)
+                            QTreeView, QVBoxLayout, QWidget)
 
 # Local imports
 from spyder.config.base import _
 from spyder.config.main import EXCLUDE_PATTERNS
 from spyder.py3compat import to_text_string, PY2
 from spyder.utils import icon_manager as ima
-from spyder.utils.encoding import is_text_file, to_unicode_from_fs
+from spyder.utils.encoding import (TEXT_FILE_CACHE, is_text_file,
+                                   to_unicode_from_fs)
 from spyder.widgets.comboboxes import PatternComboBox
-from spyder.widgets.onecolumntree import OneColumnTree
 from spyder.utils.misc import regexp_error_msg
-from spyder.utils.qthelpers import create_toolbutton, create_waitspinner
+from spyder.plugins.findinfiles.utils.search import (
+    chunked, create_pool, get_number_of_processes, iter_file_matches,
+    search_files)
+from spyder.utils.qthelpers import (add_actions, create_action,
+                                    create_toolbutton, create_waitspinner)
+from spyder.utils.walk import DirectoryWalker
 from spyder.config.gui import get_font
 
 
 ON = 'on'
 OFF = 'off'
 
+logger = logging.getLogger(__name__)
+
 CWD = 0
 PROJECT = 1
 FILE_PATH = 2
@@ -66,6 +77,84 @@ def truncate_path(text):
     return left_text + ellipsis + right_text
 
 
+def truncate_result(line, start, end, text_color=None):
+    """
+    Shorten text on line to display the match within `max_line_length`.
+
+    The result is an HTML text where the match is shown in bold.
+    """
+    ellipsis = u'...'
+    max_line_length = 80
+    max_num_char_fragment = 40
+
+    html_escape_table = {
+        u"&": u"&amp;",
+        u'"': u"&quot;",
+        u"'": u"&apos;",
+        u">": u"&gt;",
+        u"<": u"&lt;",
+    }
+
+    def html_escape(text):
+        """Produce entities within text."""
+        return u"".join(html_escape_table.get(c, c) for c in text)
+
+    if PY2:
+        line = to_text_string(line, encoding='utf8')
+    else:
+        line = to_text_string(line)
+    left, match, right = line[:start], line[start:end], line[end:]
+
+    if len(line) > max_line_length:
+        offset = (len(line) - len(match)) // 2
+
+        left = left.split(u' ')
+        num_left_words = len(left)
+
+        if num_left_words == 1:
+            left = left[0]
+            if len(left) > max_num_char_fragment:
+                left = ellipsis + left[-offset:]
+            left = [left]
+
+        right = right.split(u' ')
+        num_right_words = len(right)
+
+        if num_right_words == 1:
+            right = right[0]
+            if len(right) > max_num_char_fragment:
+                right = right[:offset] + ellipsis
+            right = [right]
+
+        left = left[-4:]
+        right = right[:4]
+
+        if len(left) < num_left_words:
+            left = [ellipsis] + left
+
+        if len(right) < num_right_words:
+            right = right + [ellipsis]
+
+        left = u' '.join(left)
+        right = u' '.join(right)
+
+        if len(left) > max_num_char_fragment:
+            left = ellipsis + left[-30:]
+
+        if len(right) > max_num_char_fragment:
+            right = right[:30] + ellipsis
+
+    line_match_format = (u'<span style="color:{0}">{{0}}'
+                         '<b>{{1}}</b>{{2}}</span>')
+    line_match_format = line_match_format.format(text_color)
+
+    left = html_escape(left)
+    right = html_escape(right)
+    match = html_escape(match)
+    trunc_line = line_match_format.format(left, match, right)
+    return trunc_line
+
+
 class SearchThread(QThread):
     """Find in files search thread."""
     sig_finished = Signal(bool)
@@ -79,12 +168,20 @@ class SearchThread(QThread):
     power = 0       # 0**1 = 1
     max_power = 9   # 2**9 = 512
 
-    def __init__(self, parent, search_text, text_color=None):
+    # Time to wait for results of the worker processes before checking if
+    # the search was stopped (in seconds)
+    poll_timeout = 0.1
+
+    def __init__(self, parent, search_text, text_color=None, processes=1,
+                 index=None, use_ignore_files=True):
         QThread.__init__(self, parent)
         self.mutex = QMutex()
         self.stopped = None
         self.search_text = search_text
         self.text_color = text_color
+        self.processes = processes
+        self.index = index
+        self.use_ignore_files = use_ignore_files
         self.pathlist = None
         self.total_matches = None
         self.error_flag = None
@@ -99,7 +196,7 @@ class SearchThread(QThread):
         self.results = {}
 
         self.num_files = 0
-        self.files = []
+        self.files = set()
         self.partial_results = []
 
     def initialize(self, path, is_file, exclude,
@@ -134,37 +231,109 @@ class SearchThread(QThread):
         with QMutexLocker(self.mutex):
             self.stopped = True
 
+    def is_stopped(self):
+        """Return True if the search has been stopped."""
+        with QMutexLocker(self.mutex):
+            return self.stopped
+
+    def iter_files(self, path):
+        """
+        Iterate over the files to search in `path`.
+
+        Files ignored by .gitignore and .ignore files (if enabled) and the
+        ones that can't contain the search texts according to the trigram
+        index are skipped.
+        """
+        may_contain = None
+        if self.index is not None:
+            may_contain = self.index.get_matcher(self.texts, self.text_re,
+                                                 self.case_sensitive)
+        walker = DirectoryWalker(path, exclude=self.exclude,
+                                 use_ignore_files=self.use_ignore_files)
+        try:
+            for filename in walker.walk(stopped=self.is_stopped):
+                if may_contain is not None and not may_contain(filename):
+                    continue
+                yield filename
+        except re.error:
+            self.error_flag = _("invalid regular expression")
+
+    def iter_pool_items(self, path):
+        """
+        Iterate over the (filename, is_text) items to send to the worker
+        processes for the files in `path`.
+
+        Files already known to be binary are skipped.
+        """
+        for filename in self.iter_files(path):
+            entry = TEXT_FILE_CACHE.get_cached_entry(filename)
+            if entry is None:
+                yield filename, None
+            elif entry[2]:
+                yield filename, True
+
     def find_files_in_path(self, path):
         if self.pathlist is None:
             self.pathlist = []
         self.pathlist.append(path)
-        for path, dirs, files in os.walk(path):
-            with QMutexLocker(self.mutex):
-                if self.stopped:
-                    return False
+
+        processes = get_number_of_processes(self.processes)
+        if processes > 1:
             try:
-                for d in dirs[:]:
-                    with QMutexLocker(self.mutex):
-                        if self.stopped:
-                            return False
-                    dirname = os.path.join(path, d)
-                    if (self.exclude and
-                            re.search(self.exclude, dirname + os.sep)):
-                        dirs.remove(d)
-                    elif d == '.git' or d == '.hg':
-                        dirs.remove(d)
-                for f in files:
-                    with QMutexLocker(self.mutex):
-                        if self.stopped:
-                            return False
-                    filename = os.path.join(path, f)
-                    if self.exclude and re.search(self.exclude, filename):
-                        continue
-                    if is_text_file(filename):
-                        self.find_string_in_file(filename)
-            except re.error:
-                self.error_flag = _("invalid regular expression")
+                pool = create_pool(processes, self.texts, self.text_re,
+                                   self.case_sensitive)
+            except (OSError, ImportError):
+                # Multiprocessing is not available on this system
+                pool = None
+            if pool is not None:
+                try:
+                    return self.find_files_in_path_parallel(path, pool)
+                finally:
+                    pool.terminate()
+                    pool.join()
+
+        for filename in self.iter_files(path):
+            if is_text_file(filename):
+                self.find_string_in_file(filename)
+        if self.is_stopped():
+            return False
+
+        # Process any pending results
+        if self.partial_results:
+            self.process_results()
+
+        return True
+
+    def find_files_in_path_parallel(self, path, pool):
+        """Search the files in `path` using a pool of worker processes."""
+        self.error_flag = False
+        chunks = chunked(self.iter_pool_items(path))
+        results = pool.imap_unordered(search_files, chunks)
+        while True:
+            if self.is_stopped():
                 return False
+            try:
+                chunk = results.next(timeout=self.poll_timeout)
+            except multiprocessing.TimeoutError:
+                continue
+            except StopIteration:
+                break
+            for filename, matches, error, text_entry in chunk:
+                if self.is_stopped():
+                    return False
+                if text_entry is not None:
+                    TEXT_FILE_CACHE.add_entry(filename, text_entry)
+                self.sig_current_file.emit(filename)
+                if error:
+                    self.error_flag = _("permission denied errors were "
+                                        "encountered")
+                for result in matches:
+                    self.add_result(result)
+
+        if self.is_stopped():
+            return False
+
+        self.completed = True
 
         # Process any pending results
         if self.partial_results:
@@ -176,73 +345,25 @@ class SearchThread(QThread):
         self.error_flag = False
         self.sig_current_file.emit(fname)
         try:
-            for lineno, line in enumerate(open(fname, 'rb')):
-                for text, enc in self.texts:
-                    with QMutexLocker(self.mutex):
-                        if self.stopped:
-                            return False
-                    line_search = line
-                    if not self.case_sensitive:
-                        line_search = line_search.lower()
-                    if self.text_re:
-                        found = re.search(text, line_search)
-                        if found is not None:
-                            break
-                    else:
-                        found = line_search.find(text)
-                        if found > -1:
-                            break
-                try:
-                    line_dec = line.decode(enc)
-                except UnicodeDecodeError:
-                    line_dec = line
-
-                if not self.case_sensitive:
-                    line = line.lower()
-
-                if self.text_re:
-                    for match in re.finditer(text, line):
-                        with QMutexLocker(self.mutex):
-                            if self.stopped:
-                                return False
-                        self.total_matches += 1
-                        self.partial_results.append((osp.abspath(fname),
-                                                     lineno + 1,
-                                                     match.start(),
-                                                     match.end(),
-                                                     line_dec))
-                        if len(self.partial_results) > (2**self.power):
-                            self.process_results()
-                            if self.power < self.max_power:
-                                self.power += 1
-                else:
-                    found = line.find(text)
-                    while found > -1:
-                        with QMutexLocker(self.mutex):
-                            if self.stopped:
-                                return False
-                        self.total_matches += 1
-                        self.partial_results.append((osp.abspath(fname),
-                                                     lineno + 1,
-                                                     found,
-                                                     found + len(text),
-                                                     line_dec))
-                        if len(self.partial_results) > (2**self.power):
-                            self.process_results()
-                            if self.power < self.max_power:
-                                self.power += 1
-
-                        for text, enc in self.texts:
-                            found = line.find(text, found + 1)
-                            if found > -1:
-                                break
-
+            for result in iter_file_matches(fname, self.texts, self.text_re,
+                                            self.case_sensitive,
+                                            stopped=self.is_stopped):
+                self.add_result(result)
         except IOError as xxx_todo_changeme:
             (_errno, _strerror) = xxx_todo_changeme.args
             self.error_flag = _("permission denied errors were encountered")
 
         self.completed = True
 
+    def add_result(self, result):
+        """Add a match to the partial results and emit them by batches."""
+        self.total_matches += 1
+        self.partial_results.append(result)
+        if len(self.partial_results) > (2**self.power):
+            self.process_results()
+            if self.power < self.max_power:
+                self.power += 1
+
     def process_results(self):
         """
         Process all matches found inside a file.
@@ -250,25 +371,20 @@ class SearchThread(QThread):
         Creates the necessary files and emits signal for the creation of file
         item.
 
-        Creates the necessary data for lines found and emits signal for the
-        creation of line items in batch.
+        Emits the matches found in batch, with the lines where they were
+        found. Lines are truncated and formatted when they're displayed.
 
         Creates the title based on the last entry of the lines batch.
         """
-        items = []
+        items = self.partial_results
         num_matches = self.total_matches
-        for result in self.partial_results:
-            filename, lineno, colno, match_end, line = result
-
+        for result in items:
+            filename = result[0]
             if filename not in self.files:
-                self.files.append(filename)
+                self.files.add(filename)
                 self.sig_file_match.emit(filename)
                 self.num_files += 1
 
-            line = self.truncate_result(line, colno, match_end)
-            item = (filename, lineno, colno, line)
-            items.append(item)
-
         # Process title
         title = "'%s' - " % self.search_text
         nb_files = self.num_files
@@ -286,83 +402,73 @@ class SearchThread(QThread):
         self.partial_results = []
         self.sig_line_match.emit(items, title)
 
-    def truncate_result(self, line, start, end):
-        """
-        Shorten text on line to display the match within `max_line_length`.
-        """
-        ellipsis = u'...'
-        max_line_length = 80
-        max_num_char_fragment = 40
-
-        html_escape_table = {
-            u"&": u"&amp;",
-            u'"': u"&quot;",
-            u"'": u"&apos;",
-            u">": u"&gt;",
-            u"<": u"&lt;",
-        }
-
-        def html_escape(text):
-            """Produce entities within text."""
-            return u"".join(html_escape_table.get(c, c) for c in text)
-
-        if PY2:
-            line = to_text_string(line, encoding='utf8')
-        else:
-            line = to_text_string(line)
-        left, match, right = line[:start], line[start:end], line[end:]
-
-        if len(line) > max_line_length:
-            offset = (len(line) - len(match)) // 2
-
-            left = left.split(u' ')
-            num_left_words = len(left)
-
-            if num_left_words == 1:
-                left = left[0]
-                if len(left) > max_num_char_fragment:
-                    left = ellipsis + left[-offset:]
-                left = [left]
-
-            right = right.split(u' ')
-            num_right_words = len(right)
-
-            if num_right_words == 1:
-                right = right[0]
-                if len(right) > max_num_char_fragment:
-                    right = right[:offset] + ellipsis
-                right = [right]
+    def get_results(self):
+        return self.results, self.pathlist, self.total_matches, self.error_flag
 
-            left = left[-4:]
-            right = right[:4]
 
-            if len(left) < num_left_words:
-                left = [ellipsis] + left
+class IndexThread(QThread):
+    """
+    Thread to load and update the trigram index of a project.
 
-            if len(right) < num_right_words:
-                right = right + [ellipsis]
+    The index is loaded and refreshed when the thread starts, and saved after
+    that. Then the files that changed are indexed as they're added, so that
+    reading them never blocks the thread that reports the changes.
+    """
 
-            left = u' '.join(left)
-            right = u' '.join(right)
+    def __init__(self, parent, index):
+        QThread.__init__(self, parent)
+        self.mutex = QMutex()
+        self.condition = QWaitCondition()
+        self.stopped = False
+        self.index = index
+        self.paths = set()
 
-            if len(left) > max_num_char_fragment:
-                left = ellipsis + left[-30:]
+    def run(self):
+        try:
+            self.index.load()
+            if not self.index.build(stopped=self.is_stopped):
+                return
+            self.index.save()
+            paths = self.take_paths()
+            while paths is not None:
+                for path in paths:
+                    if self.is_stopped():
+                        return
+                    self.index.update_file(path)
+                paths = self.take_paths()
+        except Exception:
+            # Unexpected exceptions are not catched by the main thread
+            logger.error("Error while indexing {0}".format(
+                self.index.root_path), exc_info=True)
 
-            if len(right) > max_num_char_fragment:
-                right = right[:30] + ellipsis
+    def add_paths(self, paths):
+        """Index `paths` again, or remove them if they don't exist."""
+        with QMutexLocker(self.mutex):
+            self.paths.update(paths)
+            self.condition.wakeAll()
 
-        line_match_format = (u'<span style="color:{0}">{{0}}'
-                             '<b>{{1}}</b>{{2}}</span>')
-        line_match_format = line_match_format.format(self.text_color)
+    def take_paths(self):
+        """
+        Wait for paths to index and return them, or None if the thread was
+        stopped.
+        """
+        with QMutexLocker(self.mutex):
+            while not self.paths and not self.stopped:
+                self.condition.wait(self.mutex)
+            if self.stopped:
+                return None
+            paths = sorted(self.paths)
+            self.paths.clear()
+            return paths
 
-        left = html_escape(left)
-        right = html_escape(right)
-        match = html_escape(match)
-        trunc_line = line_match_format.format(left, match, right)
-        return trunc_line
+    def stop(self):
+        with QMutexLocker(self.mutex):
+            self.stopped = True
+            self.condition.wakeAll()
 
-    def get_results(self):
-        return self.results, self.pathlist, self.total_matches, self.error_flag
+    def is_stopped(self):
+        with QMutexLocker(self.mutex):
+            return self.stopped
 
 
 class SearchInComboBox(QComboBox):
@@ -827,70 +933,207 @@ class FindOptions(QWidget):
             QWidget.keyPressEvent(self, event)
 
 
-class LineMatchItem(QTreeWidgetItem):
-
-    def __init__(self, parent, lineno, colno, match, font,
-                 text_color=None):
-        self.lineno = lineno
-        self.colno = colno
-        self.match = match
-        self.text_color = text_color
-        self.font = font
-        QTreeWidgetItem.__init__(self, parent, [self.__repr__()],
-                                 QTreeWidgetItem.Type)
-
-    def __repr__(self):
-        match = to_text_string(self.match).rstrip()
-        _str = to_text_string("<!-- LineMatchItem -->"
-                              "<p style=\"color:'{4}';\"><b>{1}</b> ({2}): "
-                              "<span style='font-family:{0};"
-                              "font-size:75%;'>{3}</span></p>")
-        return _str.format(self.font.family(), self.lineno, self.colno, match,
-                           self.text_color)
-
-    def __unicode__(self):
-        return self.__repr__()
-
-    def __str__(self):
-        return self.__repr__()
-
-    def __lt__(self, x):
-        return self.lineno < x.lineno
-
-    def __ge__(self, x):
-        return self.lineno >= x.lineno
-
-
-class FileMatchItem(QTreeWidgetItem):
-
-    def __init__(self, parent, filename, sorting, text_color=None):
+class FileMatches(object):
+    """Matches found in a file of the results model."""
 
-        self.sorting = sorting
-        self.filename = osp.basename(filename)
+    def __init__(self, filename, row):
+        self.filename = filename
+        self.basename = osp.basename(filename)
+        self.row = row
+        # Indexes of the matches in the arrays of the results model
+        self.matches = array.array('i')
 
-        title_format = to_text_string('<!-- FileMatchItem -->'
-                                      '<b style="color:{2}">{0}</b>'
-                                      '&nbsp;&nbsp;&nbsp;'
-                                      '<small style="color:{2}"><em>{1}</em>'
-                                      '</small>')
-        title = (title_format.format(osp.basename(filename),
-                                     osp.dirname(filename),
-                                     text_color))
-        QTreeWidgetItem.__init__(self, parent, [title], QTreeWidgetItem.Type)
 
-        self.setToolTip(0, filename)
+class ResultsModel(QAbstractItemModel):
+    """
+    Model of the Find in Files results.
 
-    def __lt__(self, x):
-        if self.sorting['status'] == ON:
-            return self.filename < x.filename
-        else:
-            return False
+    Matches are stored in flat arrays and the rows of the view are only
+    created when they're displayed, so searches with lots of matches don't
+    need an item per match. Lines with matches are saved once, as they were
+    read, and only truncated and formatted when they're displayed.
+    """
 
-    def __ge__(self, x):
-        if self.sorting['status'] == ON:
-            return self.filename >= x.filename
-        else:
-            return False
+    def __init__(self, parent, text_color=None):
+        QAbstractItemModel.__init__(self, parent)
+        self.text_color = text_color
+        self.font = get_font()
+        self.title = ''
+        self.files = []
+        self.file_rows = {}
+        self.filenames = []
+        self.linenos = array.array('i')
+        self.colnos = array.array('i')
+        self.match_ends = array.array('i')
+        self.line_ids = array.array('i')
+        self.lines = []
+
+    def clear(self):
+        """Remove all results."""
+        self.beginResetModel()
+        self.font = get_font()
+        self.files = []
+        self.file_rows = {}
+        self.filenames = []
+        self.linenos = array.array('i')
+        self.colnos = array.array('i')
+        self.match_ends = array.array('i')
+        self.line_ids = array.array('i')
+        self.lines = []
+        self.endResetModel()
+
+    def set_title(self, title):
+        """Set the title shown in the header."""
+        self.title = title
+        self.headerDataChanged.emit(Qt.Horizontal, 0, 0)
+
+    def get_num_matches(self):
+        """Return the number of matches."""
+        return len(self.linenos)
+
+    def get_match(self, index):
+        """
+        Return the (filename, lineno, colno) tuple of the match at `index`,
+        or None if it's a file row.
+        """
+        file_matches = index.internalPointer()
+        if file_matches is None:
+            return None
+        match = file_matches.matches[index.row()]
+        return (file_matches.filename, self.linenos[match],
+                self.colnos[match])
+
+    def iter_matches(self):
+        """Iterate over the (filename, lineno, colno) tuples of matches."""
+        for file_matches in self.files:
+            for match in file_matches.matches:
+                yield (file_matches.filename, self.linenos[match],
+                       self.colnos[match])
+
+    def add_file(self, filename):
+        """Add a file with matches."""
+        row = len(self.files)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.files.append(FileMatches(filename, row))
+        self.file_rows[filename] = row
+        self.endInsertRows()
+        return self.createIndex(row, 0)
+
+    def add_matches(self, items):
+        """Add (filename, lineno, colno, match_end, line) matches."""
+        groups = []
+        for filename, lineno, colno, match_end, line in items:
+            row = self.file_rows.get(filename)
+            if row is None:
+                continue
+            if not groups or groups[-1][0] != row:
+                groups.append((row, []))
+            groups[-1][1].append((lineno, colno, match_end, line))
+
+        for row, matches in groups:
+            file_matches = self.files[row]
+            first = len(file_matches.matches)
+            self.beginInsertRows(self.createIndex(row, 0), first,
+                                 first + len(matches) - 1)
+            start = len(self.linenos)
+            last_lineno = None
+            if file_matches.matches:
+                last_lineno = self.linenos[file_matches.matches[-1]]
+            for lineno, colno, match_end, line in matches:
+                # Matches in the same line share it
+                if lineno != last_lineno:
+                    self.lines.append(line)
+                    last_lineno = lineno
+                self.linenos.append(lineno)
+                self.colnos.append(colno)
+                self.match_ends.append(match_end)
+                self.line_ids.append(len(self.lines) - 1)
+            file_matches.matches.extend(range(start, len(self.linenos)))
+            self.endInsertRows()
+
+    # ---- Qt methods
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column)
+        return self.createIndex(row, column, self.files[parent.row()])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        file_matches = index.internalPointer()
+        if file_matches is None:
+            return QModelIndex()
+        return self.createIndex(file_matches.row, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.files)
+        if parent.internalPointer() is None and parent.column() == 0:
+            return len(self.files[parent.row()].matches)
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        file_matches = index.internalPointer()
+        if file_matches is None:
+            file_matches = self.files[index.row()]
+            if role == Qt.DisplayRole:
+                title_format = to_text_string(
+                    '<b style="color:{2}">{0}</b>'
+                    '&nbsp;&nbsp;&nbsp;'
+                    '<small style="color:{2}"><em>{1}</em></small>')
+                return title_format.format(file_matches.basename,
+                                           osp.dirname(file_matches.filename),
+                                           self.text_color)
+            elif role == Qt.ToolTipRole:
+                return file_matches.filename
+        elif role == Qt.DisplayRole:
+            match = file_matches.matches[index.row()]
+            line = truncate_result(self.lines[self.line_ids[match]],
+                                   self.colnos[match], self.match_ends[match],
+                                   self.text_color).rstrip()
+            line_format = to_text_string(
+                "<p style=\"color:'{4}';\"><b>{1}</b> ({2}): "
+                "<span style='font-family:{0};"
+                "font-size:75%;'>{3}</span></p>")
+            return line_format.format(self.font.family(), self.linenos[match],
+                                      self.colnos[match], line,
+                                      self.text_color)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.title
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort files by name. Matches are always sorted by line."""
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_files = list(self.files)
+        self.files.sort(key=lambda file_matches: file_matches.basename,
+                        reverse=order == Qt.DescendingOrder)
+        for row, file_matches in enumerate(self.files):
+            file_matches.row = row
+            self.file_rows[file_matches.filename] = row
+
+        # Rows of matches don't change, only the ones of files
+        new_indexes = []
+        for index in old_indexes:
+            if index.internalPointer() is None:
+                file_matches = old_files[index.row()]
+                new_indexes.append(self.createIndex(file_matches.row,
+                                                    index.column()))
+            else:
+                new_indexes.append(index)
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
 
 
 class ItemDelegate(QStyledItemDelegate):
@@ -912,7 +1155,7 @@ class ItemDelegate(QStyledItemDelegate):
         doc.setDocumentMargin(0)
 
         # This needs to be an empty string to avoid the overlapping the
-        # normal text of the QTreeWidgetItem
+        # normal text of the item
         options.text = ""
         style.drawControl(QStyle.CE_ItemViewItem, options, painter)
 
@@ -937,26 +1180,21 @@ class ItemDelegate(QStyledItemDelegate):
         return size
 
 
-class ResultsBrowser(OneColumnTree):
+class ResultsBrowser(QTreeView):
     sig_edit_goto = Signal(str, int, str)
     sig_max_results_reached = Signal()
 
-    def __init__(self, parent, text_color=None, max_results=1000):
-        OneColumnTree.__init__(self, parent)
+    def __init__(self, parent, text_color=None, max_results=0):
+        QTreeView.__init__(self, parent)
         self.search_text = None
-        self.results = None
         self.max_results = max_results
-        self.total_matches = None
-        self.error_flag = None
-        self.completed = None
         self.sorting = {}
-        self.font = get_font()
-        self.data = None
-        self.files = None
-        self.root_items = None
         self.text_color = text_color
+        self.results_model = ResultsModel(self, text_color=text_color)
+        self.setModel(self.results_model)
 
         # Setup
+        self.setItemsExpandable(True)
         self.set_title('')
         self.set_sorting(OFF)
         self.setSortingEnabled(False)
@@ -964,16 +1202,52 @@ class ResultsBrowser(OneColumnTree):
         self.setUniformRowHeights(True)  # Needed for performance
         self.sortByColumn(0, Qt.AscendingOrder)
 
+        # Context menu
+        self.menu = QMenu(self)
+        self.common_actions = self.setup_common_actions()
+
         # Signals
         self.header().sectionClicked.connect(self.sort_section)
-
-    def activated(self, item):
-        """Double-click event."""
-        itemdata = self.data.get(id(self.currentItem()))
-        if itemdata is not None:
-            filename, lineno, colno = itemdata
+        self.activated.connect(self.activated_index)
+        self.clicked.connect(self.activated_index)
+
+    def get_matches(self):
+        """Return the (filename, lineno, colno) tuples of the results."""
+        return list(self.results_model.iter_matches())
+
+    def setup_common_actions(self):
+        """Setup context menu common actions."""
+        collapse_all_action = create_action(self,
+                                            text=_('Collapse all'),
+                                            icon=ima.icon('collapse'),
+                                            triggered=self.collapseAll)
+        expand_all_action = create_action(self,
+                                          text=_('Expand all'),
+                                          icon=ima.icon('expand'),
+                                          triggered=self.expandAll)
+        return [collapse_all_action, expand_all_action]
+
+    def get_menu_actions(self):
+        """Return a list of menu actions."""
+        return list(self.common_actions)
+
+    def contextMenuEvent(self, event):
+        """Override Qt method."""
+        self.menu.clear()
+        add_actions(self.menu, self.get_menu_actions())
+        self.menu.popup(event.globalPos())
+
+    @Slot(QModelIndex)
+    def activated_index(self, index):
+        """Go to the match of `index` in the editor."""
+        match = self.results_model.get_match(index)
+        if match is not None:
+            filename, lineno, colno = match
             self.sig_edit_goto.emit(filename, lineno, self.search_text)
 
+    def set_title(self, title):
+        self.results_model.set_title(title)
+
     def set_sorting(self, flag):
         """Enable result sorting after search is complete."""
         self.sorting['status'] = flag
@@ -983,58 +1257,47 @@ class ResultsBrowser(OneColumnTree):
     def sort_section(self, idx):
         self.setSortingEnabled(True)
 
-    def clicked(self, item):
-        """Click event."""
-        self.activated(item)
-
     def clear_title(self, search_text):
-        self.font = get_font()
-        self.clear()
         self.setSortingEnabled(False)
-        self.num_files = 0
-        self.data = {}
-        self.files = {}
+        self.results_model.clear()
         self.set_sorting(OFF)
         self.search_text = search_text
         title = "'%s' - " % search_text
         text = _('String not found')
         self.set_title(title + text)
 
+    def is_max_results_reached(self):
+        """Return True if the maximum number of results was reached."""
+        return (self.max_results > 0 and
+                self.results_model.get_num_matches() >= self.max_results)
+
     @Slot(object)
     def append_file_result(self, filename):
         """Real-time update of file items."""
-        if len(self.data) < self.max_results:
-            self.files[filename] = FileMatchItem(
-                self, filename, self.sorting, self.text_color)
-            self.files[filename].setExpanded(True)
-            self.num_files += 1
+        if not self.is_max_results_reached():
+            index = self.results_model.add_file(filename)
+            self.setExpanded(index, True)
 
     @Slot(object, object)
     def append_result(self, items, title):
         """Real-time update of line items."""
-        if len(self.data) >= self.max_results:
+        if self.is_max_results_reached():
             self.set_title(_('Maximum number of results reached! Try '
                              'narrowing the search.'))
             self.sig_max_results_reached.emit()
             return
 
-        available = self.max_results - len(self.data)
-        if available < len(items):
-            items = items[:available]
+        if self.max_results > 0:
+            available = (self.max_results -
+                         self.results_model.get_num_matches())
+            if available < len(items):
+                items = items[:available]
 
-        self.setUpdatesEnabled(False)
         self.set_title(title)
-        for item in items:
-            filename, lineno, colno, line = item
-            file_item = self.files.get(filename, None)
-            if file_item:
-                item = LineMatchItem(file_item, lineno, colno, line,
-                                     self.font, self.text_color)
-                self.data[id(item)] = (filename, lineno, colno)
-        self.setUpdatesEnabled(True)
+        self.results_model.add_matches(items)
 
     def set_max_results(self, value):
-        """Set maximum amount of results to add."""
+        """Set maximum amount of results to add (0 means no limit)."""
         self.max_results = value
 
 
@@ -1096,11 +1359,17 @@ class FindInFilesWidget(QWidget):
                  search_in_index=0,
                  options_button=None,
                  text_color=None,
-                 max_results=1000):
+                 max_results=0,
+                 processes=0,
+                 use_ignore_files=True):
         QWidget.__init__(self, parent)
 
         self.search_thread = None
         self.text_color = text_color
+        self.processes = processes
+        self.use_ignore_files = use_ignore_files
+        self.project_index = None
+        self.index_thread = None
 
         # Widgets
         self.status_bar = FileProgressBar(self)
@@ -1155,7 +1424,9 @@ class FindInFilesWidget(QWidget):
         if options is None:
             return
         self.stop_and_reset_thread(ignore_results=True)
-        self.search_thread = SearchThread(self, search_text, self.text_color)
+        self.search_thread = SearchThread(
+            self, search_text, self.text_color, processes=self.processes,
+            index=self.project_index, use_ignore_files=self.use_ignore_files)
         self.search_thread.sig_finished.connect(self.search_complete)
         self.search_thread.sig_current_file.connect(
             lambda x: self.status_bar.set_label_path(x, folder=False)
@@ -1197,13 +1468,13 @@ class FindInFilesWidget(QWidget):
     def closing_widget(self):
         """Perform actions before widget is closed"""
         self.stop_and_reset_thread(ignore_results=True)
+        self.set_project_index(None)
 
     def search_complete(self, completed):
         """Current search thread has finished"""
         self.result_browser.set_sorting(ON)
         self.find_options.ok_button.setEnabled(True)
         self.status_bar.hide()
-        self.result_browser.expandAll()
         if self.search_thread is None:
             return
         self.sig_finished.emit()
@@ -1217,6 +1488,29 @@ class FindInFilesWidget(QWidget):
         """Set maximum amount of results to add to result browser."""
         self.result_browser.set_max_results(value)
 
+    def set_project_index(self, index):
+        """
+        Set the trigram index used to narrow the files to search.
+
+        The index is loaded and kept up to date in a thread. The previous
+        one, if any, is saved.
+        """
+        if self.index_thread is not None:
+            self.index_thread.stop()
+            self.index_thread.wait()
+            self.index_thread = None
+        if self.project_index is not None:
+            self.project_index.save()
+        self.project_index = index
+        if index is not None:
+            self.index_thread = IndexThread(self, index)
+            self.index_thread.start()
+
+    def update_project_index(self, changes):
+        """Index the files of a list of (path, kind) changes in a thread."""
+        if self.index_thread is not None:
+            self.index_thread.add_paths(path for path, kind in changes)
+
 
 def test():
     """Run Find in Files widget test"""
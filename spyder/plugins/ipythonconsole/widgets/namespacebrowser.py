@@ -49,6 +49,10 @@ class NamepaceBrowserWidget(RichJupyterWidget):
     _kernel_value = None
     _kernel_is_starting = True
 
+    # Whether the kernel can send DataFrames by windows (None until it's
+    # asked for the first time)
+    _kernel_has_dataframe_windows = None
+
     # --- Public API --------------------------------------------------
     def set_namespacebrowser(self, namespacebrowser):
         """Set namespace browser widget"""
@@ -103,6 +107,69 @@ class NamepaceBrowserWidget(RichJupyterWidget):
         except UnpicklingError:
             raise ValueError(msg % reason_not_picklable)
 
+    def get_dataframe_info(self, name):
+        """
+        Ask kernel for the shape, dtypes and column statistics of a
+        DataFrame or Series, without its data.
+
+        Return None if the kernel can't send DataFrames by windows, which
+        is only checked the first time.
+        """
+        if self._kernel_has_dataframe_windows is False:
+            return None
+        try:
+            info = self._call_dataframe_method('get_dataframe_info', name)
+        except ValueError:
+            raise
+        except Exception as error:
+            # Kernels with an older version of spyder-kernels don't have
+            # this method
+            logger.debug("The kernel can't send DataFrames by windows: "
+                         "{}".format(error))
+            self._kernel_has_dataframe_windows = False
+            return None
+        self._kernel_has_dataframe_windows = True
+        return info
+
+    def get_dataframe_window(self, name, rows, columns):
+        """
+        Ask kernel for the window of a DataFrame or Series given by the
+        (start, stop) pairs `rows` and `columns`.
+        """
+        return self._call_dataframe_method('get_dataframe_window', name,
+                                           rows, columns)
+
+    def sort_filter_dataframe(self, name, column, ascending, filters,
+                              callback):
+        """
+        Ask kernel to sort and/or filter the rows of a DataFrame or Series.
+
+        The kernel keeps the resulting order of the rows, which is used by
+        `get_dataframe_window`, and passes the number of rows shown to
+        `callback`.
+        """
+        self.call_kernel(
+            interrupt=True,
+            callback=callback).sort_filter_dataframe(name, column, ascending,
+                                                     filters)
+
+    def _call_dataframe_method(self, method, *args):
+        """Call a kernel method that returns (part of) a DataFrame."""
+        reason_big = _("The variable is too big to be retrieved")
+        reason_not_picklable = _("The variable is not picklable")
+        msg = _("%s.<br><br>"
+                "Note: Please don't report this problem on Github, "
+                "there's nothing to do about it.")
+        try:
+            return getattr(self.call_kernel(
+                interrupt=True,
+                blocking=True,
+                timeout=CALL_KERNEL_TIMEOUT), method)(*args)
+        except TimeoutError:
+            raise ValueError(msg % reason_big)
+        except UnpicklingError:
+            raise ValueError(msg % reason_not_picklable)
+
     def set_value(self, name, value):
         """Set value for a variable"""
         self.call_kernel(interrupt=True, blocking=False
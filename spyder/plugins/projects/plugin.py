@@ -34,8 +34,7 @@ from spyder.plugins.projects.utils.watcher import WorkspaceWatcher
 from spyder.plugins.projects.widgets.explorer import ProjectExplorerWidget
 from spyder.plugins.projects.widgets.projectdialog import ProjectDialog
 from spyder.plugins.projects.projecttypes import EmptyProject
-from spyder.plugins.completion.languageserver import (
-    LSPRequestTypes, FileChangeType)
+from spyder.plugins.completion.languageserver import LSPRequestTypes
 from spyder.plugins.completion.decorators import (
     request, handles, class_register)
 
@@ -51,6 +50,10 @@ class Projects(SpyderPluginWidget):
     sig_project_loaded = Signal(object)
     sig_project_closed = Signal(object)
 
+    #: Signal emitted with a list of (path, kind) changes of the files in the
+    #  active project, where kind is one of :class:`FileChangeType`
+    sig_file_changes = Signal(list)
+
     def __init__(self, parent=None):
         """Initialization."""
         SpyderPluginWidget.__init__(self, parent)
@@ -533,76 +536,19 @@ class Projects(SpyderPluginWidget):
             handler = getattr(self, handler_name)
             handler(params)
 
-    @Slot(str, str, bool)
-    @request(method=LSPRequestTypes.WORKSPACE_WATCHED_FILES_UPDATE,
-             requires_response=False)
-    def file_moved(self, src_file, dest_file, is_dir):
-        """Notify LSP server about a file that is moved."""
-        # LSP specification only considers file updates
-        if is_dir:
-            return
-
-        deletion_entry = {
-            'file': src_file,
-            'kind': FileChangeType.DELETED
-        }
-
-        addition_entry = {
-            'file': dest_file,
-            'kind': FileChangeType.CREATED
-        }
-
-        entries = [addition_entry, deletion_entry]
-        params = {
-            'params': entries
-        }
-        return params
-
+    @Slot(list)
     @request(method=LSPRequestTypes.WORKSPACE_WATCHED_FILES_UPDATE,
              requires_response=False)
-    @Slot(str, bool)
-    def file_created(self, src_file, is_dir):
-        """Notify LSP server about file creation."""
-        if is_dir:
-            return
-
-        params = {
-            'params': [{
-                'file': src_file,
-                'kind': FileChangeType.CREATED
-            }]
-        }
-        return params
-
-    @request(method=LSPRequestTypes.WORKSPACE_WATCHED_FILES_UPDATE,
-             requires_response=False)
-    @Slot(str, bool)
-    def file_deleted(self, src_file, is_dir):
-        """Notify LSP server about file deletion."""
-        if is_dir:
-            return
-
-        params = {
-            'params': [{
-                'file': src_file,
-                'kind': FileChangeType.DELETED
-            }]
-        }
-        return params
-
-    @request(method=LSPRequestTypes.WORKSPACE_WATCHED_FILES_UPDATE,
-             requires_response=False)
-    @Slot(str, bool)
-    def file_modified(self, src_file, is_dir):
-        """Notify LSP server about file modification."""
-        if is_dir:
-            return
+    def notify_file_changes(self, changes):
+        """
+        Notify LSP servers about a batch of file changes.
 
+        `changes` is a list of (path, kind) tuples, as buffered by the
+        workspace watcher.
+        """
         params = {
-            'params': [{
-                'file': src_file,
-                'kind': FileChangeType.CHANGED
-            }]
+            'params': [{'file': path, 'kind': kind}
+                       for path, kind in changes]
         }
         return params
 
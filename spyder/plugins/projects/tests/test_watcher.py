@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Tests for the workspace watcher.
+"""
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.completion.languageserver import FileChangeType
+from spyder.plugins.projects.utils.watcher import FileChangesBuffer
+
+
+CREATED = FileChangeType.CREATED
+CHANGED = FileChangeType.CHANGED
+DELETED = FileChangeType.DELETED
+
+
+def test_file_changes_buffer():
+    """Test that successive changes of a file are merged."""
+    changes = FileChangesBuffer()
+    for path, kind in [('spam.py', CREATED), ('spam.py', CHANGED),
+                       ('eggs.py', CHANGED), ('eggs.py', CHANGED),
+                       ('ham.py', CREATED), ('ham.py', DELETED),
+                       ('bacon.py', DELETED), ('bacon.py', CREATED),
+                       ('eggs.py', DELETED)]:
+        changes.add(path, kind)
+    assert len(changes) == 3
+    assert changes.take() == [('spam.py', CREATED), ('bacon.py', CHANGED),
+                              ('eggs.py', DELETED)]
+    assert changes.take() == []
+
+    changes.add('ham.py', CREATED)
+    assert changes.take() == [('ham.py', CREATED)]
+
+
+if __name__ == "__main__":
+    pytest.main()
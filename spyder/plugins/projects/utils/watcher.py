@@ -7,10 +7,11 @@
 """Watcher to detect filesystem changes in the project's directory."""
 
 # Standard lib imports
+from collections import OrderedDict
 import logging
 
 # Third-party imports
-from qtpy.QtCore import QObject, Signal
+from qtpy.QtCore import QObject, QTimer, Signal, Slot
 from qtpy.QtWidgets import QMessageBox
 
 from watchdog.observers import Observer
@@ -18,6 +19,7 @@ from watchdog.events import FileSystemEventHandler
 
 # Local imports
 from spyder.config.base import _
+from spyder.plugins.completion.languageserver import FileChangeType
 from spyder.py3compat import to_text_string
 
 logger = logging.getLogger(__name__)
@@ -73,23 +75,134 @@ class WorkspaceEventHandler(QObject, FileSystemEventHandler):
         self.sig_file_modified.emit(src_path, is_dir)
 
 
+class FileChangesBuffer(object):
+    """
+    Buffer of file changes, keeping a single change per file.
+
+    Successive changes of a file are merged into the one that describes
+    them from the point of view of someone who only saw the file before and
+    after all of them, e.g. a file created and then deleted has no change
+    at all.
+    """
+
+    # Merged kind for each (previous kind, new kind) pair, None meaning that
+    # the file didn't change
+    MERGED_KINDS = {
+        (FileChangeType.CREATED, FileChangeType.CHANGED):
+            FileChangeType.CREATED,
+        (FileChangeType.CREATED, FileChangeType.DELETED): None,
+        (FileChangeType.CHANGED, FileChangeType.CREATED):
+            FileChangeType.CHANGED,
+        (FileChangeType.CHANGED, FileChangeType.DELETED):
+            FileChangeType.DELETED,
+        (FileChangeType.DELETED, FileChangeType.CREATED):
+            FileChangeType.CHANGED,
+        (FileChangeType.DELETED, FileChangeType.CHANGED):
+            FileChangeType.CHANGED,
+    }
+
+    def __init__(self):
+        self.changes = OrderedDict()
+
+    def __len__(self):
+        return len(self.changes)
+
+    def add(self, path, kind):
+        """Add a change of `kind`, a `FileChangeType`, to `path`."""
+        previous_kind = self.changes.pop(path, None)
+        if previous_kind is not None:
+            kind = self.MERGED_KINDS.get((previous_kind, kind), kind)
+        if kind is not None:
+            self.changes[path] = kind
+
+    def take(self):
+        """Return the list of (path, kind) changes and clear the buffer."""
+        changes = list(self.changes.items())
+        self.changes.clear()
+        return changes
+
+
 class WorkspaceWatcher(QObject):
     """
     Wrapper class around watchdog observer and notifier.
 
     It provides methods to start and stop watching folders.
+
+    Changes of files are buffered for a short time and reported together,
+    so that operations changing many files at once, like switching
+    branches, don't produce a flood of notifications.
     """
 
+    # Time to buffer file changes before reporting them (in ms)
+    CHANGES_DELAY = 300
+
+    #: Signal emitted with a list of (path, kind) file changes, where kind
+    #  is one of :class:`FileChangeType`
+    sig_file_changes = Signal(list)
+
     def __init__(self, parent=None):
         super(QObject, self).__init__(parent)
         self.observer = None
         self.event_handler = WorkspaceEventHandler(self)
 
+        self.file_changes = FileChangesBuffer()
+        self.changes_timer = QTimer(self)
+        self.changes_timer.setSingleShot(True)
+        self.changes_timer.setInterval(self.CHANGES_DELAY)
+        self.changes_timer.timeout.connect(self.send_file_changes)
+
+        self.event_handler.sig_file_created.connect(self.file_created)
+        self.event_handler.sig_file_moved.connect(self.file_moved)
+        self.event_handler.sig_file_deleted.connect(self.file_deleted)
+        self.event_handler.sig_file_modified.connect(self.file_modified)
+
     def connect_signals(self, project):
-        self.event_handler.sig_file_created.connect(project.file_created)
-        self.event_handler.sig_file_moved.connect(project.file_moved)
-        self.event_handler.sig_file_deleted.connect(project.file_deleted)
-        self.event_handler.sig_file_modified.connect(project.file_modified)
+        self.sig_file_changes.connect(project.notify_file_changes)
+        self.sig_file_changes.connect(project.sig_file_changes)
+
+    def add_file_change(self, path, kind):
+        """Buffer a file change, to be sent with the following ones."""
+        self.file_changes.add(path, kind)
+        # The timer is not restarted, so that changes are reported even if
+        # files keep changing
+        if not self.changes_timer.isActive():
+            self.changes_timer.start()
+
+    @Slot()
+    def send_file_changes(self):
+        """Report the buffered file changes."""
+        self.changes_timer.stop()
+        changes = self.file_changes.take()
+        if changes:
+            self.sig_file_changes.emit(changes)
+
+    def clear_file_changes(self):
+        """Forget the buffered file changes."""
+        self.changes_timer.stop()
+        self.file_changes.take()
+
+    # LSP specification only considers file updates, so changes of
+    # directories are not reported
+    @Slot(str, str, bool)
+    def file_moved(self, src_file, dest_file, is_dir):
+        if not is_dir:
+            self.add_file_change(src_file, FileChangeType.DELETED)
+            self.add_file_change(dest_file, FileChangeType.CREATED)
+
+    @Slot(str, bool)
+    def file_created(self, src_file, is_dir):
+        if not is_dir:
+            self.add_file_change(src_file, FileChangeType.CREATED)
+
+    @Slot(str, bool)
+    def file_deleted(self, src_file, is_dir):
+        if not is_dir:
+            self.add_file_change(src_file, FileChangeType.DELETED)
+
+    @Slot(str, bool)
+    def file_modified(self, src_file, is_dir):
+        if not is_dir:
+            self.add_file_change(src_file, FileChangeType.CHANGED)
 
     def start(self, workspace_folder):
         # Needed to handle an error caused by the inotify limit reached.
@@ -130,3 +243,4 @@ class WorkspaceWatcher(QObject):
             self.observer.stop()
             self.observer.join()
             del self.observer
+        self.clear_file_changes()
@@ -15,6 +15,7 @@ NumPy Array Editor Dialog based on Qt
 
 # Standard library imports
 from __future__ import print_function
+from collections import OrderedDict
 
 # Third party imports
 import numpy as np
@@ -120,6 +121,7 @@ class ArrayModel(QAbstractTableModel):
 
     ROWS_TO_LOAD = 500
     COLS_TO_LOAD = 40
+    CHUNKS_TO_KEEP = 16
 
     def __init__(self, data, format="%.6g", xlabels=None, ylabels=None,
                  readonly=False, parent=None):
@@ -147,6 +149,7 @@ class ArrayModel(QAbstractTableModel):
 
         self._data = data
         self._format = format
+        self._texts = OrderedDict()
 
         self.total_rows = self._data.shape[0]
         self.total_cols = self._data.shape[1]
@@ -198,6 +201,7 @@ class ArrayModel(QAbstractTableModel):
     def set_format(self, format):
         """Change display format"""
         self._format = format
+        self._texts.clear()
         self.reset()
 
     def columnCount(self, qindex=QModelIndex()):
@@ -256,10 +260,53 @@ class ArrayModel(QAbstractTableModel):
             value = self._data[i, j]
         return self.changes.get((i, j), value)
 
+    def _format_block(self, block):
+        """Format a block of the array at once."""
+        values = np.ma.getdata(block)
+        if values.dtype.kind == 'S':
+            values = np.char.decode(values, 'utf8')
+        texts = np.char.mod(self._format, values).astype(object)
+        if np.ma.is_masked(block):
+            texts[np.ma.getmaskarray(block)] = ''
+        return texts
+
+    def get_text(self, i, j):
+        """
+        Return the text to display for the cell (i, j).
+
+        Cells are formatted by chunks of ROWS_TO_LOAD x COLS_TO_LOAD, the
+        first time one of them is displayed. None is returned for cells that
+        can't be formatted that way.
+        """
+        if (self._data.ndim != 2 or (i, j) in self.changes or
+                self._data.dtype.kind not in 'biufcSU'):
+            return None
+        key = (i // self.ROWS_TO_LOAD, j // self.COLS_TO_LOAD)
+        row_start = key[0] * self.ROWS_TO_LOAD
+        col_start = key[1] * self.COLS_TO_LOAD
+        texts = self._texts.get(key)
+        if texts is None:
+            block = self._data[row_start:row_start + self.ROWS_TO_LOAD,
+                               col_start:col_start + self.COLS_TO_LOAD]
+            try:
+                texts = self._format_block(block)
+            except (TypeError, ValueError):
+                texts = False
+            if len(self._texts) >= self.CHUNKS_TO_KEEP:
+                self._texts.popitem(last=False)
+            self._texts[key] = texts
+        if texts is False:
+            return None
+        return texts[i - row_start, j - col_start]
+
     def data(self, index, role=Qt.DisplayRole):
         """Cell content."""
         if not index.isValid():
             return to_qvariant()
+        if role == Qt.DisplayRole:
+            text = self.get_text(index.row(), index.column())
+            if text is not None:
+                return to_qvariant(text)
         value = self.get_value(index)
         dtn = self._data.dtype.name
 
@@ -93,11 +93,23 @@ class CollectionsDelegate(QItemDelegate):
 
         return False
 
+    def open_remote_dataframe(self, parent, index):
+        """
+        Show a big DataFrame without getting its whole value.
+
+        Return True if an editor was opened. Only remote delegates can do
+        this.
+        """
+        return False
+
     def createEditor(self, parent, option, index, object_explorer=False):
         """Overriding method createEditor"""
         if index.column() < 3:
             return None
         if self.show_warning(index):
+            if (not object_explorer and
+                    self.open_remote_dataframe(parent, index)):
+                return None
             answer = QMessageBox.warning(
                 self.parent(), _("Warning"),
                 _("Opening this variable can be slow\n\n"
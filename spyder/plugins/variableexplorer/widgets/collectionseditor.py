@@ -21,6 +21,7 @@ Collections (i.e. dictionary, list, set and tuple) editor widget and dialog.
 # Standard library imports
 from __future__ import print_function
 import datetime
+import functools
 import re
 import sys
 import warnings
@@ -1392,6 +1393,40 @@ class RemoteCollectionsDelegate(CollectionsDelegate):
             name = source_index.model().keys[source_index.row()]
             self.parent().new_value(name, value)
 
+    def open_remote_dataframe(self, parent, index):
+        """
+        Show a DataFrame or Series without getting its value.
+
+        Only the rows and columns that are displayed are requested to the
+        kernel. Return False if the kernel can't do that, so its value is
+        retrieved as usual.
+        """
+        source_index = index.model().mapToSource(index)
+        name = source_index.model().keys[source_index.row()]
+        table = self.parent()
+        if not (table.is_data_frame(name) or table.is_series(name)):
+            return False
+        try:
+            info = table.get_dataframe_info(name)
+        except ValueError:
+            return False
+        if info is None:
+            return False
+
+        from spyder.plugins.variableexplorer.widgets.dataframeeditor import (
+            DataFrameEditor)
+        get_window = functools.partial(table.get_dataframe_window, name)
+        sort_filter = functools.partial(table.sort_filter_dataframe, name)
+        editor = DataFrameEditor(parent=parent)
+        if not editor.setup_and_check_remote(info, get_window, sort_filter,
+                                             title=name):
+            return False
+        editor.dataModel.set_format(index.model().dataframe_format)
+        editor.sig_option_changed.connect(self.change_option)
+        self.create_dialog(editor, dict(model=index.model(), editor=editor,
+                                        key=name, readonly=True))
+        return True
+
 
 class RemoteCollectionsEditorTableView(BaseTableView):
     """DictEditor table view"""
@@ -1443,6 +1478,24 @@ class RemoteCollectionsEditorTableView(BaseTableView):
         self.shellwidget._kernel_value = None
         return value
 
+    def get_dataframe_info(self, name):
+        """Get the shape, dtypes and statistics of a DataFrame"""
+        info = self.shellwidget.get_dataframe_info(name)
+        self.shellwidget._kernel_value = None
+        return info
+
+    def get_dataframe_window(self, name, rows, columns):
+        """Get a window of the rows and columns of a DataFrame"""
+        window = self.shellwidget.get_dataframe_window(name, rows, columns)
+        self.shellwidget._kernel_value = None
+        return window
+
+    def sort_filter_dataframe(self, name, column, ascending, filters,
+                              callback):
+        """Sort and/or filter the rows of a DataFrame in the kernel"""
+        self.shellwidget.sort_filter_dataframe(name, column, ascending,
+                                               filters, callback)
+
     def new_value(self, name, value):
         """Create new value in data"""
         try:
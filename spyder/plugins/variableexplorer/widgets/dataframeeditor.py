@@ -33,18 +33,19 @@ Components of gtabview from gtabview/viewer.py and gtabview/models.py of the
 """
 
 # Standard library imports
+from collections import OrderedDict
 
 # Third party imports
 from qtpy.compat import from_qvariant, to_qvariant
 from qtpy.QtCore import (QAbstractTableModel, QModelIndex, Qt, Signal, Slot,
-                         QItemSelectionModel, QEvent)
+                         QItemSelectionModel, QEvent, QTimer)
 from qtpy.QtGui import QColor, QCursor
-from qtpy.QtWidgets import (QApplication, QCheckBox, QDialog, QGridLayout,
-                            QHBoxLayout, QInputDialog, QLineEdit, QMenu,
-                            QMessageBox, QPushButton, QTableView,
-                            QScrollBar, QTableWidget, QFrame,
+from qtpy.QtWidgets import (QApplication, QCheckBox, QComboBox, QDialog,
+                            QGridLayout, QHBoxLayout, QInputDialog, QLabel,
+                            QLineEdit, QMenu, QMessageBox, QPushButton,
+                            QTableView, QScrollBar, QTableWidget, QFrame,
                             QItemDelegate)
-from pandas import DataFrame, Index, Series, isna
+from pandas import DataFrame, Index, MultiIndex, Series
 try:
     from pandas._libs.tslib import OutOfBoundsDatetime
 except ImportError:  # For pandas version < 0.20
@@ -61,6 +62,7 @@ from spyder.py3compat import (io, is_text_string, is_type_text_string, PY2,
 from spyder.utils import icon_manager as ima
 from spyder.utils.qthelpers import (add_actions, create_action,
                                     keybinding, qapplication)
+from spyder.utils.workers import WorkerManager
 from spyder.plugins.variableexplorer.widgets.arrayeditor import get_idx_rect
 
 # Supported Numbers and complex numbers
@@ -72,12 +74,20 @@ _bool_false = ['false', 'f', '0', '0.', '0.0', ' ']
 # Default format for data frames with floats
 DEFAULT_FORMAT = '%.6g'
 
-# Limit at which dataframe is considered so large that it is loaded on demand
-LARGE_SIZE = 5e5
-LARGE_NROWS = 1e5
-LARGE_COLS = 60
+# Size of the chunks of rows and columns fetched when they are displayed and
+# number of chunks kept in memory
 ROWS_TO_LOAD = 500
 COLS_TO_LOAD = 40
+CHUNKS_TO_KEEP = 16
+
+# Number of rows above which dataframes are sorted and filtered in a thread
+LARGE_NROWS = 1e5
+
+# Time to wait for more changes in the filter text before applying it (ms)
+FILTER_DELAY = 300
+
+# Text shown for the values that couldn't be requested to the kernel
+PLACEHOLDER_TEXT = '?'
 
 # Background colours
 BACKGROUND_NUMBER_MINHUE = 0.66 # hue for largest number
@@ -109,6 +119,57 @@ def global_max(col_vals, index):
     return max(max_col), min(min_col)
 
 
+def sort_rows(df, rows, column, ascending=True):
+    """
+    Sort the rows of a dataframe by a column, without changing it.
+
+    `rows` are the positions of the rows in their current order (None
+    for all of them in their original order). `column` is the position of
+    a column, or -1 to sort by the index. The sort is stable, so rows with
+    the same value keep their current order. Return the sorted positions.
+    """
+    if rows is None:
+        rows = np.arange(len(df))
+    if column >= 0:
+        keys = df.iloc[rows, column]
+    else:
+        keys = df.index[rows].to_series()
+    keys = keys.reset_index(drop=True)
+    order = keys.sort_values(ascending=ascending, kind='mergesort').index
+    return rows[order.values]
+
+
+def get_filter_mask(df, filters):
+    """
+    Return which rows of a dataframe pass the given filters.
+
+    `filters` maps positions of columns to a text that has to be contained
+    in their values, ignoring the case.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for column, text in filters.items():
+        values = df.iloc[:, column].astype(str)
+        mask &= values.str.contains(text, case=False, regex=False).values
+    return mask
+
+
+def sort_filter_rows(df, order, sorts, filters):
+    """
+    Sort and filter the rows of a dataframe, without changing it.
+
+    `order` are the positions of the rows in their current order (None for
+    the original order), which are sorted by each (column, ascending) pair
+    of `sorts` in turn. `filters` are passed to get_filter_mask, or are None
+    to not compute a mask. Return the new order and mask.
+    """
+    for column, ascending in sorts:
+        order = sort_rows(df, order, column, ascending)
+    mask = None
+    if filters:
+        mask = get_filter_mask(df, filters)
+    return order, mask
+
+
 class DataFrameModel(QAbstractTableModel):
     """ DataFrame Table Model.
 
@@ -117,47 +178,47 @@ class DataFrameModel(QAbstractTableModel):
 
     For more information please see:
     https://github.com/wavexx/gtabview/blob/master/gtabview/models.py
+
+    Signals
+    -------
+    sig_rows_changed(): Raised after the rows are sorted or filtered.
     """
+    sig_rows_changed = Signal()
 
     def __init__(self, dataFrame, format=DEFAULT_FORMAT, parent=None):
         QAbstractTableModel.__init__(self)
         self.dialog = parent
         self.df = dataFrame
-        self.df_index = dataFrame.index.tolist()
-        self.df_header = dataFrame.columns.tolist()
         self._format = format
         self.complex_intran = None
         self.display_error_idxs = []
-
-        self.total_rows = self.df.shape[0]
-        self.total_cols = self.df.shape[1]
-        size = self.total_rows * self.total_cols
+        self._chunks = OrderedDict()
+        self._labels = OrderedDict()
+
+        # Rows are sorted and filtered through the positions of the rows
+        # shown, instead of changing the dataframe
+        self._order = None
+        self._mask = None
+        self._rows = None
+        self._filters = {}
+        self.sorted_by = None
+
+        # Sorts and filters requested while a job is running are applied by
+        # a single job that replaces it
+        self._sorts = []
+        self._new_filters = None
+        self._job = 0
+        self._job_running = False
+        self._worker_manager = WorkerManager(max_threads=1)
+
+        self.total_rows = self.shape[0]
+        self.total_cols = self.shape[1]
 
         self.max_min_col = None
-        if size < LARGE_SIZE:
-            self.max_min_col_update()
-            self.colum_avg_enabled = True
-            self.bgcolor_enabled = True
-            self.colum_avg(1)
-        else:
-            self.colum_avg_enabled = False
-            self.bgcolor_enabled = False
-            self.colum_avg(0)
-
-        # Use paging when the total size, number of rows or number of
-        # columns is too large
-        if size > LARGE_SIZE:
-            self.rows_loaded = ROWS_TO_LOAD
-            self.cols_loaded = COLS_TO_LOAD
-        else:
-            if self.total_rows > LARGE_NROWS:
-                self.rows_loaded = ROWS_TO_LOAD
-            else:
-                self.rows_loaded = self.total_rows
-            if self.total_cols > LARGE_COLS:
-                self.cols_loaded = COLS_TO_LOAD
-            else:
-                self.cols_loaded = self.total_cols
+        self.max_min_col_update()
+        self.colum_avg_enabled = True
+        self.bgcolor_enabled = True
+        self.colum_avg(1)
 
     def _axis(self, axis):
         """
@@ -191,6 +252,38 @@ class DataFrameModel(QAbstractTableModel):
         """Return the max value of the dimensions of the dataframe."""
         return max(*self.shape())
 
+    def fetch_labels(self, axis, start, stop):
+        """
+        Return the labels of the columns (0) or rows (1) from start to stop.
+
+        Rows are counted after sorting and filtering them.
+        """
+        if axis == 0:
+            return self.df.columns[start:stop]
+        if self._rows is None:
+            return self.df.index[start:stop]
+        return self.df.index[self._rows[start:stop]]
+
+    def _get_labels(self, axis, x):
+        """
+        Return the chunk of labels of the given axis that contains x.
+
+        Labels are sliced from the columns or index of the dataframe a chunk
+        at a time, the first time one of them is displayed, so all of them
+        are never converted at once. The position where the chunk starts is
+        returned with it.
+        """
+        size = COLS_TO_LOAD if axis == 0 else ROWS_TO_LOAD
+        key = (axis, x // size)
+        start = key[1] * size
+        labels = self._labels.get(key)
+        if labels is None:
+            labels = self.fetch_labels(axis, start, start + size).values
+            if len(self._labels) >= CHUNKS_TO_KEEP:
+                self._labels.popitem(last=False)
+            self._labels[key] = labels
+        return labels, start
+
     def header(self, axis, x, level=0):
         """
         Return the values of the labels for the header of columns or rows.
@@ -198,9 +291,10 @@ class DataFrameModel(QAbstractTableModel):
         The value corresponds to the header of column or row x in the
         given level.
         """
-        ax = self._axis(axis)
-        return ax.values[x] if not hasattr(ax, 'levels') \
-            else ax.values[x][level]
+        labels, start = self._get_labels(axis, x)
+        value = labels[x - start]
+        return value if not hasattr(self._axis(axis), 'levels') \
+            else value[level]
 
     def name(self, axis, level):
         """Return the labels of the levels if any."""
@@ -225,22 +319,32 @@ class DataFrameModel(QAbstractTableModel):
         """
         if self.df.shape[0] == 0: # If no rows to compute max/min then return
             return
-        self.max_min_col = []
-        for dummy, col in self.df.iteritems():
-            if col.dtype in REAL_NUMBER_TYPES + COMPLEX_NUMBER_TYPES:
-                if col.dtype in REAL_NUMBER_TYPES:
-                    vmax = col.max(skipna=True)
-                    vmin = col.min(skipna=True)
-                else:
-                    vmax = col.abs().max(skipna=True)
-                    vmin = col.abs().min(skipna=True)
-                if vmax != vmin:
-                    max_min = [vmax, vmin]
-                else:
-                    max_min = [vmax, vmin - 1]
+        self.max_min_col = [None] * self.df.shape[1]
+        self._update_max_min_col(range(self.df.shape[1]))
+
+    def _update_max_min_col(self, columns):
+        """
+        Update the maximum and minimum of the given columns.
+
+        Columns are reduced one at a time from the dataframe, so at most a
+        single column is copied (i.e. for the absolute values of complex
+        numbers) instead of all the columns with the same dtype.
+        """
+        dtypes = self.df.dtypes
+        for column in columns:
+            dtype = dtypes.iloc[column]
+            if dtype not in REAL_NUMBER_TYPES + COMPLEX_NUMBER_TYPES:
+                self.max_min_col[column] = None
+                continue
+            values = self.df.iloc[:, column]
+            if dtype in COMPLEX_NUMBER_TYPES:
+                values = values.abs()
+            vmax = values.max(skipna=True)
+            vmin = values.min(skipna=True)
+            if vmax != vmin:
+                self.max_min_col[column] = [vmax, vmin]
             else:
-                max_min = None
-            self.max_min_col.append(max_min)
+                self.max_min_col[column] = [vmax, vmin - 1]
 
     def get_format(self):
         """Return current format"""
@@ -250,6 +354,7 @@ class DataFrameModel(QAbstractTableModel):
     def set_format(self, format):
         """Change display format"""
         self._format = format
+        self.clear_chunks('texts')
         self.reset()
 
     def bgcolor(self, state):
@@ -264,51 +369,170 @@ class DataFrameModel(QAbstractTableModel):
             self.return_max = lambda col_vals, index: col_vals[index]
         else:
             self.return_max = global_max
+        self.clear_chunks('hues')
         self.reset()
 
+    def _get_hues(self, data, col_start):
+        """
+        Return the hues of the background colors of a chunk of data.
+
+        Hues are computed for whole columns at once and are NaN for the
+        cells that don't have a numeric value.
+        """
+        hues = np.full(data.shape, np.nan)
+        limits = None
+        for col in range(data.shape[1]):
+            if self.max_min_col[col_start + col] is None:
+                continue
+            if self.colum_avg_enabled:
+                vmax, vmin = self.max_min_col[col_start + col]
+            else:
+                if limits is None:
+                    limits = self.return_max(self.max_min_col, col)
+                vmax, vmin = limits
+            values = data.iloc[:, col].values
+            if data.dtypes.iloc[col] in COMPLEX_NUMBER_TYPES:
+                values = np.abs(values)
+            try:
+                values = values.astype(float)
+            except (TypeError, ValueError):
+                continue
+            hues[:, col] = (BACKGROUND_NUMBER_MINHUE +
+                            BACKGROUND_NUMBER_HUERANGE *
+                            (vmax - values) / (vmax - vmin))
+        return np.minimum(np.abs(hues), 1)
+
     def get_bgcolor(self, index):
         """Background color depending on value."""
-        column = index.column()
         if not self.bgcolor_enabled:
             return
-        value = self.get_value(index.row(), column)
-        if self.max_min_col[column] is None or isna(value):
+        row, column = index.row(), index.column()
+        chunk, row_start, col_start = self._get_chunk(row, column)
+        if 'hues' not in chunk:
+            chunk['hues'] = self._get_hues(chunk['data'], col_start)
+        hue = chunk['hues'][row - row_start, column - col_start]
+        if np.isnan(hue):
             color = QColor(BACKGROUND_NONNUMBER_COLOR)
-            if is_text_string(value):
+            if is_text_string(self.get_value(row, column)):
                 color.setAlphaF(BACKGROUND_STRING_ALPHA)
             else:
                 color.setAlphaF(BACKGROUND_MISC_ALPHA)
         else:
-            if isinstance(value, COMPLEX_NUMBER_TYPES):
-                color_func = abs
-            else:
-                color_func = float
-            vmax, vmin = self.return_max(self.max_min_col, column)
-            hue = (BACKGROUND_NUMBER_MINHUE + BACKGROUND_NUMBER_HUERANGE *
-                   (vmax - color_func(value)) / (vmax - vmin))
-            hue = float(abs(hue))
-            if hue > 1:
-                hue = 1
             color = QColor.fromHsvF(hue, BACKGROUND_NUMBER_SATURATION,
                                     BACKGROUND_NUMBER_VALUE,
                                     BACKGROUND_NUMBER_ALPHA)
         return color
 
+    def fetch_window(self, rows, columns):
+        """
+        Return the window of the dataframe given by `rows` and `columns`.
+
+        Both are (start, stop) pairs of positions, where rows are counted
+        after sorting and filtering them.
+        """
+        if self._rows is None:
+            return self.df.iloc[slice(*rows), slice(*columns)]
+        return self.df.iloc[self._rows[slice(*rows)], slice(*columns)]
+
+    def _get_chunk(self, row, column):
+        """
+        Return the chunk of the dataframe that contains the given cell.
+
+        Chunks are fetched when one of their cells is displayed for the first
+        time and only the last CHUNKS_TO_KEEP ones are kept. A chunk is a
+        dict with its 'data', where the values computed from it for display
+        are also saved. The row and column where the chunk starts are
+        returned with it.
+        """
+        key = (row // ROWS_TO_LOAD, column // COLS_TO_LOAD)
+        row_start = key[0] * ROWS_TO_LOAD
+        col_start = key[1] * COLS_TO_LOAD
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            data = self.fetch_window((row_start, row_start + ROWS_TO_LOAD),
+                                     (col_start, col_start + COLS_TO_LOAD))
+            if len(self._chunks) >= CHUNKS_TO_KEEP:
+                self._chunks.popitem(last=False)
+            chunk = self._chunks[key] = {'data': data}
+        return chunk, row_start, col_start
+
+    def clear_chunks(self, name=None):
+        """
+        Forget the chunks of data and labels fetched so far.
+
+        If `name` is given, only forget the values saved with that name in
+        the chunks of data.
+        """
+        if name is None:
+            self._chunks.clear()
+            self._labels.clear()
+        else:
+            for chunk in self._chunks.values():
+                chunk.pop(name, None)
+
     def get_value(self, row, column):
         """Return the value of the DataFrame."""
+        chunk, row_start, col_start = self._get_chunk(row, column)
+        chunk = chunk['data']
+        row -= row_start
+        column -= col_start
         # To increase the performance iat is used but that requires error
         # handling, so fallback uses iloc
         try:
-            value = self.df.iat[row, column]
+            value = chunk.iat[row, column]
         except OutOfBoundsDatetime:
-            value = self.df.iloc[:, column].astype(str).iat[row]
+            value = chunk.iloc[:, column].astype(str).iat[row]
         except:
-            value = self.df.iloc[row, column]
+            value = chunk.iloc[row, column]
         return value
 
-    def update_df_index(self):
-        """"Update the DataFrame index"""
-        self.df_index = self.df.index.tolist()
+    def get_text(self, row, column):
+        """Return the text to display for a value of the DataFrame."""
+        value = self.get_value(row, column)
+        if isinstance(value, float):
+            try:
+                return self._format % value
+            except (ValueError, TypeError):
+                # may happen if format = '%d' and value = NaN;
+                # see spyder-ide/spyder#4139.
+                return DEFAULT_FORMAT % value
+        elif is_type_text_string(value):
+            # Don't perform any conversion on strings
+            # because it leads to differences between
+            # the data present in the dataframe and
+            # what is shown by Spyder
+            return value
+        else:
+            try:
+                return to_text_string(value)
+            except Exception:
+                self.display_error_idxs.append(self.createIndex(row, column))
+                return u'Display Error!'
+
+    def _get_texts(self, data, row_start, col_start):
+        """
+        Return the texts to display for a chunk of data.
+
+        Columns of floats and integers are formatted at once with numpy and
+        the values of the other ones are formatted one by one.
+        """
+        texts = np.empty(data.shape, dtype=object)
+        for col in range(data.shape[1]):
+            dtype = data.dtypes.iloc[col]
+            try:
+                if dtype == np.float64:
+                    texts[:, col] = np.char.mod(self._format,
+                                                data.iloc[:, col].values)
+                    continue
+                elif dtype.kind in 'iub':
+                    texts[:, col] = data.iloc[:, col].values.astype(str)
+                    continue
+            except (ValueError, TypeError):
+                pass
+            for row in range(data.shape[0]):
+                texts[row, col] = self.get_text(row_start + row,
+                                                col_start + col)
+        return texts
 
     def data(self, index, role=Qt.DisplayRole):
         """Cell content"""
@@ -317,26 +541,12 @@ class DataFrameModel(QAbstractTableModel):
         if role == Qt.DisplayRole or role == Qt.EditRole:
             column = index.column()
             row = index.row()
-            value = self.get_value(row, column)
-            if isinstance(value, float):
-                try:
-                    return to_qvariant(self._format % value)
-                except (ValueError, TypeError):
-                    # may happen if format = '%d' and value = NaN;
-                    # see spyder-ide/spyder#4139.
-                    return to_qvariant(DEFAULT_FORMAT % value)
-            elif is_type_text_string(value):
-                # Don't perform any conversion on strings
-                # because it leads to differences between
-                # the data present in the dataframe and
-                # what is shown by Spyder
-                return value
-            else:
-                try:
-                    return to_qvariant(to_text_string(value))
-                except Exception:
-                    self.display_error_idxs.append(index)
-                    return u'Display Error!'
+            chunk, row_start, col_start = self._get_chunk(row, column)
+            if 'texts' not in chunk:
+                chunk['texts'] = self._get_texts(chunk['data'], row_start,
+                                                 col_start)
+            return to_qvariant(
+                chunk['texts'][row - row_start, column - col_start])
         elif role == Qt.BackgroundColorRole:
             return to_qvariant(self.get_bgcolor(index))
         elif role == Qt.FontRole:
@@ -355,52 +565,116 @@ class DataFrameModel(QAbstractTableModel):
                                      "TypeError error: no ordering "
                                      "relation is defined for complex numbers")
                 return False
-        try:
-            ascending = order == Qt.AscendingOrder
-            if column >= 0:
-                try:
-                    self.df.sort_values(by=self.df.columns[column],
-                                        ascending=ascending, inplace=True,
-                                        kind='mergesort')
-                except AttributeError:
-                    # for pandas version < 0.17
-                    self.df.sort(columns=self.df.columns[column],
-                                 ascending=ascending, inplace=True,
-                                 kind='mergesort')
-                except ValueError as e:
-                    # Not possible to sort on duplicate columns
-                    # See spyder-ide/spyder#5225.
-                    QMessageBox.critical(self.dialog, "Error",
-                                         "ValueError: %s" % to_text_string(e))
-                except SystemError as e:
-                    # Not possible to sort on category dtypes
-                    # See spyder-ide/spyder#5361.
-                    QMessageBox.critical(self.dialog, "Error",
-                                         "SystemError: %s" % to_text_string(e))
-                self.update_df_index()
-            else:
-                # To sort by index
-                self.df.sort_index(inplace=True, ascending=ascending)
-                self.update_df_index()
-        except TypeError as e:
-            QMessageBox.critical(self.dialog, "Error",
-                                 "TypeError error: %s" % str(e))
+        # Sorting again by a column makes the previous sort by it useless
+        self._sorts = [(c, a) for (c, a) in self._sorts if c != column]
+        self._sorts.append((column, order == Qt.AscendingOrder))
+        return self._update_rows()
+
+    def set_filters(self, filters):
+        """
+        Only show the rows whose values contain the given texts.
+
+        `filters` maps positions of columns to texts.
+        """
+        self._filters = filters
+        self._new_filters = filters
+        return self._update_rows()
+
+    def _update_rows(self):
+        """
+        Apply the sorts and filters requested since the rows were updated.
+
+        For big dataframes they are applied in a worker thread, so the
+        interface doesn't freeze, and a running job is replaced by a new one
+        that also applies its sorts and filters. The output of replaced jobs
+        is ignored.
+        """
+        self._job += 1
+        job = self._job
+        args = (self.df, self._order, list(self._sorts), self._new_filters)
+        if self.total_rows < LARGE_NROWS:
+            try:
+                output = sort_filter_rows(*args)
+            except Exception as error:
+                return self._set_rows_from_job(job, None, error)
+            return self._set_rows_from_job(job, output, None)
+
+        # The dataframe can't be edited while the worker reads it
+        self._job_running = True
+        worker = self._worker_manager.create_python_worker(
+            self._run_job, job, *args)
+        worker.sig_finished.connect(
+            lambda worker, output, error:
+                self._set_rows_from_job(job, output, error))
+        worker.start()
+        return True
+
+    def _run_job(self, job, *args):
+        """
+        Sort and filter rows in a worker, unless the job was replaced.
+
+        Running workers can't be stopped, so they finish and their output is
+        ignored, but the queued ones of replaced jobs don't do any work.
+        """
+        if job != self._job:
+            return None
+        return sort_filter_rows(*args)
+
+    def _set_rows_from_job(self, job, output, error):
+        """Show the rows sorted and filtered by a job."""
+        if job != self._job:
+            # The job was replaced by a newer one
             return False
+        self._job_running = False
+        sorts, self._sorts = self._sorts, []
+        filters, self._new_filters = self._new_filters, None
+        if error is not None:
+            self._show_error(error)
+            return False
+        order, mask = output
+        if sorts:
+            self._order = order
+            column, ascending = sorts[-1]
+            self.sorted_by = [column, Qt.AscendingOrder if ascending
+                              else Qt.DescendingOrder]
+        if filters is not None:
+            self._mask = mask
+        self._set_rows()
+        return True
 
+    def _set_rows(self):
+        """Update the positions of the rows shown."""
+        rows = self._order
+        if self._mask is not None:
+            if rows is None:
+                rows = np.flatnonzero(self._mask)
+            else:
+                rows = rows[self._mask[rows]]
+        self._rows = rows
+        self.clear_chunks()
         self.reset()
-        return True
+        self.sig_rows_changed.emit()
+
+    def _show_error(self, error):
+        """Show an error raised while sorting or filtering."""
+        QMessageBox.critical(self.dialog, "Error",
+                             "%s: %s" % (type(error).__name__,
+                                         to_text_string(error)))
 
     def flags(self, index):
         """Set flags"""
-        return Qt.ItemFlags(int(QAbstractTableModel.flags(self, index) |
-                                Qt.ItemIsEditable))
+        flags = QAbstractTableModel.flags(self, index)
+        if self._job_running:
+            return flags
+        return Qt.ItemFlags(int(flags | Qt.ItemIsEditable))
 
     def setData(self, index, value, role=Qt.EditRole, change_type=None):
         """Cell content change"""
         column = index.column()
         row = index.row()
+        position = row if self._rows is None else self._rows[row]
 
-        if index in self.display_error_idxs:
+        if index in self.display_error_idxs or self._job_running:
             return False
         if change_type is not None:
             try:
@@ -408,9 +682,9 @@ class DataFrameModel(QAbstractTableModel):
                 val = from_qvariant(value, str)
                 if change_type is bool:
                     val = bool_false_check(val)
-                self.df.iloc[row, column] = change_type(val)
+                self.df.iloc[position, column] = change_type(val)
             except ValueError:
-                self.df.iloc[row, column] = change_type('0')
+                self.df.iloc[position, column] = change_type('0')
         else:
             val = from_qvariant(value, str)
             current_value = self.get_value(row, column)
@@ -420,7 +694,8 @@ class DataFrameModel(QAbstractTableModel):
             if (isinstance(current_value, supported_types) or
                     is_text_string(current_value)):
                 try:
-                    self.df.iloc[row, column] = current_value.__class__(val)
+                    self.df.iloc[position, column] = (
+                        current_value.__class__(val))
                 except (ValueError, OverflowError) as e:
                     QMessageBox.critical(self.dialog, "Error",
                                          str(type(e).__name__) + ": " + str(e))
@@ -430,7 +705,9 @@ class DataFrameModel(QAbstractTableModel):
                                      "Editing dtype {0!s} not yet supported."
                                      .format(type(current_value).__name__))
                 return False
-        self.max_min_col_update()
+        self.clear_chunks()
+        if self.max_min_col is not None:
+            self._update_max_min_col([column])
         self.dataChanged.emit(index, index)
         return True
 
@@ -444,30 +721,12 @@ class DataFrameModel(QAbstractTableModel):
         # tests on Windows/Python 3.7
         # See spyder-ide/spyder#8910.
         try:
-            if self.total_rows <= self.rows_loaded:
+            if self._rows is None:
                 return self.total_rows
-            else:
-                return self.rows_loaded
+            return len(self._rows)
         except AttributeError:
             return 0
 
-    def fetch_more(self, rows=False, columns=False):
-        """Get more columns and/or rows."""
-        if rows and self.total_rows > self.rows_loaded:
-            reminder = self.total_rows - self.rows_loaded
-            items_to_fetch = min(reminder, ROWS_TO_LOAD)
-            self.beginInsertRows(QModelIndex(), self.rows_loaded,
-                                 self.rows_loaded + items_to_fetch - 1)
-            self.rows_loaded += items_to_fetch
-            self.endInsertRows()
-        if columns and self.total_cols > self.cols_loaded:
-            reminder = self.total_cols - self.cols_loaded
-            items_to_fetch = min(reminder, COLS_TO_LOAD)
-            self.beginInsertColumns(QModelIndex(), self.cols_loaded,
-                                    self.cols_loaded + items_to_fetch - 1)
-            self.cols_loaded += items_to_fetch
-            self.endInsertColumns()
-
     def columnCount(self, index=QModelIndex()):
         """DataFrame column number"""
         # Avoid a "Qt exception in virtual methods" generated in our
@@ -475,12 +734,10 @@ class DataFrameModel(QAbstractTableModel):
         # See spyder-ide/spyder#8910.
         try:
             # This is done to implement series
-            if len(self.df.shape) == 1:
+            if len(self.shape) == 1:
                 return 2
-            elif self.total_cols <= self.cols_loaded:
-                return self.total_cols
             else:
-                return self.cols_loaded
+                return self.total_cols
         except AttributeError:
             return 0
 
@@ -489,19 +746,137 @@ class DataFrameModel(QAbstractTableModel):
         self.endResetModel()
 
 
+class RemoteDataFrameModel(DataFrameModel):
+    """
+    Read-only model for a dataframe that lives in a kernel.
+
+    Only the chunks of rows and columns that are displayed are requested to
+    the kernel. `info` is a dict with the 'shape' of the dataframe, an
+    'empty' copy of it (i.e. with its columns and dtypes but without rows)
+    and the 'max_min_col' list computed in the kernel. `get_window` is a
+    function that receives the (start, stop) pairs of rows and columns and
+    returns that window of the dataframe.
+
+    `sort_filter` is an optional function that asks the kernel to sort the
+    rows by a column and/or filter them, and passes the number of rows shown
+    to a callback when done. It receives the position of the column (None
+    to keep the current order), whether the order is ascending, the filters
+    (None to keep the current ones) and the callback. After that, the
+    windows are taken from the sorted and filtered rows.
+
+    Signals
+    -------
+    sig_fetch_error(str): Raised with the error message when a window
+        couldn't be requested to the kernel.
+    """
+    sig_fetch_error = Signal(str)
+
+    def __init__(self, info, get_window, sort_filter=None,
+                 format=DEFAULT_FORMAT, parent=None):
+        self._info = info
+        self._get_window = get_window
+        self._sort_filter = sort_filter
+        self._row_count = None
+        DataFrameModel.__init__(self, info['empty'], format=format,
+                                parent=parent)
+        if self.max_min_col is None:
+            self.bgcolor_enabled = False
+
+    @property
+    def shape(self):
+        """Return the shape of the dataframe."""
+        return self._info['shape']
+
+    def max_min_col_update(self):
+        """Use the maximum and minimum computed in the kernel."""
+        self.max_min_col = self._info.get('max_min_col')
+
+    def fetch_window(self, rows, columns):
+        """
+        Request a window of the dataframe to the kernel.
+
+        Windows are requested while the data is displayed, so if that fails
+        a window filled with placeholders is returned instead of raising.
+        """
+        try:
+            return self._get_window(rows, columns)
+        except Exception as error:
+            self.sig_fetch_error.emit(to_text_string(error))
+            return self._get_placeholder_window(rows, columns)
+
+    def _get_placeholder_window(self, rows, columns):
+        """Return a window for data that couldn't be requested."""
+        nrows = max(min(rows[1], self.rowCount()) - rows[0], 0)
+        labels = [PLACEHOLDER_TEXT] * nrows
+        nlevels = self.df.index.nlevels
+        if nlevels > 1:
+            index = MultiIndex.from_arrays([labels] * nlevels)
+        else:
+            index = Index(labels)
+        return DataFrame(PLACEHOLDER_TEXT, index=index,
+                         columns=self.df.columns[slice(*columns)])
+
+    def fetch_labels(self, axis, start, stop):
+        """Request the labels of some rows to the kernel."""
+        if axis == 0:
+            return DataFrameModel.fetch_labels(self, axis, start, stop)
+        return self.fetch_window((start, stop), (0, 0)).index
+
+    def rowCount(self, index=QModelIndex()):
+        """DataFrame row number"""
+        try:
+            if self._row_count is None:
+                return self.total_rows
+            return self._row_count
+        except AttributeError:
+            return 0
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Ask the kernel to sort the rows of the dataframe."""
+        if self._sort_filter is None:
+            return False
+        ascending = order == Qt.AscendingOrder
+        self._sort_filter(
+            column, ascending, None,
+            lambda row_count: self._set_row_count(row_count,
+                                                  [column, order]))
+        return True
+
+    def set_filters(self, filters):
+        """Ask the kernel to filter the rows of the dataframe."""
+        if self._sort_filter is None:
+            return False
+        self._filters = filters
+        self._sort_filter(None, True, filters, self._set_row_count)
+        return True
+
+    def _set_row_count(self, row_count, sorted_by=None):
+        """Show the rows sorted and filtered by the kernel."""
+        self._row_count = row_count
+        if sorted_by is not None:
+            self.sorted_by = sorted_by
+        self.clear_chunks()
+        self.reset()
+        self.sig_rows_changed.emit()
+
+    def flags(self, index):
+        """Set flags"""
+        return QAbstractTableModel.flags(self, index)
+
+    def setData(self, index, value, role=Qt.EditRole, change_type=None):
+        """Remote dataframes can't be edited."""
+        return False
+
+
 class DataFrameView(QTableView):
     """
     Data Frame view class.
 
     Signals
     -------
-    sig_option_changed(): Raised after a sort by column.
-    sig_sort_by_column(): Raised after more columns are fetched.
-    sig_fetch_more_rows(): Raised after more rows are fetched.
+    sig_sort_by_column(): Raised after a sort by column.
     """
     sig_sort_by_column = Signal()
-    sig_fetch_more_columns = Signal()
-    sig_fetch_more_rows = Signal()
 
     def __init__(self, parent, model, header, hscroll, vscroll):
         """Constructor."""
@@ -512,7 +887,6 @@ class DataFrameView(QTableView):
         self.setHorizontalScrollMode(1)
         self.setVerticalScrollMode(1)
 
-        self.sort_old = [None]
         self.header_class = header
         self.header_class.sectionClicked.connect(self.sortByColumn)
         self.menu = self.setup_menu()
@@ -521,40 +895,23 @@ class DataFrameView(QTableView):
             context='variable_explorer',
             name='copy',
             parent=self)
-        self.horizontalScrollBar().valueChanged.connect(
-                        lambda val: self.load_more_data(val, columns=True))
-        self.verticalScrollBar().valueChanged.connect(
-                        lambda val: self.load_more_data(val, rows=True))
-
-    def load_more_data(self, value, rows=False, columns=False):
-        """Load more rows and columns to display."""
-        try:
-            if rows and value == self.verticalScrollBar().maximum():
-                self.model().fetch_more(rows=rows)
-                self.sig_fetch_more_rows.emit()
-            if columns and value == self.horizontalScrollBar().maximum():
-                self.model().fetch_more(columns=columns)
-                self.sig_fetch_more_columns.emit()
-
-        except NameError:
-            # Needed to handle a NameError while fetching data when closing
-            # See spyder-ide/spyder#7880.
-            pass
 
     def sortByColumn(self, index):
         """Implement a column sort."""
-        if self.sort_old == [None]:
-            self.header_class.setSortIndicatorShown(True)
         sort_order = self.header_class.sortIndicatorOrder()
         self.sig_sort_by_column.emit()
-        if not self.model().sort(index, sort_order):
-            if len(self.sort_old) != 2:
-                self.header_class.setSortIndicatorShown(False)
-            else:
-                self.header_class.setSortIndicator(self.sort_old[0],
-                                                   self.sort_old[1])
-            return
-        self.sort_old = [index, self.header_class.sortIndicatorOrder()]
+        # The indicator is updated when the rows are sorted
+        self.update_sort_indicator()
+        self.model().sort(index, sort_order)
+
+    def update_sort_indicator(self):
+        """Show the column by which the rows of the model are sorted."""
+        sorted_by = self.model().sorted_by
+        if sorted_by is None:
+            self.header_class.setSortIndicatorShown(False)
+        else:
+            self.header_class.setSortIndicatorShown(True)
+            self.header_class.setSortIndicator(*sorted_by)
 
     def contextMenuEvent(self, event):
         """Reimplement Qt method."""
@@ -595,9 +952,8 @@ class DataFrameView(QTableView):
         (row_min, row_max,
          col_min, col_max) = get_idx_rect(self.selectedIndexes())
         index = header = False
-        df = self.model().df
-        obj = df.iloc[slice(row_min, row_max + 1),
-                      slice(col_min, col_max + 1)]
+        obj = self.model().fetch_window((row_min, row_max + 1),
+                                        (col_min, col_max + 1))
         output = io.StringIO()
         obj.to_csv(output, sep='\t', index=index, header=header)
         if not PY2:
@@ -633,57 +989,24 @@ class DataFrameHeaderModel(QAbstractTableModel):
         self.axis = axis
         self._palette = palette
         if self.axis == 0:
-            self.total_cols = self.model.shape[1]
             self._shape = (self.model.header_shape[0], self.model.shape[1])
-            if self.total_cols > LARGE_COLS:
-                self.cols_loaded = COLS_TO_LOAD
-            else:
-                self.cols_loaded = self.total_cols
         else:
-            self.total_rows = self.model.shape[0]
-            self._shape = (self.model.shape[0], self.model.header_shape[1])
-            if self.total_rows > LARGE_NROWS:
-                self.rows_loaded = ROWS_TO_LOAD
-            else:
-                self.rows_loaded = self.total_rows
+            self._shape = (self.model.rowCount(), self.model.header_shape[1])
 
     def rowCount(self, index=None):
         """Get number of rows in the header."""
         if self.axis == 0:
             return max(1, self._shape[0])
         else:
-            if self.total_rows <= self.rows_loaded:
-                return self.total_rows
-            else:
-                return self.rows_loaded
+            return self._shape[0]
 
     def columnCount(self, index=QModelIndex()):
         """DataFrame column number"""
         if self.axis == 0:
-            if self.total_cols <= self.cols_loaded:
-                return self.total_cols
-            else:
-                return self.cols_loaded
+            return self._shape[1]
         else:
             return max(1, self._shape[1])
 
-    def fetch_more(self, rows=False, columns=False):
-        """Get more columns or rows (based on axis)."""
-        if  self.axis == 1 and self.total_rows > self.rows_loaded:
-            reminder = self.total_rows - self.rows_loaded
-            items_to_fetch = min(reminder, ROWS_TO_LOAD)
-            self.beginInsertRows(QModelIndex(), self.rows_loaded,
-                                 self.rows_loaded + items_to_fetch - 1)
-            self.rows_loaded += items_to_fetch
-            self.endInsertRows()
-        if self.axis == 0 and self.total_cols > self.cols_loaded:
-            reminder = self.total_cols - self.cols_loaded
-            items_to_fetch = min(reminder, COLS_TO_LOAD)
-            self.beginInsertColumns(QModelIndex(), self.cols_loaded,
-                                    self.cols_loaded + items_to_fetch - 1)
-            self.cols_loaded += items_to_fetch
-            self.endInsertColumns()
-
     def sort(self, column, order=Qt.AscendingOrder):
         """Overriding sort method."""
         ascending = order == Qt.AscendingOrder
@@ -854,6 +1177,37 @@ class DataFrameEditor(QDialog):
         return False if data is not supported, True otherwise.
         Supported types for data are DataFrame, Series and Index.
         """
+        title = self._get_title(title, data.__class__.__name__)
+        if isinstance(data, Series):
+            self.is_series = True
+            data = data.to_frame()
+        elif isinstance(data, Index):
+            data = DataFrame(data)
+        return self.setup_model(DataFrameModel(data, parent=self), title)
+
+    def setup_and_check_remote(self, info, get_window, sort_filter=None,
+                               title=''):
+        """
+        Setup DataFrameEditor for a dataframe that lives in a kernel.
+
+        See RemoteDataFrameModel for the meaning of `info`, `get_window` and
+        `sort_filter`.
+        """
+        title = self._get_title(title, info['type'])
+        self.is_series = info['type'] == 'Series'
+        model = RemoteDataFrameModel(info, get_window, sort_filter,
+                                     parent=self)
+        return self.setup_model(model, title)
+
+    def _get_title(self, title, type_name):
+        """Return the window title for a variable of the given type."""
+        if title:
+            return to_text_string(title) + " - %s" % type_name
+        else:
+            return _("%s editor") % type_name
+
+    def setup_model(self, model, title=''):
+        """Setup DataFrameEditor to show the given DataFrameModel."""
         self._selection_rec = False
         self._model = None
 
@@ -862,16 +1216,6 @@ class DataFrameEditor(QDialog):
         self.layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(self.layout)
         self.setWindowIcon(ima.icon('arredit'))
-        if title:
-            title = to_text_string(title) + " - %s" % data.__class__.__name__
-        else:
-            title = _("%s editor") % data.__class__.__name__
-        if isinstance(data, Series):
-            self.is_series = True
-            data = data.to_frame()
-        elif isinstance(data, Index):
-            data = DataFrame(data)
-
         self.setWindowTitle(title)
         self.resize(600, 500)
 
@@ -888,9 +1232,12 @@ class DataFrameEditor(QDialog):
         self.create_table_index()
 
         # Create the model and view of the data
-        self.dataModel = DataFrameModel(data, parent=self)
+        self.dataModel = model
         self.dataModel.dataChanged.connect(self.save_and_close_enable)
+        self.dataModel.sig_rows_changed.connect(self._sort_update)
         self.create_data_table()
+        self.dataModel.sig_rows_changed.connect(
+            self.dataTable.update_sort_indicator)
 
         self.layout.addWidget(self.hscroll, 2, 0, 1, 2)
         self.layout.addWidget(self.vscroll, 0, 2, 2, 1)
@@ -931,7 +1278,11 @@ class DataFrameEditor(QDialog):
         self.bgcolor_global.stateChanged.connect(self.dataModel.colum_avg)
         btn_layout.addWidget(self.bgcolor_global)
 
-        btn_layout.addStretch()
+        # To show errors that happen while requesting remote data
+        self.status_label = QLabel()
+        btn_layout.addWidget(self.status_label, 1)
+        if isinstance(self.dataModel, RemoteDataFrameModel):
+            self.dataModel.sig_fetch_error.connect(self.show_fetch_error)
 
         self.btn_save_and_close = QPushButton(_('Save and Close'))
         self.btn_save_and_close.setDisabled(True)
@@ -945,12 +1296,19 @@ class DataFrameEditor(QDialog):
         btn_layout.addWidget(self.btn_close)
 
         btn_layout.setContentsMargins(4, 4, 4, 4)
+        self.layout.addLayout(self.create_filter_bar(), 3, 0, 1, 2)
         self.layout.addLayout(btn_layout, 4, 0, 1, 2)
         self.setModel(self.dataModel)
         self.resizeColumnsToContents()
 
         return True
 
+    @Slot(str)
+    def show_fetch_error(self, error):
+        """Show an error raised while requesting data to the kernel."""
+        self.status_label.setText(
+            _("Some values couldn't be retrieved: {}").format(error))
+
     @Slot(QModelIndex, QModelIndex)
     def save_and_close_enable(self, top_left, bottom_right):
         """Handle the data change event to enable the save and close button."""
@@ -958,6 +1316,40 @@ class DataFrameEditor(QDialog):
         self.btn_save_and_close.setAutoDefault(True)
         self.btn_save_and_close.setDefault(True)
 
+    def create_filter_bar(self):
+        """Create the bar to filter the rows by the text in a column."""
+        self.filter_column = QComboBox()
+        for name in self.dataModel.df.columns:
+            self.filter_column.addItem(to_text_string(name))
+        self.filter_text = QLineEdit()
+        self.filter_text.setPlaceholderText(_("Text in the column"))
+
+        # Wait for the user to stop typing before filtering
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_text.textChanged.connect(
+            lambda text: self.filter_timer.start())
+        self.filter_column.currentIndexChanged.connect(
+            lambda index: self.filter_timer.start())
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel(_("Filter")))
+        filter_layout.addWidget(self.filter_column)
+        filter_layout.addWidget(self.filter_text)
+        filter_layout.setContentsMargins(4, 4, 4, 0)
+        return filter_layout
+
+    def apply_filter(self):
+        """Show only the rows that contain the filter text."""
+        text = to_text_string(self.filter_text.text())
+        if text:
+            filters = {self.filter_column.currentIndex(): text}
+        else:
+            filters = {}
+        self.dataModel.set_filters(filters)
+
     def create_table_level(self):
         """Create the QTableView that will hold the level model."""
         self.table_level = QTableView()
@@ -1022,8 +1414,6 @@ class DataFrameEditor(QDialog):
         self.layout.addWidget(self.dataTable, 1, 1)
         self.setFocusProxy(self.dataTable)
         self.dataTable.sig_sort_by_column.connect(self._sort_update)
-        self.dataTable.sig_fetch_more_columns.connect(self._fetch_more_columns)
-        self.dataTable.sig_fetch_more_rows.connect(self._fetch_more_rows)
 
     def sortByIndex(self, index):
         """Implement a Index sort."""
@@ -1133,7 +1523,8 @@ class DataFrameEditor(QDialog):
 
     def _sizeHintForColumn(self, table, col, limit_ms=None):
         """Get the size hint for a given column in a table."""
-        max_row = table.model().rowCount()
+        # Only look at the first chunk of rows, to not fetch all of them
+        max_row = min(table.model().rowCount(), ROWS_TO_LOAD)
         lm_start = perf_counter()
         lm_row = 64 if limit_ms else max_row
         max_width = self.min_trunc
@@ -1284,19 +1675,9 @@ class DataFrameEditor(QDialog):
         """
         self.setModel(self.dataTable.model())
 
-    def _fetch_more_columns(self):
-        """Fetch more data for the header (columns)."""
-        self.table_header.model().fetch_more()
-
-    def _fetch_more_rows(self):
-        """Fetch more data for the index (rows)."""
-        self.table_index.model().fetch_more()
-
     def resize_to_contents(self):
         QApplication.setOverrideCursor(QCursor(Qt.WaitCursor))
         self.dataTable.resizeColumnsToContents()
-        self.dataModel.fetch_more(columns=True)
-        self.dataTable.resizeColumnsToContents()
         self._update_header_size()
         QApplication.restoreOverrideCursor()
 
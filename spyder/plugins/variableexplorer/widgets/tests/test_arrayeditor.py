@@ -213,6 +213,18 @@ def test_arrayeditor_edit_2d_array(qtbot):
     assert np.sum(diff_arr != dlg.get_value()) == 2
 
 
+def test_arraymodel_display_texts():
+    """Test that cells are formatted by chunks and updated when edited."""
+    arr = np.arange(1000, dtype=np.float64).reshape(500, 2)
+    model = ArrayModel(arr, format='%.2f')
+    assert model.data(model.index(499, 1)) == '999.00'
+    assert len(model._texts) == 1
+    model.set_format('%.1f')
+    assert model.data(model.index(0, 1)) == '1.0'
+    assert model.setData(model.index(0, 1), '5')
+    assert model.data(model.index(0, 1)) == '5.0'
+
+
 def test_arraymodel_set_data_overflow(monkeypatch):
     """
     Test that entry of an overflowing integer is caught and handled properly.
@@ -35,7 +35,7 @@ from spyder.utils.programs import is_module_installed
 from spyder.utils.test import close_message_box
 from spyder.plugins.variableexplorer.widgets import dataframeeditor
 from spyder.plugins.variableexplorer.widgets.dataframeeditor import (
-    DataFrameEditor, DataFrameModel)
+    DataFrameEditor, DataFrameModel, RemoteDataFrameModel)
 
 
 # =============================================================================
@@ -185,6 +185,67 @@ def test_dataframemodel_basic():
     assert data(dfm, 1, 0) == '3'
     assert data(dfm, 1, 1) == 'a'
 
+def test_dataframemodel_fetches_chunks():
+    """Test that only the chunks of the cells that are shown are fetched."""
+    df = DataFrame(numpy.arange(2000 * 100).reshape(2000, 100))
+    dfm = DataFrameModel(df)
+    dfm.fetch_window = Mock(side_effect=dfm.fetch_window)
+    assert dfm.rowCount() == 2000
+    assert dfm.columnCount() == 100
+    assert data(dfm, 1999, 99) == str(1999 * 100 + 99)
+    assert data(dfm, 1500, 80) == str(1500 * 100 + 80)
+    dfm.fetch_window.assert_called_once_with((1500, 2000), (80, 120))
+
+
+def test_remote_dataframemodel():
+    """Test a model that gets its data through a function."""
+    df = DataFrame({'colA': [1, 3, 5], 'colB': ['c', 'a', 'b']},
+                   index=['x', 'y', 'z'])
+    info = {'type': 'DataFrame', 'shape': df.shape, 'empty': df.iloc[:0],
+            'max_min_col': [[5, 1], None]}
+    get_window = Mock(side_effect=lambda rows, columns: df.iloc[
+        slice(*rows), slice(*columns)])
+    dfm = RemoteDataFrameModel(info, get_window)
+    assert dfm.rowCount() == 3
+    assert dfm.columnCount() == 2
+    assert dfm.max_min_col == [[5, 1], None]
+    assert data(dfm, 2, 0) == '5'
+    assert data(dfm, 1, 1) == 'a'
+    assert dfm.header(0, 1) == 'colB'
+    assert dfm.header(1, 2) == 'z'
+    assert get_window.call_count == 2
+    get_window.assert_called_with((0, 500), (0, 0))
+    assert not dfm.sort(0)
+    assert not dfm.flags(dfm.createIndex(0, 0)) & Qt.ItemIsEditable
+
+
+def test_remote_dataframemodel_fetch_error(qtbot):
+    """Test that errors while requesting data show placeholders."""
+    df = DataFrame({'colA': [1, 3, 5], 'colB': ['c', 'a', 'b']})
+    info = {'type': 'DataFrame', 'shape': df.shape, 'empty': df.iloc[:0],
+            'max_min_col': [[5, 1], None]}
+    get_window = Mock(side_effect=ValueError('The kernel is busy'))
+    dfm = RemoteDataFrameModel(info, get_window)
+    with qtbot.waitSignal(dfm.sig_fetch_error) as blocker:
+        assert data(dfm, 2, 0) == '?'
+    assert blocker.args == ['The kernel is busy']
+    assert dfm.header(1, 2) == '?'
+    assert dfm.get_bgcolor(dfm.createIndex(2, 0)) is not None
+
+
+def test_dataframemodel_labels_by_chunks():
+    """Test that labels are only taken for the chunks that are shown."""
+    index = MultiIndex.from_product([range(1000), ['a', 'b']])
+    df = DataFrame(numpy.zeros((2000, 2)), index=index, columns=['c', 'd'])
+    dfm = DataFrameModel(df)
+    dfm.fetch_labels = Mock(side_effect=dfm.fetch_labels)
+    assert dfm.header(1, 1999, 0) == 999
+    assert dfm.header(1, 1999, 1) == 'b'
+    assert dfm.header(0, 1) == 'd'
+    assert dfm.fetch_labels.call_count == 2
+    dfm.fetch_labels.assert_any_call(1, 1500, 2000)
+
+
 def test_dataframemodel_sort():
     """Validate the data in the model."""
     df = DataFrame({'colA': [1, 3], 'colB': ['c', 'a']})
@@ -208,6 +269,44 @@ def test_dataframemodel_sort_is_stable():   # cf. spyder-ide/spyder#3010.
     assert col2 == [str(x) for x in [1, 3, 4, 6, 11, 12, 15, 17,
                                      2, 5, 7, 8, 9, 10, 13, 14, 16]]
 
+def test_dataframemodel_sort_and_filter_keep_dataframe():
+    """Test that sorting and filtering don't change the dataframe."""
+    df = DataFrame({'colA': [1, 3, 2], 'colB': ['ca', 'ab', 'cb']},
+                   index=['x', 'y', 'z'])
+    expected = df.copy()
+    dfm = DataFrameModel(df)
+    dfm.sort(0)
+    assert [data(dfm, i, 1) for i in range(3)] == ['ca', 'cb', 'ab']
+    assert [dfm.header(1, i) for i in range(3)] == ['x', 'z', 'y']
+    dfm.set_filters({1: 'C'})
+    assert dfm.rowCount() == 2
+    assert [data(dfm, i, 0) for i in range(2)] == ['1', '2']
+    assert dfm.setData(dfm.createIndex(1, 0), '5')
+    dfm.set_filters({})
+    assert [data(dfm, i, 0) for i in range(3)] == ['1', '5', '3']
+    expected.iloc[2, 0] = 5
+    assert df.equals(expected)
+
+
+def test_dataframemodel_sort_and_filter_in_worker(qtbot, monkeypatch):
+    """Test sorting and filtering big dataframes in a worker thread."""
+    monkeypatch.setattr(dataframeeditor, 'LARGE_NROWS', 2)
+    df = DataFrame({'colA': [1, 3, 2], 'colB': ['ca', 'ab', 'cb']})
+    dfm = DataFrameModel(df)
+    index = dfm.createIndex(0, 0)
+    with qtbot.waitSignal(dfm.sig_rows_changed):
+        assert dfm.sort(0)
+        # A filter requested while sorting is applied together with the sort
+        assert dfm.set_filters({1: 'C'})
+        assert not dfm.flags(index) & Qt.ItemIsEditable
+        assert not dfm.setData(index, '5')
+    assert dfm.sorted_by == [0, Qt.AscendingOrder]
+    assert dfm.rowCount() == 2
+    assert [data(dfm, i, 0) for i in range(2)] == ['1', '2']
+    assert dfm.flags(index) & Qt.ItemIsEditable
+    assert df['colA'].tolist() == [1, 3, 2]
+
+
 def test_dataframemodel_max_min_col_update():
     df = DataFrame([[1, 2.0], [2, 2.5], [3, 9.0]])
     dfm = DataFrameModel(df)
@@ -264,6 +363,19 @@ def test_dataframemodel_get_bgcolor_with_numbers_using_global_max():
     assert colorclose(bgcolor(dfm, 1, 1), (h0 + 20 / 40 * dh, s, v, a))
     assert colorclose(bgcolor(dfm, 2, 1), (h0,                s, v, a))
 
+def test_dataframemodel_get_bgcolor_with_large_dataframe():
+    """Test that big dataframes are also colored, by chunks."""
+    df = DataFrame(numpy.arange(10**6).reshape(-1, 2))
+    dfm = DataFrameModel(df)
+    assert dfm.bgcolor_enabled
+    assert dfm.max_min_col == [[10**6 - 2, 0], [10**6 - 1, 1]]
+    h0 = dataframeeditor.BACKGROUND_NUMBER_MINHUE
+    s = dataframeeditor.BACKGROUND_NUMBER_SATURATION
+    v = dataframeeditor.BACKGROUND_NUMBER_VALUE
+    a = dataframeeditor.BACKGROUND_NUMBER_ALPHA
+    assert colorclose(bgcolor(dfm, 10**6 // 2 - 1, 1), (h0, s, v, a))
+    assert len(dfm._chunks) == 1
+
 def test_dataframemodel_get_bgcolor_with_string():
     """Validate the color of the cell when a string is the data."""
     df = DataFrame([['xxx']])
@@ -313,6 +425,14 @@ def test_dataframemodel_with_format_percent_d_and_nan():
     assert data(dfm, 0, 0) == '0'
     assert data(dfm, 1, 0) == 'nan'
 
+def test_dataframemodel_set_format_updates_texts():
+    """Test that the texts of the cells are formatted again."""
+    df = DataFrame({'float': [1.5, 2.25], 'int': [1, 2], 'str': ['a', 'b']})
+    dfm = DataFrameModel(df)
+    assert [data(dfm, 1, j) for j in range(3)] == ['2.25', '2', 'b']
+    dfm.set_format('%.1f')
+    assert [data(dfm, 1, j) for j in range(3)] == ['2.2', '2', 'b']
+
 def test_change_format_emits_signal(qtbot, monkeypatch):
     mockQInputDialog = Mock()
     mockQInputDialog.getText = lambda parent, title, label, mode, text: ('%10.3e', True)
@@ -399,13 +519,12 @@ def test_sort_dataframe_with_duplicate_column(qtbot):
     editor = DataFrameEditor(None)
     editor.setup_and_check(df)
     dfm = editor.dataModel
-    QTimer.singleShot(1000, lambda: close_message_box(qtbot))
     editor.dataModel.sort(0)
-    assert [data(dfm, row, 0) for row in range(len(df))] == ['1', '3', '2']
-    assert [data(dfm, row, 1) for row in range(len(df))] == ['4', '6', '5']
-    editor.dataModel.sort(1)
     assert [data(dfm, row, 0) for row in range(len(df))] == ['1', '2', '3']
     assert [data(dfm, row, 1) for row in range(len(df))] == ['4', '5', '6']
+    editor.dataModel.sort(1, Qt.DescendingOrder)
+    assert [data(dfm, row, 0) for row in range(len(df))] == ['3', '2', '1']
+    assert [data(dfm, row, 1) for row in range(len(df))] == ['6', '5', '4']
 
 
 @pytest.mark.skipif(not os.name == 'nt',
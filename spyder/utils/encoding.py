@@ -13,11 +13,13 @@ source code (Utilities/__init___.py) Copyright © 2003-2009 Detlev Offenbach
 
 # Standard library imports
 from codecs import BOM_UTF8, BOM_UTF16, BOM_UTF32
+from collections import OrderedDict
 import locale
 import re
 import os
 import sys
 import errno
+import threading
 
 # Third-party imports
 from chardet.universaldetector import UniversalDetector
@@ -25,7 +27,7 @@ from atomicwrites import atomic_write
 
 # Local imports
 from spyder.py3compat import (is_string, to_text_string, is_binary_string,
-                              is_unicode)
+                              is_unicode, pickle)
 from spyder.utils.external.binaryornot.check import is_binary
 
 
@@ -284,11 +286,115 @@ def readlines(filename, encoding='utf-8'):
     return text.split(os.linesep), encoding
 
 
+class TextFileCache(object):
+    """
+    Cache of the classification of files as text or binary.
+
+    Classifications are stored as (size, mtime, is_text) entries keyed by
+    path, and are only used while the size and modification time of the
+    file don't change. That way, scanning an unchanged tree several times
+    only reads the files once.
+    """
+
+    def __init__(self, max_entries=200000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_cached_entry(self, filename):
+        """
+        Return the entry of `filename` if it's still valid, without
+        classifying the file otherwise.
+        """
+        entry = self._entries.get(filename)
+        if entry is None:
+            return None
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+        if entry[0] == st.st_size and entry[1] == st.st_mtime:
+            return entry
+        return None
+
+    def get_entry(self, filename):
+        """
+        Return the entry of `filename`, classifying the file if needed.
+
+        Returns None if the file doesn't exist.
+        """
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+        entry = self._entries.get(filename)
+        if (entry is not None and entry[0] == st.st_size and
+                entry[1] == st.st_mtime):
+            return entry
+        try:
+            is_text = not is_binary(filename)
+        except (OSError, IOError):
+            is_text = False
+        entry = (st.st_size, st.st_mtime, is_text)
+        self.add_entry(filename, entry)
+        return entry
+
+    def add_entry(self, filename, entry):
+        """Add the entry of `filename`, computed somewhere else."""
+        with self._lock:
+            self._entries.pop(filename, None)
+            self._entries[filename] = entry
+            self._trim()
+
+    def _trim(self):
+        """Remove the oldest entries above `max_entries`."""
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def is_text_file(self, filename):
+        """Test if the given path is a text-like file."""
+        entry = self.get_entry(filename)
+        return entry is not None and entry[2]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def load(self, filename):
+        """Load entries saved in `filename`."""
+        try:
+            with open(filename, 'rb') as f:
+                entries = pickle.load(f)
+        except Exception:
+            return False
+        with self._lock:
+            for path, entry in entries:
+                self._entries.setdefault(path, entry)
+            self._trim()
+        return True
+
+    def save(self, filename):
+        """Save entries to `filename`."""
+        with self._lock:
+            entries = list(self._entries.items())
+        try:
+            with atomic_write(filename, mode='wb', overwrite=True) as f:
+                pickle.dump(entries, f, protocol=2)
+        except (IOError, OSError):
+            return False
+        return True
+
+
+# Classification cache shared by all the scans of files in this process
+TEXT_FILE_CACHE = TextFileCache()
+
+
 def is_text_file(filename):
     """
     Test if the given path is a text-like file.
     """
-    try:
-        return not is_binary(filename)
-    except (OSError, IOError):
-        return False
+    return TEXT_FILE_CACHE.is_text_file(filename)
@@ -0,0 +1,531 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Incremental lexing of documents with Pygments.
+
+The formats of the document are stored in segments of a few lines, with the
+state of the lexer at the start of each segment. After a change, the
+document is lexed again from the segment before the change, only until the
+lexer reaches the start of an old segment with the same state as before.
+
+Lexers with rules whose match can depend on the lines after the one where
+they are tried (e.g. multi-line strings that need to be closed) are lexed
+again from the start of the document instead, because a change can modify
+the tokens of any line before it.
+"""
+
+# Standard library imports
+from array import array
+from bisect import bisect_right
+import re
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:
+    import sre_constants
+    import sre_parse
+
+# Third party imports
+from pygments import token as pygments_token
+from pygments.lexer import ExtendedRegexLexer, RegexLexer
+from pygments.token import Error, Text, _TokenType
+
+# Local imports
+from spyder.py3compat import PY3
+from spyder.utils.qstringhelpers import qstring_length
+
+
+# Minimum number of lines of a segment
+CHECKPOINT_INTERVAL = 50
+
+# Characters that take two UTF-16 code units in Qt strings
+if PY3:
+    NON_BMP_REGEX = re.compile(u'[\U00010000-\U0010ffff]')
+else:
+    NON_BMP_REGEX = None
+
+# Token of the newlines not matched by any rule
+WHITESPACE = getattr(pygments_token, 'Whitespace', Text)
+
+ROOT_STACK = ('root',)
+
+# Regular expression categories that match newlines
+NEWLINE_CATEGORIES = set(
+    getattr(sre_constants, name) for name in (
+        'CATEGORY_SPACE', 'CATEGORY_NOT_DIGIT', 'CATEGORY_NOT_WORD',
+        'CATEGORY_LINEBREAK', 'CATEGORY_UNI_SPACE', 'CATEGORY_UNI_NOT_DIGIT',
+        'CATEGORY_UNI_NOT_WORD', 'CATEGORY_UNI_LINEBREAK')
+    if hasattr(sre_constants, name))
+
+REPEAT_OPCODES = set(
+    getattr(sre_constants, name) for name in (
+        'MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+    if hasattr(sre_constants, name))
+
+# Whether the rules of each lexer class can depend on the lines after the
+# one where they are tried
+_reads_following_lines_cache = {}
+
+
+def _get_function(method):
+    return getattr(method, '__func__', method)
+
+
+def supports_incremental_lexing(lexer):
+    """
+    Return True if the state of `lexer` can be tracked while lexing.
+
+    This is the case of lexers based on `RegexLexer` that use its default
+    tokenization.
+    """
+    return (isinstance(lexer, RegexLexer) and
+            not isinstance(lexer, ExtendedRegexLexer) and
+            _get_function(type(lexer).get_tokens_unprocessed) is
+            _get_function(RegexLexer.get_tokens_unprocessed))
+
+
+def _set_matches_newline(items):
+    """Return True if the character set `items` contains a newline."""
+    negate = found = False
+    for op, av in items:
+        if op == sre_constants.NEGATE:
+            negate = True
+        elif op == sre_constants.LITERAL:
+            found = found or av == ord('\n')
+        elif op == sre_constants.RANGE:
+            found = found or av[0] <= ord('\n') <= av[1]
+        elif op == sre_constants.CATEGORY:
+            found = found or av in NEWLINE_CATEGORIES
+        else:
+            found = True
+    return found != negate
+
+
+def _analyze_pattern(pattern, dotall):
+    """
+    Analyze a parsed regular expression.
+
+    Returns whether it can match a newline, whether it can match an empty
+    string and whether it can match or not depending on the text after a
+    newline it matched. The analysis is conservative.
+    """
+    matches_newline = after_newline = depends = False
+    nullable = True
+    for op, av in pattern:
+        assertion = False
+        if op == sre_constants.LITERAL:
+            newline, empty, dep = av == ord('\n'), False, False
+        elif op == sre_constants.NOT_LITERAL:
+            newline, empty, dep = av != ord('\n'), False, False
+        elif op == sre_constants.ANY:
+            newline, empty, dep = dotall, False, False
+        elif op == sre_constants.IN:
+            newline, empty, dep = _set_matches_newline(av), False, False
+        elif op in REPEAT_OPCODES:
+            min_count, max_count, item = av
+            newline, empty, dep = _analyze_pattern(item, dotall)
+            if max_count == 0:
+                newline, empty, dep = False, True, False
+            else:
+                # Repetitions after the minimum ones are optional
+                dep = dep or (min_count > 1 and newline and not empty)
+                empty = empty or min_count == 0
+        elif op == sre_constants.BRANCH:
+            newline = empty = dep = False
+            for branch in av[1]:
+                results = _analyze_pattern(branch, dotall)
+                newline = newline or results[0]
+                empty = empty or results[1]
+                dep = dep or results[2]
+        elif op == sre_constants.SUBPATTERN:
+            if len(av) == 4:
+                add_flags, del_flags, item = av[1:]
+                group_dotall = ((dotall or bool(add_flags & re.S)) and
+                                not del_flags & re.S)
+            else:
+                item, group_dotall = av[1], dotall
+            newline, empty, dep = _analyze_pattern(item, group_dotall)
+        elif op == getattr(sre_constants, 'ATOMIC_GROUP', None):
+            newline, empty, dep = _analyze_pattern(av, dotall)
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            results = _analyze_pattern(av[1], dotall)
+            newline, empty, dep = False, True, results[0] or results[2]
+            assertion = True
+        elif op == sre_constants.GROUPREF_EXISTS:
+            newline, empty, dep = _analyze_pattern(av[1], dotall)
+            if av[2] is None:
+                empty = True
+            else:
+                results = _analyze_pattern(av[2], dotall)
+                newline = newline or results[0]
+                empty = empty or results[1]
+                dep = dep or results[2]
+            assertion = True
+        elif op == sre_constants.AT:
+            newline, empty, dep = False, True, False
+            assertion = True
+        else:
+            # Back references
+            newline, empty, dep = True, False, False
+        depends = depends or dep or (after_newline and
+                                     (assertion or not empty))
+        after_newline = after_newline or newline
+        matches_newline = matches_newline or newline
+        nullable = nullable and empty
+    return matches_newline, nullable, depends
+
+
+def reads_following_lines(lexer):
+    """
+    Return True if a rule of `lexer` can match or not depending on the
+    lines after the one where it's tried.
+
+    The end of the match of other rules can still depend on those lines,
+    but only if the match extends to them.
+    """
+    lexer_class = type(lexer)
+    result = _reads_following_lines_cache.get(lexer_class)
+    if result is None:
+        result = False
+        for rules in lexer._tokens.values():
+            for rexmatch, __, __ in rules:
+                regex = rexmatch.__self__
+                pattern = sre_parse.parse(regex.pattern, regex.flags)
+                state = getattr(pattern, 'state', None) or pattern.pattern
+                if _analyze_pattern(pattern, bool(state.flags & re.S))[2]:
+                    result = True
+                    break
+            if result:
+                break
+        _reads_following_lines_cache[lexer_class] = result
+    return result
+
+
+class FormatRuns(object):
+    """
+    Formats of a text, stored as runs of characters with the same format.
+
+    Offsets are counted in UTF-16 code units, like positions in Qt
+    documents.
+    """
+
+    def __init__(self):
+        # Offset where each run starts and index of the name of its format
+        self.starts = array('l')
+        self.format_indexes = array('B')
+        self.format_names = []
+        self._name_indexes = {}
+        self.length = 0
+
+    def __len__(self):
+        return len(self.starts)
+
+    def append(self, length, name):
+        """Append `length` characters with the format called `name`."""
+        if length <= 0:
+            return
+        index = self._name_indexes.get(name)
+        if index is None:
+            index = self._name_indexes[name] = len(self.format_names)
+            self.format_names.append(name)
+        if not self.format_indexes or self.format_indexes[-1] != index:
+            self.starts.append(self.length)
+            self.format_indexes.append(index)
+        self.length += length
+
+    def get_runs(self, start, end):
+        """
+        Return the (start, length, name) runs between the offsets `start`
+        and `end`, clipped to them and relative to `start`.
+        """
+        runs = []
+        starts = self.starts
+        count = len(starts)
+        i = max(bisect_right(starts, start) - 1, 0)
+        while i < count and starts[i] < end:
+            run_start = max(starts[i], start)
+            run_end = starts[i + 1] if i + 1 < count else self.length
+            run_end = min(run_end, end)
+            if run_end > run_start:
+                name = self.format_names[self.format_indexes[i]]
+                runs.append((run_start - start, run_end - run_start, name))
+            i += 1
+        return runs
+
+
+class Segment(object):
+    """
+    Formats of consecutive lines of a document.
+
+    Segments start at the beginning of a line, where no token is being
+    lexed, and end right after a newline.
+    """
+
+    def __init__(self, line, offset, stack):
+        # First line, offset in the text and lexer state stack at the start
+        self.line = line
+        self.offset = offset
+        self.stack = stack
+        self.runs = FormatRuns()
+        # Start of each line, relative to the start of the segment
+        self.line_starts = array('l', [0])
+
+    def moved(self, line_delta, offset_delta):
+        """Return a copy of the segment moved by a change before it."""
+        segment = Segment(self.line + line_delta, self.offset + offset_delta,
+                          self.stack)
+        segment.runs = self.runs
+        segment.line_starts = self.line_starts
+        return segment
+
+    def get_line_runs(self, line):
+        """Return the runs of `line`, which has to be in the segment."""
+        i = line - self.line
+        line_starts = self.line_starts
+        if i < 0 or i >= len(line_starts):
+            return []
+        start = line_starts[i]
+        if i + 1 < len(line_starts):
+            end = line_starts[i + 1] - 1
+        else:
+            end = self.runs.length - 1
+        return self.runs.get_runs(start, end)
+
+
+class IncrementalLexer(object):
+    """
+    Lexed formats of a document, which can be updated incrementally.
+
+    Lexers whose state can't be tracked lex the whole document again on
+    every change.
+
+    Parameters
+    ----------
+    lexer: pygments.lexer.Lexer
+        Lexer of the document language.
+    get_format: callable
+        Function returning the name of the format of a token type.
+    checkpoint_interval: int
+        Minimum number of lines between states of the lexer.
+    """
+
+    def __init__(self, lexer, get_format,
+                 checkpoint_interval=CHECKPOINT_INTERVAL):
+        self.lexer = lexer
+        self.get_format = get_format
+        self.checkpoint_interval = checkpoint_interval
+        self.incremental = supports_incremental_lexing(lexer)
+        self.restart_from_start = (self.incremental and
+                                   reads_following_lines(lexer))
+        self.text = None
+        self.lines = []
+        self.segments = []
+        self.segment_lines = []
+
+    def copy(self):
+        """Return a copy with the same lexer and no formats."""
+        return IncrementalLexer(self.lexer, self.get_format,
+                                self.checkpoint_interval)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def get_line_runs(self, line):
+        """Return the (start, length, name) format runs of `line`."""
+        k = bisect_right(self.segment_lines, line) - 1
+        if k < 0:
+            return []
+        return self.segments[k].get_line_runs(line)
+
+    def relex(self, text):
+        """
+        Lex `text`, the new text of the document.
+
+        Returns the updated lexer and the sorted list of lines whose formats
+        changed, or None if they all have to be highlighted again. The
+        current lexer is not modified, so this can be called from a worker
+        thread.
+        """
+        new = self.copy()
+        new.text = text
+        new.lines = lines = text.split('\n')
+        if not self.incremental or self.text is None:
+            new.segments = new._lex(text, Segment(0, 0, ROOT_STACK))[0]
+            new.segment_lines = [s.line for s in new.segments]
+            return new, None
+
+        # Find the changed lines
+        old_lines = self.lines
+        count = min(len(lines), len(old_lines))
+        first = 0
+        while first < count and lines[first] == old_lines[first]:
+            first += 1
+        if first == len(lines) == len(old_lines):
+            new.segments = self.segments
+            new.segment_lines = self.segment_lines
+            return new, []
+        suffix = 0
+        while (suffix < count - first and
+                lines[-1 - suffix] == old_lines[-1 - suffix]):
+            suffix += 1
+        end = len(lines) - suffix
+        line_delta = len(lines) - len(old_lines)
+        offset_delta = len(text) - len(self.text)
+
+        # Start lexing before the line preceding the first change, whose
+        # tokens can depend on the changed text. Matches can't extend
+        # across the start of a segment, so the ones that extend to the
+        # changed lines are lexed again too.
+        if self.restart_from_start:
+            k = 0
+        else:
+            k = max(bisect_right(self.segment_lines, max(first - 1, 0)) - 1,
+                    0)
+        start = self.segments[k]
+        segments, resync = new._lex(
+            text, Segment(start.line, start.offset, start.stack),
+            resync=(self, end, line_delta))
+        if resync is None:
+            resync_line = len(lines)
+            new.segments = self.segments[:k] + segments
+        else:
+            resync_line = self.segments[resync].line + line_delta
+            new.segments = (self.segments[:k] + segments +
+                            [segment.moved(line_delta, offset_delta)
+                             for segment in self.segments[resync:]])
+        new.segment_lines = [s.line for s in new.segments]
+
+        # Lines whose text didn't change are compared with their old formats
+        changed_lines = []
+        for line in range(start.line, resync_line):
+            if first <= line < end:
+                changed_lines.append(line)
+            else:
+                old_line = line if line < first else line - line_delta
+                if (new.get_line_runs(line) !=
+                        self.get_line_runs(old_line)):
+                    changed_lines.append(line)
+        return new, changed_lines
+
+    def _lex(self, text, segment, resync=None):
+        """
+        Lex `text` from the start of `segment`.
+
+        `resync` is an optional (old lexer, line, line delta) tuple. Lexing
+        stops at the first segment of the old lexer after `line` whose
+        start has the same state (the line delta gives its new position).
+
+        Returns the list of new segments and the index of the old segment
+        where lexing stopped, or None if the end of the text was reached.
+        """
+        if not text.endswith('\n'):
+            # Rules of many lexers expect lines to end with a newline
+            text += '\n'
+        utf16 = NON_BMP_REGEX is not None and NON_BMP_REGEX.search(
+            text, segment.offset) is not None
+
+        lexer = self.lexer
+        get_format = self.get_format
+        interval = self.checkpoint_interval
+        formats = {}
+        segments = [segment]
+        line = segment.line
+        if resync is not None:
+            old, resync_min_line, line_delta = resync
+            old_segment_indexes = dict(
+                (s.line, i) for i, s in enumerate(old.segments))
+
+        def add_token(tokentype, value):
+            """Add a token to the current segment."""
+            name = formats.get(tokentype)
+            if name is None:
+                name = formats[tokentype] = get_format(tokentype)
+            runs = segments[-1].runs
+            if '\n' not in value:
+                runs.append(qstring_length(value) if utf16 else len(value),
+                            name)
+                return 0
+            parts = value.split('\n')
+            line_starts = segments[-1].line_starts
+            for part in parts[:-1]:
+                runs.append((qstring_length(part) if utf16 else len(part)) + 1,
+                            name)
+                line_starts.append(runs.length)
+            part = parts[-1]
+            runs.append(qstring_length(part) if utf16 else len(part), name)
+            return len(parts) - 1
+
+        if not self.incremental:
+            for __, tokentype, value in lexer.get_tokens_unprocessed(text):
+                add_token(tokentype, value)
+            return segments, None
+
+        # This follows RegexLexer.get_tokens_unprocessed, keeping track of
+        # the state stack at the start of lines
+        pos = segment.offset
+        tokendefs = lexer._tokens
+        statestack = list(segment.stack)
+        statetokens = tokendefs[statestack[-1]]
+        text_length = len(text)
+        while pos < text_length:
+            for rexmatch, action, new_state in statetokens:
+                m = rexmatch(text, pos)
+                if m:
+                    if action is not None:
+                        if type(action) is _TokenType:
+                            line += add_token(action, m.group())
+                        else:
+                            for __, tokentype, value in action(lexer, m):
+                                line += add_token(tokentype, value)
+                    pos = m.end()
+                    if new_state is not None:
+                        if isinstance(new_state, tuple):
+                            for state in new_state:
+                                if state == '#pop':
+                                    if len(statestack) > 1:
+                                        statestack.pop()
+                                elif state == '#push':
+                                    statestack.append(statestack[-1])
+                                else:
+                                    statestack.append(state)
+                        elif isinstance(new_state, int):
+                            if abs(new_state) >= len(statestack):
+                                del statestack[1:]
+                            else:
+                                del statestack[new_state:]
+                        elif new_state == '#push':
+                            statestack.append(statestack[-1])
+                        statetokens = tokendefs[statestack[-1]]
+                    break
+            else:
+                if text[pos] == '\n':
+                    statestack = ['root']
+                    statetokens = tokendefs['root']
+                    line += add_token(WHITESPACE, '\n')
+                else:
+                    add_token(Error, text[pos])
+                pos += 1
+
+            if pos >= text_length or text[pos - 1] != '\n':
+                continue
+
+            # At the start of a line, where a new segment can start
+            current = segments[-1]
+            stack = None
+            if resync is not None and line >= resync_min_line:
+                index = old_segment_indexes.get(line - line_delta)
+                if index is not None:
+                    stack = tuple(statestack)
+                    if old.segments[index].stack == stack:
+                        current.line_starts.pop()
+                        return segments, index
+            if line - current.line >= interval:
+                if stack is None:
+                    stack = tuple(statestack)
+                current.line_starts.pop()
+                segments.append(Segment(line, pos, stack))
+
+        return segments, None
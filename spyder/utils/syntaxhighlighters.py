@@ -14,6 +14,7 @@ from __future__ import print_function
 import keyword
 import os
 import re
+import time
 import weakref
 
 # Third party imports
@@ -21,7 +22,7 @@ from pygments.lexer import RegexLexer, bygroups
 from pygments.lexers import get_lexer_by_name
 from pygments.token import (Text, Other, Keyword, Name, String, Number,
                             Comment, Generic, Token)
-from qtpy.QtCore import Qt, QTimer, Signal
+from qtpy.QtCore import Qt, QTimer, Signal, Slot
 from qtpy.QtGui import (QColor, QCursor, QFont, QSyntaxHighlighter,
                         QTextCharFormat, QTextOption)
 from qtpy.QtWidgets import QApplication
@@ -36,6 +37,7 @@ from spyder.plugins.editor.utils.editor import TextBlockHelper as tbh
 from spyder.plugins.editor.utils.editor import BlockUserData
 from spyder.utils.workers import WorkerManager
 from spyder.plugins.outlineexplorer.api import OutlineExplorerData
+from spyder.utils.incrementallexer import IncrementalLexer, NON_BMP_REGEX
 from spyder.utils.qstringhelpers import qstring_length
 
 
@@ -160,6 +162,9 @@ class BaseSH(QSyntaxHighlighter):
     NORMAL = 0
     # Syntax highlighting parameters.
     BLANK_ALPHA_FACTOR = 0.31
+    # Time spent highlighting each chunk of a document highlighted lazily
+    # before yielding to the event loop (in ms)
+    LAZY_CHUNK_TIME = 20
 
     sig_outline_explorer_data_changed = Signal()
 
@@ -188,6 +193,16 @@ class BaseSH(QSyntaxHighlighter):
         self.editor = None
         self.patterns = DEFAULT_COMPILED_PATTERNS
 
+        # Lazy highlighting: position of the first block not highlighted
+        # yet (None if the document is highlighted normally) and positions
+        # of the blocks after it already highlighted because visible
+        self._lazy_position = None
+        self._lazy_visible_blocks = set()
+        self._lazy_timer = QTimer(self)
+        self._lazy_timer.setSingleShot(True)
+        self._lazy_timer.setInterval(0)
+        self._lazy_timer.timeout.connect(self._highlight_next_chunk)
+
     def get_background_color(self):
         return QColor(self.background_color)
 
@@ -288,6 +303,11 @@ class BaseSH(QSyntaxHighlighter):
 
         :param text: text to highlight.
         """
+        if self._lazy_position is not None:
+            position = self.currentBlock().position()
+            if (position >= self._lazy_position and
+                    position not in self._lazy_visible_blocks):
+                return
         self.highlight_block(text)
 
     def highlight_block(self, text):
@@ -356,6 +376,89 @@ class BaseSH(QSyntaxHighlighter):
         QSyntaxHighlighter.rehighlight(self)
         QApplication.restoreOverrideCursor()
 
+    # ---- Lazy highlighting
+    def is_lazy_highlighting(self):
+        """Return True if the document is being highlighted lazily."""
+        return self._lazy_position is not None
+
+    def start_lazy_highlighting(self):
+        """
+        Highlight the document lazily, which is faster for long documents.
+
+        Blocks are not highlighted when the document changes but when they
+        become visible (see highlight_visible_blocks) and, from the start
+        of the document, in short chunks run when the event loop is idle.
+        """
+        if self._lazy_position is None:
+            self.document().contentsChange.connect(
+                self._on_lazy_contents_change)
+        self._lazy_position = 0
+        self._lazy_visible_blocks = set()
+        self._lazy_timer.start()
+        if self.editor is not None:
+            self.highlight_visible_blocks(
+                [block for __, __, block in self.editor.visible_blocks])
+
+    def stop_lazy_highlighting(self):
+        """Highlight blocks again as soon as the document changes."""
+        if self._lazy_position is None:
+            return
+        self._lazy_timer.stop()
+        self._lazy_position = None
+        self._lazy_visible_blocks = set()
+        document = self.document()
+        if document is not None:
+            document.contentsChange.disconnect(self._on_lazy_contents_change)
+
+    def highlight_visible_blocks(self, blocks):
+        """Highlight the blocks of `blocks` not highlighted yet."""
+        if self._lazy_position is None:
+            return
+        for block in blocks:
+            position = block.position()
+            if (position >= self._lazy_position and
+                    position not in self._lazy_visible_blocks):
+                self._lazy_visible_blocks.add(position)
+                self.highlight_lazy_block(block)
+
+    def highlight_lazy_block(self, block):
+        """Highlight a block skipped by lazy highlighting."""
+        self.rehighlightBlock(block)
+
+    @Slot()
+    def _highlight_next_chunk(self):
+        """Highlight the blocks after the lazy position for a while."""
+        document = self.document()
+        if self._lazy_position is None or document is None:
+            return
+        block = document.findBlock(self._lazy_position)
+        start_time = time.time()
+        while block.isValid():
+            next_block = block.next()
+            if next_block.isValid():
+                self._lazy_position = next_block.position()
+            else:
+                self._lazy_position = document.characterCount()
+            self.highlight_lazy_block(block)
+            block = next_block
+            if (time.time() - start_time) * 1000 > self.LAZY_CHUNK_TIME:
+                break
+        if block.isValid():
+            self._lazy_timer.start()
+        else:
+            self.stop_lazy_highlighting()
+
+    @Slot(int, int, int)
+    def _on_lazy_contents_change(self, position, chars_removed, chars_added):
+        """Move lazy highlighting positions after a document change."""
+        delta = chars_added - chars_removed
+        if position < self._lazy_position:
+            self._lazy_position = max(self._lazy_position + delta, position)
+        self._lazy_visible_blocks = set(
+            block_position + delta if block_position > position
+            else block_position
+            for block_position in self._lazy_visible_blocks)
+
 
 class TextSH(BaseSH):
     """Simple Text Syntax Highlighter Class (only highlight spaces)"""
@@ -482,6 +585,25 @@ class PythonSH(BaseSH):
     (NORMAL, INSIDE_SQ3STRING, INSIDE_DQ3STRING,
      INSIDE_SQSTRING, INSIDE_DQSTRING,
      INSIDE_NON_MULTILINE_STRING) = list(range(6))
+    MULTILINE_STRING_STATES = frozenset([
+        INSIDE_DQ3STRING, INSIDE_SQ3STRING, INSIDE_DQSTRING, INSIDE_SQSTRING])
+    STRING_STATES = MULTILINE_STRING_STATES | {INSIDE_NON_MULTILINE_STRING}
+    # Text prepended to blocks continuing a string and its offset
+    STRING_CONTINUATIONS = {INSIDE_DQ3STRING: (r'""" ', -4),
+                            INSIDE_SQ3STRING: (r"''' ", -4),
+                            INSIDE_DQSTRING: (r'" ', -2),
+                            INSIDE_SQSTRING: (r"' ", -2)}
+    # States after matches of unfinished strings
+    UNFINISHED_STRING_STATES = {"uf_sq3string": INSIDE_SQ3STRING,
+                                "uf_dq3string": INSIDE_DQ3STRING,
+                                "uf_sqstring": INSIDE_SQSTRING,
+                                "uf_dqstring": INSIDE_DQSTRING,
+                                "ufe_sqstring": INSIDE_NON_MULTILINE_STRING,
+                                "ufe_dqstring": INSIDE_NON_MULTILINE_STRING}
+    # Keywords handled by highlight_match, besides setting their format
+    SPECIAL_KEYWORDS = frozenset([
+        "def", "class", "elif", "else", "except", "finally", "for", "if",
+        "try", "while", "with", "import"])
     DEF_TYPES = {"def": OutlineExplorerData.FUNCTION,
                  "class": OutlineExplorerData.CLASS}
     # Comments suitable for Outline Explorer
@@ -586,18 +708,10 @@ class PythonSH(BaseSH):
         """Implement specific highlight for Python."""
         text = to_text_string(text)
         prev_state = tbh.get_state(self.currentBlock().previous())
-        if prev_state == self.INSIDE_DQ3STRING:
-            offset = -4
-            text = r'""" '+text
-        elif prev_state == self.INSIDE_SQ3STRING:
-            offset = -4
-            text = r"''' "+text
-        elif prev_state == self.INSIDE_DQSTRING:
-            offset = -2
-            text = r'" '+text
-        elif prev_state == self.INSIDE_SQSTRING:
-            offset = -2
-            text = r"' "+text
+        continuation = self.STRING_CONTINUATIONS.get(prev_state)
+        if continuation is not None:
+            prefix, offset = continuation
+            text = prefix + text
         else:
             offset = 0
             prev_state = self.NORMAL
@@ -605,34 +719,44 @@ class PythonSH(BaseSH):
         oedata = None
         import_stmt = None
 
-        self.setFormat(0, qstring_length(text), self.formats["normal"])
+        formats = self.formats
+        self.setFormat(0, qstring_length(text), formats["normal"])
 
+        # Spans of matches only need to be converted to UTF-16 offsets if
+        # the text has characters outside of the BMP
+        utf16 = NON_BMP_REGEX is not None and NON_BMP_REGEX.search(text)
+        special_keywords = self.SPECIAL_KEYWORDS
         state = self.NORMAL
-        match = self.PROG.search(text)
-        while match:
-            for key, value in list(match.groupdict().items()):
-                if value:
-                    state, import_stmt, oedata = self.highlight_match(
-                        text, match, key, value, offset,
-                        state, import_stmt, oedata)
-
-            match = self.PROG.search(text, match.end())
+        for match in self.PROG.finditer(text):
+            # Only one named group matches, which is the last one closed
+            key = match.lastgroup
+            value = match.group(key)
+            if not value:
+                continue
+            if (key == "comment" or key in self.UNFINISHED_STRING_STATES or
+                    (key == "keyword" and value in special_keywords)):
+                state, import_stmt, oedata = self.highlight_match(
+                    text, match, key, value, offset,
+                    state, import_stmt, oedata)
+                continue
+            if utf16:
+                start, end = get_span(match, key)
+            else:
+                start, end = match.span(key)
+            start = max(0, start + offset)
+            end = max(0, end + offset)
+            self.setFormat(start, end - start, formats[key])
 
         tbh.set_state(self.currentBlock(), state)
 
         # Use normal format for indentation and trailing spaces
         # Unless we are in a string
-        states_multiline_string = [
-            self.INSIDE_DQ3STRING, self.INSIDE_SQ3STRING,
-            self.INSIDE_DQSTRING, self.INSIDE_SQSTRING]
-        states_string = states_multiline_string + [
-            self.INSIDE_NON_MULTILINE_STRING]
-        self.formats['leading'] = self.formats['normal']
-        if prev_state in states_multiline_string:
-            self.formats['leading'] = self.formats["string"]
-        self.formats['trailing'] = self.formats['normal']
-        if state in states_string:
-            self.formats['trailing'] = self.formats['string']
+        formats['leading'] = formats['normal']
+        if prev_state in self.MULTILINE_STRING_STATES:
+            formats['leading'] = formats["string"]
+        formats['trailing'] = formats['normal']
+        if state in self.STRING_STATES:
+            formats['trailing'] = formats['string']
         self.highlight_extras(text, offset)
 
         block = self.currentBlock()
@@ -1132,7 +1256,7 @@ class MarkdownSH(BaseSH):
     NORMAL = 0
     CODE = 1
 
-    def highlightBlock(self, text):
+    def highlight_block(self, text):
         text = to_text_string(text)
         previous_state = self.previousBlockState()
 
@@ -1246,25 +1370,51 @@ class PygmentsSH(BaseSH):
         self._worker_manager = WorkerManager()
 
         # Store the format for all the tokens after Pygments parsing
-        self._charlist = []
+        self._incremental_lexer = None
+        if self._lexer is not None:
+            self._incremental_lexer = IncrementalLexer(self._lexer,
+                                                       self._get_format)
 
         # Flag variable to avoid unnecessary highlights if the worker has not
         # yet finished processing
         self._allow_highlight = True
 
+    def _get_format(self, typ):
+        """Get the Spyder format code for the given Pygments token type."""
+        tokmap = self._tokmap
+        # Exact matches first
+        if typ in tokmap:
+            return tokmap[typ]
+        # Partial (parent-> child) matches
+        for key, val in tokmap.items():
+            if typ in key: # Checks if typ is a subtype of key.
+                return val
+
+        return 'normal'
+
     def make_charlist(self):
-        """Parses the complete text and stores format for each character."""
+        """Parses the changed text and stores the formats of the text."""
 
         def worker_output(worker, output, error):
             """Worker finished callback."""
-            self._charlist = output
-            if error is None and output:
+            if error is None and output is not None:
+                self._incremental_lexer, changed_lines = output
                 self._allow_highlight = True
-                self.rehighlight()
+                if changed_lines is None and self.is_lazy_highlighting():
+                    self.start_lazy_highlighting()
+                elif changed_lines is None:
+                    self.rehighlight()
+                else:
+                    document = self.document()
+                    for line in changed_lines:
+                        block = document.findBlockByNumber(line)
+                        if block.isValid():
+                            self.rehighlightBlock(block)
             self._allow_highlight = False
 
+        if self._incremental_lexer is None:
+            return
         text = to_text_string(self.document().toPlainText())
-        tokens = self._lexer.get_tokens(text)
 
         # Before starting a new worker process make sure to end previous
         # incarnations
@@ -1272,57 +1422,47 @@ class PygmentsSH(BaseSH):
 
         worker = self._worker_manager.create_python_worker(
             self._make_charlist,
-            tokens,
-            self._tokmap,
-            self.formats,
+            self._incremental_lexer,
+            text,
         )
         worker.sig_finished.connect(worker_output)
         worker.start()
 
-    def _make_charlist(self, tokens, tokmap, formats):
+    def _make_charlist(self, incremental_lexer, text):
         """
-        Parses the complete text and stores format for each character.
+        Parses the changed text and returns the formats of the text.
 
         Uses the attached lexer to parse into a list of tokens and Pygments
-        token types.  Then breaks tokens into individual letters, each with a
-        Spyder token type attached.  Stores this list as self._charlist.
+        token types, from the last lexer state saved before the first
+        changed line until the state becomes the same as before the
+        change. Then maps each token to a Spyder format name.
 
-        It's attached to the contentsChange signal of the parent QTextDocument
-        so that the charlist is updated whenever the document changes.
+        Returns the updated incremental lexer and the lines whose formats
+        changed (None if all of them have to be highlighted again).
         """
+        return incremental_lexer.relex(text)
 
-        def _get_fmt(typ):
-            """Get the Spyder format code for the given Pygments token type."""
-            # Exact matches first
-            if typ in tokmap:
-                return tokmap[typ]
-            # Partial (parent-> child) matches
-            for key, val in tokmap.items():
-                if typ in key: # Checks if typ is a subtype of key.
-                    return val
-
-            return 'normal'
-
-        charlist = []
-        for typ, token in tokens:
-            fmt = formats[_get_fmt(typ)]
-            for letter in token:
-                charlist.append((fmt, letter))
-
-        return charlist
-
-    def highlightBlock(self, text):
+    def highlight_block(self, text):
         """ Actually highlight the block"""
-        # Note that an undefined blockstate is equal to -1, so the first block
-        # will have the correct behaviour of starting at 0.
         if self._allow_highlight:
-            start = self.previousBlockState() + 1
-            end = start + qstring_length(text)
-            for i, (fmt, letter) in enumerate(self._charlist[start:end]):
-                self.setFormat(i, 1, fmt)
-            self.setCurrentBlockState(end)
+            formats = self.formats
+            line = self.currentBlock().blockNumber()
+            for start, length, name in self._incremental_lexer.get_line_runs(
+                    line):
+                self.setFormat(start, length, formats[name])
+            # Formats don't depend on the previous block, so the state is
+            # constant to avoid highlighting the next blocks again
+            self.setCurrentBlockState(self.NORMAL)
             self.highlight_extras(text)
 
+    def highlight_lazy_block(self, block):
+        """Highlight a block skipped by lazy highlighting."""
+        # Formats of the lexer are used outside of worker_output here
+        allow_highlight = self._allow_highlight
+        self._allow_highlight = True
+        BaseSH.highlight_lazy_block(self, block)
+        self._allow_highlight = allow_highlight
+
 
 class PythonLoggingLexer(RegexLexer):
     """
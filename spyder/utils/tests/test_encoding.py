@@ -9,7 +9,8 @@ import pytest
 import os
 import stat
 
-from spyder.utils.encoding import is_text_file, get_coding, write
+from spyder.utils.encoding import (is_text_file, get_coding, write,
+                                   TextFileCache)
 from spyder.py3compat import to_text_string
 
 __location__ = os.path.realpath(os.path.join(os.getcwd(),
@@ -42,6 +43,46 @@ def test_is_text_file(tmpdir):
     assert is_text_file(str(p)) == True
 
 
+def test_text_file_cache(tmpdir, mocker):
+    """Check that files are only classified again when they change."""
+    from spyder.utils import encoding
+    is_binary = mocker.spy(encoding, 'is_binary')
+
+    cache = TextFileCache()
+    p = tmpdir.join("random_text.txt")
+    p.write("Some random text")
+    assert cache.is_text_file(str(p))
+    assert cache.is_text_file(str(p))
+    assert is_binary.call_count == 1
+
+    p.write("Some other random text")
+    assert cache.is_text_file(str(p))
+    assert is_binary.call_count == 2
+
+    binary = tmpdir.join("binary.pyc")
+    binary.write_binary(b"\x00\x01\x02")
+    assert not cache.is_text_file(str(binary))
+    assert not cache.is_text_file(str(tmpdir.join("missing.txt")))
+
+
+def test_text_file_cache_persistence(tmpdir):
+    """Check saving and loading text file classifications."""
+    p = tmpdir.join("random_text.txt")
+    p.write("Some random text")
+    cache = TextFileCache()
+    cache.is_text_file(str(p))
+    cache_path = str(tmpdir.join("cache.pickle"))
+    assert cache.save(cache_path)
+
+    new_cache = TextFileCache()
+    assert new_cache.load(cache_path)
+    assert new_cache.get_cached_entry(str(p))[2]
+
+    # Entries are not valid anymore once the file changes
+    p.write("Some other random text")
+    assert new_cache.get_cached_entry(str(p)) is None
+
+
 @pytest.mark.parametrize(
     'expected_encoding, text_file',
     [('utf-8', 'utf-8.txt'),
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""
+Micro-benchmark of the Python syntax highlighter.
+
+Run this module with Python to print the number of blocks highlighted per
+second on the reference corpus, with and without the direct dispatch of
+matches.
+"""
+
+# Standard library imports
+import time
+
+# Third party imports
+import pytest
+from qtpy.QtGui import QSyntaxHighlighter, QTextDocument
+
+# Local imports
+from spyder.utils.qthelpers import qapplication
+from spyder.utils.syntaxhighlighters import PythonSH
+
+
+# Reference corpus, with the constructs handled by the highlighter
+REFERENCE_MODULE = u'''\
+# -*- coding: utf-8 -*-
+# %% Imports
+"""
+Module docstring with 'quotes' and a "double quoted" part.
+"""
+from __future__ import print_function
+import os.path as osp
+import re
+
+# ---- Constants
+PATTERN = re.compile(r"(?P<name>\\w+)\\s*=\\s*(?P<value>.+)$")
+NUMBERS = [0, 1, -2, 3.14, 1e-10, 0x1F, 0o17, 0b101, 1_000_000, 2j]
+GREETING = u'Hello, wörld! 😀'
+
+
+class Spam(object):
+    """Class docstring."""
+
+    def __init__(self, eggs=None, *args, **kwargs):
+        self.eggs = eggs if eggs is not None else []
+        self.text = 'a string that continues \\
+on the next line'
+
+    @property
+    def size(self):
+        # Return the number of eggs
+        return len(self.eggs)
+
+    async def cook(self, minutes=10):
+        for i in range(minutes):
+            try:
+                await self.wait(i)
+            except (ValueError, TypeError) as error:
+                print("Error: {0}".format(error), file=sys.stderr)
+            finally:
+                pass
+        while True:
+            if self.size > 2 and not self.eggs[0]:
+                break
+            elif self.size:
+                continue
+            else:
+                return None
+        with open(osp.join('spam', "eggs.txt")) as f:
+            lines = [line.strip() for line in f if line]
+        return lambda x: x ** 2 + sum(lines, 0)
+'''
+
+# Number of copies of the reference module in the corpus
+CORPUS_COPIES = 100
+
+# Number of times the corpus is highlighted (the best time is kept)
+REPEATS = 3
+
+
+class AllKeys(object):
+    """Container with every key, to route all matches to highlight_match."""
+
+    def __contains__(self, key):
+        return True
+
+
+class HighlightMatchPythonSH(PythonSH):
+    """PythonSH that highlights every match with highlight_match."""
+    UNFINISHED_STRING_STATES = AllKeys()
+
+
+class RecordingPythonSH(PythonSH):
+    """PythonSH that records the matches passed to highlight_match."""
+
+    def __init__(self, *args, **kwargs):
+        PythonSH.__init__(self, *args, **kwargs)
+        self.highlighted_matches = []
+
+    def highlight_match(self, text, match, key, value, *args):
+        self.highlighted_matches.append((key, value))
+        return PythonSH.highlight_match(self, text, match, key, value, *args)
+
+
+def get_formats(sh_class, text):
+    """Return the highlighter of `text` and the formats of its blocks."""
+    doc = QTextDocument()
+    doc.setPlainText(text)
+    sh = sh_class(doc, color_scheme='Spyder')
+    QSyntaxHighlighter.rehighlight(sh)
+    formats = []
+    block = doc.firstBlock()
+    while block.isValid():
+        formats.append([(f.start, f.length, f.format.foreground().color())
+                        for f in block.layout().formats()])
+        block = block.next()
+    return sh, formats
+
+
+def measure_blocks_per_second(sh_class, text, repeats=REPEATS):
+    """Return the number of blocks of `text` highlighted per second."""
+    doc = QTextDocument()
+    doc.setPlainText(text)
+    sh = sh_class(doc, color_scheme='Spyder')
+    best_time = None
+    for __ in range(repeats):
+        start_time = time.time()
+        QSyntaxHighlighter.rehighlight(sh)
+        elapsed_time = time.time() - start_time
+        if best_time is None or elapsed_time < best_time:
+            best_time = elapsed_time
+    return doc.blockCount() / max(best_time, 1e-6)
+
+
+def test_python_matches_dispatch(qtbot):
+    """
+    Test that only comments, unfinished strings and the keywords that
+    produce outline or import data go through highlight_match, and that
+    the other matches get the same formats as with it.
+    """
+    sh, formats = get_formats(RecordingPythonSH, REFERENCE_MODULE)
+    assert sh.highlighted_matches
+    for key, value in sh.highlighted_matches:
+        assert (key == 'comment' or key in PythonSH.UNFINISHED_STRING_STATES
+                or (key == 'keyword' and value in PythonSH.SPECIAL_KEYWORDS))
+    assert get_formats(HighlightMatchPythonSH, REFERENCE_MODULE)[1] == formats
+
+
+@pytest.mark.slow
+def test_python_highlighting_speed(qtbot, record_property):
+    """
+    Measure the speed of PythonSH on the reference corpus, and of the
+    baseline highlighting every match with highlight_match.
+    """
+    text = REFERENCE_MODULE * CORPUS_COPIES
+    record_property('blocks_per_second',
+                    measure_blocks_per_second(PythonSH, text))
+    record_property('baseline_blocks_per_second',
+                    measure_blocks_per_second(HighlightMatchPythonSH, text))
+
+
+if __name__ == '__main__':
+    app = qapplication()
+    for sh_class in (PythonSH, HighlightMatchPythonSH):
+        print('{0}: {1:.0f} blocks per second'.format(
+            sh_class.__name__,
+            measure_blocks_per_second(sh_class,
+                                      REFERENCE_MODULE * CORPUS_COPIES)))
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+
+"""Tests for incrementallexer.py"""
+
+# Standard library imports
+import random
+
+# Third party imports
+from pygments.lexers import get_lexer_by_name
+from pygments.token import Comment, Keyword, Name, String
+import pytest
+
+# Local imports
+from spyder.utils.incrementallexer import (FormatRuns, IncrementalLexer,
+                                           reads_following_lines,
+                                           supports_incremental_lexing)
+
+
+SQL_TEXT = u"""\
+/* Create the
+   table */
+CREATE TABLE spam (
+    id INTEGER, -- The id
+    name VARCHAR(10)
+);
+SELECT name FROM spam WHERE name = 'eggs
+and ham';
+"""
+
+
+def get_format(tokentype):
+    for parent, name in [(Comment, 'comment'), (Keyword, 'keyword'),
+                         (String, 'string'), (Name.Builtin, 'builtin')]:
+        if tokentype in parent:
+            return name
+    return 'normal'
+
+
+def get_all_runs(incremental_lexer):
+    return [incremental_lexer.get_line_runs(line)
+            for line in range(len(incremental_lexer))]
+
+
+def lex(text, lexer, checkpoint_interval=2):
+    incremental_lexer = IncrementalLexer(lexer, get_format,
+                                         checkpoint_interval)
+    return incremental_lexer.relex(text)[0]
+
+
+def test_format_runs():
+    """Test storing formats as runs of characters."""
+    runs = FormatRuns()
+    for length, name in [(3, 'keyword'), (1, 'normal'), (2, 'normal'),
+                         (0, 'string'), (4, 'string'), (2, 'keyword')]:
+        runs.append(length, name)
+    assert len(runs) == 4
+    assert runs.length == 12
+    assert runs.get_runs(0, 12) == [(0, 3, 'keyword'), (3, 3, 'normal'),
+                                    (6, 4, 'string'), (10, 2, 'keyword')]
+    assert runs.get_runs(4, 8) == [(0, 2, 'normal'), (2, 2, 'string')]
+    assert runs.get_runs(11, 20) == [(0, 1, 'keyword')]
+    assert runs.get_runs(12, 20) == []
+
+
+def test_supports_incremental_lexing():
+    """Test which lexers can be lexed incrementally."""
+    assert supports_incremental_lexing(get_lexer_by_name('sql'))
+    assert supports_incremental_lexing(get_lexer_by_name('markdown'))
+    assert not supports_incremental_lexing(get_lexer_by_name('yaml'))
+    assert not supports_incremental_lexing(get_lexer_by_name('cpp'))
+
+
+def test_reads_following_lines():
+    """Test which lexers have rules that depend on the following lines."""
+    assert reads_following_lines(get_lexer_by_name('python'))
+    assert reads_following_lines(get_lexer_by_name('markdown'))
+    assert not reads_following_lines(get_lexer_by_name('diff'))
+    assert not reads_following_lines(get_lexer_by_name('tex'))
+
+
+def test_line_runs():
+    """Test the formats of each line."""
+    incremental_lexer = lex(SQL_TEXT, get_lexer_by_name('sql'))
+    assert len(incremental_lexer) == 9
+    assert incremental_lexer.get_line_runs(0) == [(0, 13, 'comment')]
+    assert incremental_lexer.get_line_runs(1) == [(0, 11, 'comment')]
+    assert incremental_lexer.get_line_runs(6)[-2:] == [(27, 8, 'normal'),
+                                                       (35, 5, 'string')]
+    assert incremental_lexer.get_line_runs(7) == [(0, 8, 'string'),
+                                                  (8, 1, 'normal')]
+    assert incremental_lexer.get_line_runs(8) == []
+
+
+def test_relex_changed_lines():
+    """Test that only the lines whose formats changed are reported."""
+    lexer = get_lexer_by_name('sql')
+    incremental_lexer = lex(SQL_TEXT, lexer)
+
+    text = SQL_TEXT.replace('name VARCHAR', 'title VARCHAR')
+    new_lexer, changed_lines = incremental_lexer.relex(text)
+    assert changed_lines == [4]
+    assert get_all_runs(new_lexer) == get_all_runs(lex(text, lexer))
+
+    # Closing the comment early changes the formats of the next line
+    text = SQL_TEXT.replace('the\n', 'the */\n')
+    new_lexer, changed_lines = incremental_lexer.relex(text)
+    assert changed_lines == [0, 1]
+    assert get_all_runs(new_lexer) == get_all_runs(lex(text, lexer))
+
+    new_lexer, changed_lines = new_lexer.relex(text)
+    assert changed_lines == []
+
+
+@pytest.mark.parametrize('language', ['sql', 'markdown', 'yaml'])
+def test_relex_random_changes(language):
+    """Test that incremental lexing gives the same formats as a full one."""
+    random.seed(0)
+    lexer = get_lexer_by_name(language)
+    text = SQL_TEXT * 3
+    incremental_lexer = lex(text, lexer)
+    for __ in range(200):
+        position = random.randint(0, len(text))
+        removed = random.randint(0, min(5, len(text) - position))
+        inserted = u''.join(random.choice(u"ab\n '*/#-")
+                            for __ in range(random.randint(0, 4)))
+        text = text[:position] + inserted + text[position + removed:]
+        incremental_lexer, __ = incremental_lexer.relex(text)
+        assert get_all_runs(incremental_lexer) == get_all_runs(
+            lex(text, lexer))
+        assert len(incremental_lexer) == text.count('\n') + 1
+
+
+@pytest.mark.parametrize('language, text, new_text', [
+    ('python', u' ```\n""" 1\nx\n{```\n', u' ```\n""" 1\nx\n{`"""}`\n'),
+    ('markdown', u'```\n"\n"""1def #``}`', u'```\n"\n```\n#1def #``}`')])
+def test_relex_multiline_rules(language, text, new_text):
+    """Test changes that modify the tokens of lines before them."""
+    lexer = get_lexer_by_name(language)
+    # Use token types as formats, to tell apart all of them
+    incremental_lexer = IncrementalLexer(lexer, str, checkpoint_interval=1)
+    new_lexer, __ = incremental_lexer.relex(text)[0].relex(new_text)
+    assert get_all_runs(new_lexer) == get_all_runs(
+        incremental_lexer.relex(new_text)[0])
+
+
+@pytest.mark.parametrize('language', ['python', 'markdown', 'sql', 'rst',
+                                      'diff'])
+def test_relex_random_multiline_changes(language):
+    """
+    Test that incremental lexing gives the same formats as a full one after
+    random changes of multi-line constructs.
+    """
+    random.seed(1)
+    lexer = get_lexer_by_name(language)
+    fragments = [u'\n', u'"""', u'```', u"'", u'"', u'`', u'#', u'a',
+                 u' ', u'{', u'}', u'/*', u'*/', u'===']
+    for __ in range(20):
+        text = u''.join(random.choice(fragments) for __ in range(20))
+        incremental_lexer = lex(text, lexer, checkpoint_interval=1)
+        for __ in range(20):
+            position = random.randint(0, len(text))
+            removed = random.randint(0, min(4, len(text) - position))
+            inserted = u''.join(random.choice(fragments)
+                                for __ in range(random.randint(0, 3)))
+            text = text[:position] + inserted + text[position + removed:]
+            incremental_lexer, __ = incremental_lexer.relex(text)
+            assert get_all_runs(incremental_lexer) == get_all_runs(
+                lex(text, lexer, checkpoint_interval=1))
+
+
+if __name__ == '__main__':
+    pytest.main()
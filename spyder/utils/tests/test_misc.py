@@ -15,7 +15,7 @@ import os
 import pytest
 
 # Local imports
-from spyder.utils.misc import get_common_path
+from spyder.utils.misc import count_lines, get_common_path
 
 def test_get_common_path():
     """Test getting the common path."""
@@ -35,5 +35,16 @@ def test_get_common_path():
                                 ]) == '/Python'
 
 
+def test_count_lines(tmpdir):
+    """Test counting lines of code, skipping ignored directories."""
+    tmpdir.join('.gitignore').write('ignored/\n')
+    tmpdir.join('spam.py').write('spam = 1\neggs = 2\n')
+    tmpdir.join('spam.txt').write('spam\n')
+    tmpdir.mkdir('build').join('build.py').write('build = 1\n')
+    tmpdir.mkdir('ignored').join('ignored.py').write('ignored = 1\n')
+    tmpdir.mkdir('sub').join('sub.py').write('sub = 1\n')
+    assert count_lines(str(tmpdir)) == (2, 3)
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -96,6 +96,28 @@ def test_Markdown_basic():
     compare_formats(doc.firstBlock().layout().additionalFormats(), res, sh)
 
 
+def test_lazy_highlighting(qtbot):
+    """Test that blocks are highlighted when visible or in idle time."""
+    doc = QTextDocument()
+    sh = PythonSH(doc, color_scheme='Spyder')
+    sh.start_lazy_highlighting()
+    doc.setPlainText('def spam():\n    return 1\n' * 1000)
+    first_block = doc.firstBlock()
+    last_block = doc.lastBlock().previous()
+    assert sh.is_lazy_highlighting()
+    assert not last_block.layout().additionalFormats()
+
+    sh.highlight_visible_blocks([last_block])
+    compare_formats(last_block.layout().additionalFormats(),
+                    [(0, 4, 'normal'), (4, 6, 'keyword'), (10, 1, 'normal'),
+                     (11, 1, 'number')], sh)
+
+    qtbot.waitUntil(lambda: not sh.is_lazy_highlighting())
+    compare_formats(first_block.layout().additionalFormats(),
+                    [(0, 3, 'keyword'), (3, 1, 'normal'),
+                     (4, 4, 'definition'), (8, 3, 'normal')], sh)
+
+
 @pytest.mark.parametrize('line', ['# --- First variant',
                                   '#------ 2nd variant',
                                   '### 3rd variant'])
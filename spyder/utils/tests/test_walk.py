@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for walk.py
+"""
+
+# Standard library imports
+import os.path as osp
+import re
+
+# Test library imports
+import pytest
+
+# Local imports
+from spyder.py3compat import to_text_string
+from spyder.utils.walk import DirectoryWalker, IgnoreRules, walk_files
+
+
+@pytest.fixture
+def tree(tmpdir):
+    """Create a directory tree with ignore files."""
+    tmpdir.join('.gitignore').write('*.log\n'
+                                    'build/\n'
+                                    '/top.txt\n'
+                                    'docs/**/*.html\n'
+                                    '!keep.log\n')
+    tmpdir.join('spam.py').write('spam\n')
+    tmpdir.join('top.txt').write('top\n')
+    tmpdir.join('debug.log').write('log\n')
+    tmpdir.join('keep.log').write('log\n')
+    tmpdir.mkdir('build').join('out.py').write('out\n')
+    sub = tmpdir.mkdir('sub')
+    sub.join('top.txt').write('top\n')
+    sub.join('.ignore').write('*.tmp\n!*.log\n')
+    sub.join('eggs.tmp').write('tmp\n')
+    sub.join('sub.log').write('log\n')
+    sub.mkdir('build').join('out.py').write('out\n')
+    docs = tmpdir.mkdir('docs')
+    docs.mkdir('api').join('index.html').write('html\n')
+    docs.join('index.rst').write('rst\n')
+    venv = tmpdir.mkdir('venv')
+    venv.join('pyvenv.cfg').write('home = /usr\n')
+    venv.join('site.py').write('site\n')
+    tmpdir.mkdir('.git').join('config').write('config\n')
+    return tmpdir
+
+
+def get_files(root, **kwargs):
+    root = to_text_string(root)
+    return sorted(osp.relpath(f, root).replace(osp.sep, '/')
+                  for f in walk_files(root, **kwargs))
+
+
+def test_ignore_rules():
+    """Test matching gitignore patterns."""
+    rules = IgnoreRules(['# comment', '', '*.py[co]', 'dir/', '/anchored',
+                         'a/**/b', '\\#hash', '!important.pyc'])
+    assert rules.match('spam.pyc', False)
+    assert rules.match('sub/spam.pyo', False)
+    assert rules.match('important.pyc', False) is False
+    assert rules.match('spam.py', False) is None
+    assert rules.match('sub/dir', True)
+    assert rules.match('sub/dir', False) is None
+    assert rules.match('anchored', False)
+    assert rules.match('sub/anchored', False) is None
+    assert rules.match('a/b', True)
+    assert rules.match('a/x/y/b', True)
+    assert rules.match('#hash', False)
+
+
+def test_walk_files(tree):
+    """Test that ignored files and directories are not walked."""
+    assert get_files(tree) == ['.gitignore', 'docs/index.rst', 'keep.log',
+                               'spam.py', 'sub/.ignore', 'sub/sub.log',
+                               'sub/top.txt']
+
+
+def test_walk_files_options(tree):
+    """Test disabling ignore files and excluding paths."""
+    files = get_files(tree, use_ignore_files=False, skip_virtualenvs=False)
+    assert 'build/out.py' in files
+    assert 'venv/site.py' in files
+    assert '.git/config' not in files
+
+    files = get_files(tree, exclude=re.compile(r'sub' + re.escape(osp.sep)))
+    assert not [f for f in files if f.startswith('sub/')]
+
+
+def test_walk_subdirectory(tree):
+    """Test walking a subdirectory with the rules of its ancestors."""
+    walker = DirectoryWalker(to_text_string(tree))
+    files = list(walker.walk(to_text_string(tree.join('sub'))))
+    assert sorted(osp.basename(f) for f in files) == ['.ignore', 'sub.log',
+                                                      'top.txt']
+    assert list(walker.walk(to_text_string(tree.join('build')))) == []
+
+
+def test_is_ignored(tree):
+    """Test checking if a path is ignored."""
+    walker = DirectoryWalker(to_text_string(tree))
+    assert walker.is_ignored(to_text_string(tree.join('debug.log')))
+    assert walker.is_ignored(to_text_string(tree.join('build', 'out.py')))
+    assert walker.is_ignored(to_text_string(tree.join('venv', 'site.py')))
+    assert walker.is_ignored(to_text_string(tree.join('sub', 'eggs.tmp')))
+    assert not walker.is_ignored(to_text_string(tree.join('sub', 'sub.log')))
+    assert not walker.is_ignored(to_text_string(tree.join('spam.py')))
+    assert not walker.is_ignored(to_text_string(tree))
+
+
+if __name__ == "__main__":
+    pytest.main()
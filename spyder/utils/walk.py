@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Fast directory walker honouring .gitignore and .ignore files.
+
+It's used to scan directories when searching in files, indexing projects or
+counting lines of code.
+"""
+
+# Standard library imports
+import os
+import os.path as osp
+import re
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        # Backport for Python 2
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+
+# Names of the files with ignore rules, in order of precedence
+IGNORE_FILES = ('.gitignore', '.ignore')
+
+# Directories that are never walked
+SKIPPED_DIRS = ('.git', '.hg', '.svn')
+
+# File present at the root of virtual environments
+VIRTUALENV_FILE = 'pyvenv.cfg'
+
+
+def translate_pattern(pattern):
+    """Translate a gitignore glob pattern to a regular expression."""
+    i, n = 0, len(pattern)
+    res = []
+    while i < n:
+        c = pattern[i]
+        i += 1
+        if c == '*':
+            if pattern[i:i + 1] == '*':
+                i += 1
+                if pattern[i:i + 1] == '/':
+                    # Zero or more directories
+                    i += 1
+                    res.append('(?:.*/)?')
+                else:
+                    res.append('.*')
+            else:
+                res.append('[^/]*')
+        elif c == '?':
+            res.append('[^/]')
+        elif c == '[':
+            j = i
+            if j < n and pattern[j] in '!^':
+                j += 1
+            if j < n and pattern[j] == ']':
+                j += 1
+            while j < n and pattern[j] != ']':
+                j += 1
+            if j >= n:
+                res.append('\\[')
+            else:
+                chars = pattern[i:j].replace('\\', '\\\\')
+                i = j + 1
+                if chars[0] in '!^':
+                    chars = '^' + chars[1:]
+                res.append('[{0}]'.format(chars))
+        elif c == '\\' and i < n:
+            res.append(re.escape(pattern[i]))
+            i += 1
+        else:
+            res.append(re.escape(c))
+    return ''.join(res)
+
+
+class IgnoreRules(object):
+    """Rules of an ignore file, relative to the directory containing it."""
+
+    def __init__(self, lines):
+        # List of (regex, negated, dir_only) tuples
+        self.rules = []
+        for line in lines:
+            rule = self.parse_rule(line)
+            if rule is not None:
+                self.rules.append(rule)
+
+        # When there are no negated rules, the first match is enough to know
+        # that a path is ignored, so all rules can be joined in one regex
+        self._any_dir = None
+        self._any_file = None
+        if not any(negated for __, negated, __ in self.rules):
+            dir_patterns = [regex.pattern for regex, __, __ in self.rules]
+            file_patterns = [regex.pattern
+                             for regex, __, dir_only in self.rules
+                             if not dir_only]
+            if dir_patterns:
+                self._any_dir = re.compile('|'.join(dir_patterns))
+            if file_patterns:
+                self._any_file = re.compile('|'.join(file_patterns))
+
+    @classmethod
+    def from_file(cls, filename):
+        """Read the rules of `filename`."""
+        try:
+            with open(filename, 'rb') as f:
+                lines = f.read().decode('utf-8', 'replace').splitlines()
+        except (IOError, OSError):
+            lines = []
+        return cls(lines)
+
+    @staticmethod
+    def parse_rule(line):
+        """Parse a line of an ignore file."""
+        if not line.strip() or line.startswith('#'):
+            return None
+
+        # Trailing spaces are ignored unless escaped
+        stripped = line.rstrip()
+        if stripped.endswith('\\') and len(stripped) < len(line):
+            stripped += ' '
+        line = stripped
+
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        elif line.startswith('\\!') or line.startswith('\\#'):
+            line = line[1:]
+
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            return None
+
+        # Patterns with a slash are relative to the ignore file directory,
+        # the rest can match at any level
+        if '/' in line:
+            prefix = '^'
+            line = line.lstrip('/')
+        else:
+            prefix = '(?:^|/)'
+        regex = re.compile('{0}(?:{1})$'.format(prefix,
+                                                translate_pattern(line)))
+        return regex, negated, dir_only
+
+    def match(self, path, is_dir):
+        """
+        Match `path`, relative to the ignore file directory and using
+        forward slashes as separators.
+
+        Returns True if it's ignored, False if it's explicitly not ignored
+        and None if no rule applies to it.
+        """
+        if not self.rules:
+            return None
+        if self._any_dir is not None or self._any_file is not None:
+            regex = self._any_dir if is_dir else self._any_file
+            if regex is not None and regex.search(path):
+                return True
+            return None
+
+        result = None
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.search(path):
+                result = not negated
+        return result
+
+
+def _list_dir(path):
+    """Return the (name, is_dir, is_symlink) items of the directory `path`."""
+    items = []
+    if scandir is not None:
+        for entry in scandir(path):
+            try:
+                is_dir = entry.is_dir()
+                items.append((entry.name, is_dir,
+                              is_dir and entry.is_symlink()))
+            except OSError:
+                continue
+    else:
+        for name in os.listdir(path):
+            fullname = osp.join(path, name)
+            is_dir = osp.isdir(fullname)
+            items.append((name, is_dir, is_dir and osp.islink(fullname)))
+    return items
+
+
+class DirectoryWalker(object):
+    """
+    Walk the files of a directory tree.
+
+    Directories are pruned before descending into them when they're
+    excluded, ignored by the rules of the .gitignore and .ignore files found
+    in the tree, or are virtual environments. Symbolic links to directories
+    are not followed.
+
+    Parameters
+    ----------
+    root: str
+        Directory to walk.
+    exclude: compiled regular expression or None
+        Paths to exclude. It's searched in the full path of files and in the
+        full path of directories followed by a separator.
+    use_ignore_files: bool
+        Whether to honour .gitignore and .ignore files.
+    skipped_dirs: sequence of str
+        Names of the directories to always skip.
+    skip_virtualenvs: bool
+        Whether to skip virtual environments inside `root`.
+    """
+
+    def __init__(self, root, exclude=None, use_ignore_files=True,
+                 skipped_dirs=SKIPPED_DIRS, skip_virtualenvs=True):
+        self.root = osp.abspath(root)
+        self.exclude = exclude
+        self.use_ignore_files = use_ignore_files
+        self.skipped_dirs = set(skipped_dirs)
+        self.skip_virtualenvs = skip_virtualenvs
+
+    def walk(self, path=None, stopped=None):
+        """
+        Iterate over the paths of the files in the tree.
+
+        `path` is an optional subdirectory of the tree to walk instead of
+        the whole tree. `stopped` is an optional callable that returns True
+        when the walk has to be interrupted.
+        """
+        if path is None:
+            path = self.root
+            relpath = ''
+            rules = ()
+        else:
+            path = osp.abspath(path)
+            if self.is_ignored(path):
+                return
+            relpath = self._get_relpath(path)
+            if relpath is None:
+                return
+            rules = self._get_rules(relpath)
+
+        # Stack of (directory, relative path, rules) items, where rules are
+        # (ignore rules, path of the directory relative to their directory)
+        # tuples
+        stack = [(path, relpath, rules)]
+        while stack:
+            if stopped is not None and stopped():
+                return
+            path, relpath, rules = stack.pop()
+            try:
+                items = _list_dir(path)
+            except OSError:
+                continue
+
+            names = set(name for name, __, __ in items)
+            if (self.skip_virtualenvs and relpath and
+                    VIRTUALENV_FILE in names):
+                continue
+
+            if self.use_ignore_files:
+                new_rules = [(IgnoreRules.from_file(osp.join(path, name)), '')
+                             for name in IGNORE_FILES if name in names]
+                if new_rules:
+                    rules = rules + tuple(new_rules)
+
+            subdirs = []
+            for name, is_dir, is_symlink in items:
+                if stopped is not None and stopped():
+                    return
+                fullname = osp.join(path, name)
+                if is_dir:
+                    if is_symlink or self._is_excluded_dir(name, fullname):
+                        continue
+                elif (self.exclude is not None and
+                        self.exclude.search(fullname)):
+                    continue
+                if rules and self._is_ignored(rules, name, is_dir):
+                    continue
+                if is_dir:
+                    subdirs.append((fullname, name))
+                else:
+                    yield fullname
+
+            for fullname, name in reversed(subdirs):
+                subrelpath = relpath + '/' + name if relpath else name
+                subrules = tuple((ignore, prefix + name + '/')
+                                 for ignore, prefix in rules)
+                stack.append((fullname, subrelpath, subrules))
+
+    def __iter__(self):
+        return self.walk()
+
+    def _is_excluded_dir(self, name, fullname):
+        """Return True if a directory is skipped or excluded."""
+        return (name in self.skipped_dirs or
+                (self.exclude is not None and
+                 self.exclude.search(fullname + os.sep) is not None))
+
+    @staticmethod
+    def _is_ignored(rules, name, is_dir):
+        """Apply ignore rules, the last ones (deepest) having precedence."""
+        for ignore, prefix in reversed(rules):
+            result = ignore.match(prefix + name, is_dir)
+            if result is not None:
+                return result
+        return False
+
+    def _get_relpath(self, path):
+        """
+        Return the path of `path` relative to the root, using forward
+        slashes, or None if it's outside the tree.
+        """
+        relpath = osp.relpath(path, self.root)
+        if relpath == os.curdir:
+            return ''
+        if relpath == os.pardir or relpath.startswith(os.pardir + os.sep):
+            return None
+        return relpath.replace(os.sep, '/')
+
+    def _get_rules(self, relpath):
+        """
+        Return the ignore rules of the ancestors of the directory `relpath`,
+        relative to it.
+        """
+        rules = ()
+        directory = self.root
+        for name in relpath.split('/') if relpath else []:
+            rules = self._add_rules(rules, directory)
+            rules = tuple((ignore, prefix + name + '/')
+                          for ignore, prefix in rules)
+            directory = osp.join(directory, name)
+        return rules
+
+    def _add_rules(self, rules, directory):
+        """Add the rules of the ignore files found in `directory`."""
+        if not self.use_ignore_files:
+            return rules
+        for name in IGNORE_FILES:
+            ignore_file = osp.join(directory, name)
+            if osp.isfile(ignore_file):
+                rules += ((IgnoreRules.from_file(ignore_file), ''),)
+        return rules
+
+    def is_ignored(self, path):
+        """
+        Return True if `path` would be skipped when walking the tree.
+
+        Paths outside the tree are never ignored.
+        """
+        path = osp.abspath(path)
+        relpath = self._get_relpath(path)
+        if not relpath:
+            return False
+
+        parts = relpath.split('/')
+        directory = self.root
+        rules = self._add_rules((), directory)
+        for index, name in enumerate(parts):
+            fullname = osp.join(directory, name)
+            is_dir = index < len(parts) - 1 or osp.isdir(fullname)
+            if is_dir:
+                if self._is_excluded_dir(name, fullname):
+                    return True
+                if (self.skip_virtualenvs and
+                        osp.isfile(osp.join(fullname, VIRTUALENV_FILE))):
+                    return True
+            elif (self.exclude is not None and
+                    self.exclude.search(fullname)):
+                return True
+            if rules and self._is_ignored(rules, name, is_dir):
+                return True
+            rules = tuple((ignore, prefix + name + '/')
+                          for ignore, prefix in rules)
+            rules = self._add_rules(rules, fullname)
+            directory = fullname
+        return False
+
+
+def walk_files(root, **kwargs):
+    """
+    Iterate over the paths of the files in the directory `root`.
+
+    See `DirectoryWalker` for the accepted keyword arguments.
+    """
+    stopped = kwargs.pop('stopped', None)
+    return DirectoryWalker(root, **kwargs).walk(stopped=stopped)